@@ -1,49 +1,22 @@
 import json
+from .incident_index import IncidentIndex, incident_vector
 from .llm_client import LLMClient
 from .memory_store import MemoryStore
+from .prompt_builder import PromptBuilder
 
+# Only these sections are shown to (and patchable by) the critic; the rest of the config
+# (per-feature generator weights/bounds, LLM and serving settings) would only cost tokens
+PATCHABLE_SECTIONS = ("monitoring", "retrain")
 
-class ConfigCritic:
-    def __init__(self, llm: LLMClient, config: dict):
-        self.llm = llm
-        self.config = config
-        self.memory = MemoryStore()
-
-    def _summarize_memory(self, incidents):
-        if not incidents:
-            return "No past incidents available."
-
-        recent = incidents[-3:]
-        return json.dumps(
-            [
-                {
-                    "round_id": inc.get("round_id"),
-                    "diagnosis": inc.get("diagnosis"),
-                    "config_suggestion": inc.get("config_suggestion"),
-                }
-                for inc in recent
-            ],
-            indent=2,
-        )
-
-    def suggest_changes(self, diagnosis: dict) -> dict:
-        past_incidents = self.memory.load_all()
-        memory_summary = self._summarize_memory(past_incidents)
-
-        system_prompt = (
-            "You are an ML reliability engineer. "
-            "Your job is to propose configuration changes and decide whether retraining is needed."
-        )
-
-        user_prompt = f"""
-Current config:
-{json.dumps(self.config, indent=2)}
+CRITIC_PROMPT = """
+Current config (the sections you may change):
+{config}
 
 Diagnosis for this round:
-{json.dumps(diagnosis, indent=2)}
+{diagnosis}
 
 Use the historical summary to avoid repeating ineffective patches and to detect long-term trends:
-{memory_summary}
+{incidents}
 
 Return ONLY a JSON object with EXACTLY these keys:
 - "changes": a dictionary of config fields to update (e.g. {{"monitoring.psi_threshold": 0.2}})
@@ -51,7 +24,75 @@ Return ONLY a JSON object with EXACTLY these keys:
 - "should_retrain": true or false
 """
 
-        response = self.llm.chat(system_prompt, user_prompt)
+
+def _recovery(trace: dict) -> dict:
+    return {key: trace.get(key) for key in ("wall_s", "slowest_node", "llm_calls", "llm_wall_s")}
+
+class ConfigCritic:
+    def __init__(
+        self,
+        llm: LLMClient,
+        config: dict,
+        memory: MemoryStore | None = None,
+        incident_index: IncidentIndex | None = None,
+        prompt_builder: PromptBuilder | None = None,
+    ):
+        self.llm = llm
+        self.config = config
+        self.memory = memory or MemoryStore()
+        self.incident_index = incident_index
+        self.prompts = prompt_builder or PromptBuilder(config, llm)
+
+    def patchable_config(self) -> dict:
+        """The scalar fields of the PATCHABLE_SECTIONS, i.e. what the critic's changes can address."""
+        return {
+            section: {k: v for k, v in self.config[section].items() if not isinstance(v, (dict, list))}
+            for section in PATCHABLE_SECTIONS
+            if isinstance(self.config.get(section), dict)
+        }
+
+    def _prompt_incidents(self, incidents) -> list:
+        return [
+            {
+                "round_id": inc.get("round_id"),
+                **({"similarity": inc["similarity"]} if "similarity" in inc else {}),
+                "diagnosis": inc.get("diagnosis"),
+                "config_suggestion": inc.get("config_suggestion"),
+                # How long that round took to recover (wall time, slowest node, LLM calls)
+                **({"recovery": _recovery(inc["trace"])} if inc.get("trace") else {}),
+            }
+            for inc in incidents[-3:]
+        ]
+
+    def suggest_changes(self, diagnosis: dict, report: dict | None = None) -> dict:
+        if self.incident_index is not None:
+            query = incident_vector(
+                (report or {}).get("psi_by_feature"),
+                (report or {}).get("accuracy_drop"),
+                diagnosis.get("suspect_features"),
+                diagnosis.get("severity"),
+                diagnosis.get("issue_type"),
+            )
+            past_incidents = self.incident_index.similar(self.memory, query, k=3)
+        else:
+            past_incidents = self.memory.load_prompt_context(3)
+
+        system_prompt = (
+            "You are an ML reliability engineer. "
+            "Your job is to propose configuration changes and decide whether retraining is needed."
+        )
+
+        user_prompt = self.prompts.build(
+            "critic",
+            CRITIC_PROMPT,
+            incidents=self._prompt_incidents(past_incidents),
+            drop_incidents_from="back" if self.incident_index is not None else "front",
+            config=self.patchable_config(),
+            # Serialized whole: suspect_features must stay complete
+            diagnosis=self.prompts.dumps(diagnosis, truncate=False),
+        )
+
+        response = self.llm.chat(system_prompt, user_prompt, stop_at_json=True)
 
         try:
             return json.loads(response)
@@ -63,11 +104,23 @@ Return ONLY a JSON object with EXACTLY these keys:
             }
 
     def apply_patch(self, suggestion: dict):
-        """Apply the structured patch to the in-memory config."""
-        changes = suggestion.get("changes", {})
+        """
+        Apply the structured patch to the in-memory config. Keys are dotted paths into the
+        PATCHABLE_SECTIONS that must already exist and lead to a value (not a whole section);
+        anything else is skipped with a warning instead of failing the round.
+        """
+        changes = suggestion.get("changes") or {}
+        if not isinstance(changes, dict):
+            print(f"[CRITIC] Warning: ignoring changes that are not a mapping: {changes!r}")
+            return
         for key, value in changes.items():
-            section, field = key.split(".")
-            if section in self.config and field in self.config[section]:
-                self.config[section][field] = value
+            *parents, field = str(key).split(".")
+            node = self.config
+            for part in parents:
+                node = node.get(part) if isinstance(node, dict) else None
+            if not parents or parents[0] not in PATCHABLE_SECTIONS:
+                print(f"[CRITIC] Warning: config key {key} is outside the patchable sections {PATCHABLE_SECTIONS}")
+            elif not isinstance(node, dict) or field not in node or isinstance(node[field], dict):
+                print(f"[CRITIC] Warning: Unknown config key {key}")
             else:
-                print(f"[CRITIC] Warning: Unknown config key {key}")
\ No newline at end of file
+                node[field] = value
@@ -1,55 +1,146 @@
-import pandas as pd
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
 import numpy as np
 
+from model.train_model import load_config
+from monitoring.baseline_profile import PROFILE_PATH, load_baseline_profile, profile_moments
+
+if TYPE_CHECKING:  # pandas is imported when rows are generated, not when the workflow is built
+    import pandas as pd
+
+'''
+    Config-driven synthetic training data.
+    Features come from `features.numeric`, parameters from persisted statistics: the
+    baseline profile's per-feature mean/std, replaced by the drift report's current-data
+    mean/std for features whose PSI is above `drift_psi`. The target is Bernoulli on a
+    logistic score of the standardized features (`generator.target_weights`).
+    Values are clipped to each feature's domain: `generator.bounds` ([lower, upper], null =
+    open) where configured, else non-negative for features that were never negative in the
+    baseline profile.
+    Rows are drawn chunk by chunk, with no statistic computed over the whole output, so any
+    number of rows can be streamed. Every chunk gets its own np.random.Generator spawned from
+    the call's seed, so chunks can be drawn on `n_threads` threads (NumPy releases the GIL
+    while filling arrays) and the output does not depend on the thread count.
+'''
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
 class SyntheticDataGenerator:
-    def generate(self, drift_report: dict, n_samples: int = 500):
-        """
-        Generate realistic synthetic training samples based on drifted feature distributions.
-        Ensures domain validity (no negative ages, no negative balances, realistic incomes).
-        """
-        psi = drift_report.get("psi_by_feature", {})
-
-        df = pd.DataFrame()
-
-        # === AGE ===
-        if psi.get("age", 0) > 0.1:
-            # Drifted age → shift mean upward
-            df["age"] = np.random.normal(loc=40 + 10 * psi["age"], scale=8, size=n_samples)
-        else:
-            df["age"] = np.random.normal(loc=40, scale=8, size=n_samples)
+    def __init__(self, config: dict | None = None, profile_path: Path = PROFILE_PATH):
+        self.config = config if config is not None else load_config()
+        self.profile_path = Path(profile_path)
 
-        df["age"] = df["age"].clip(lower=18, upper=90)
+    @property
+    def _settings(self) -> dict:
+        return self.config.get("generator", {})
 
-        # === INCOME ===
-        if psi.get("income", 0) > 0.1:
-            # Drifted income → shift log-normal mean upward
-            df["income"] = np.random.lognormal(mean=10 + psi["income"], sigma=0.3, size=n_samples)
+    def _parameters(self, features: list, drift_report: dict | None):
+        """Per-feature (mean, std, lower bound, upper bound, baseline mean, baseline std) arrays."""
+        upper = np.full(len(features), np.inf)
+        if self.profile_path.exists():
+            profile = load_baseline_profile(self.profile_path)
+            rows = [profile["features"].index(f) for f in features]
+            mean, std = (m[rows] for m in profile_moments(profile))
+            # Features that were never negative in the baseline stay non-negative
+            lower = np.where(profile["edges"][rows, 0] >= 0, 0.0, -np.inf)
         else:
-            df["income"] = np.random.lognormal(mean=10, sigma=0.3, size=n_samples)
+            print(f"[GENERATOR] Warning: no baseline profile at {self.profile_path}, drawing all features from N(0, 1)")
+            mean, std, lower = np.zeros(len(features)), np.ones(len(features)), np.full(len(features), -np.inf)
+        for i, feat in enumerate(features):
+            lo, hi = self._settings.get("bounds", {}).get(feat) or (lower[i], None)
+            lower[i] = -np.inf if lo is None else lo
+            upper[i] = np.inf if hi is None else hi
+        base_mean, base_std = mean.copy(), std.copy()
 
-        # === BALANCE ===
-        if psi.get("balance", 0) > 0.1:
-            df["balance"] = np.random.normal(loc=2000 + 500 * psi["balance"], scale=300, size=n_samples)
-        else:
-            df["balance"] = np.random.normal(loc=2000, scale=300, size=n_samples)
-
-        df["balance"] = df["balance"].clip(lower=0)
-
-        # === DEFAULT FLAG (binary) ===
-        # Higher income → lower default probability
-        #prob_default = 1 / (1 + np.exp((df["income"] - df["income"].median()) / 5000))
-        x = (df["income"] - df["income"].median()) / 5000
-        x = np.clip(x, -50, 50)  # prevent overflow
-        prob_default = 1 / (1 + np.exp(x))
-        df["default"] = (np.random.rand(n_samples) < prob_default).astype(int)
-
-        # === LABEL (binary) ===
-        # Simple rule: high income + high balance → label 1
-        score = (
-            0.4 * (df["income"] / df["income"].max()) +
-            0.3 * (df["balance"] / df["balance"].max()) +
-            0.3 * (df["age"] / df["age"].max())
-        )
-        df["label"] = (score > score.median()).astype(int)
-
-        return df
\ No newline at end of file
+        report = drift_report or {}
+        psi = report.get("psi_by_feature", {})
+        drift_psi = self._settings.get("drift_psi", 0.1)
+        missing = []
+        for i, feat in enumerate(features):
+            if psi.get(feat, 0) <= drift_psi:
+                continue
+            if feat in report.get("mean_by_feature", {}) and feat in report.get("std_by_feature", {}):
+                mean[i] = report["mean_by_feature"][feat]
+                std[i] = report["std_by_feature"][feat]
+            else:
+                missing.append(feat)
+        if missing:
+            print(f"[GENERATOR] Warning: drift report has no mean/std for drifted {missing}, keeping their baseline distribution")
+        return mean, np.maximum(std, 1e-12), lower, upper, base_mean, np.maximum(base_std, 1e-12)
+
+    def iter_chunks(
+        self,
+        n_rows: int,
+        drift_report: dict | None = None,
+        chunk_rows: int | None = None,
+        seed: int | None = None,
+        n_threads: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield `n_rows` rows (features + target) in DataFrames of at most `chunk_rows` rows."""
+        import pandas as pd
+
+        features = self.config["features"]["numeric"]
+        target = self.config["target"]
+        chunk_rows = chunk_rows or self._settings.get("chunk_rows", DEFAULT_CHUNK_ROWS)
+        seed = seed if seed is not None else self._settings.get("seed")
+        n_threads = n_threads or self._settings.get("n_threads") or os.cpu_count() or 1
+
+        mean, std, lower, upper, base_mean, base_std = self._parameters(features, drift_report)
+        weights = np.array([self._settings.get("target_weights", {}).get(f, 0.0) for f in features])
+        intercept = self._settings.get("target_intercept", 0.0)
+
+        def make_chunk(n: int, chunk_seed) -> pd.DataFrame:
+            rng = np.random.default_rng(chunk_seed)
+            X = rng.standard_normal((n, len(features)))
+            X *= std
+            X += mean
+            np.clip(X, lower, upper, out=X)
+
+            logits = np.clip(((X - base_mean) / base_std) @ weights + intercept, -50, 50)
+            y = (rng.random(n) * (1 + np.exp(-logits)) < 1).astype(np.int64)  # u < sigmoid(logits)
+
+            chunk = pd.DataFrame(X, columns=features, copy=False)
+            chunk[target] = y
+            return chunk
+
+        sizes = [min(chunk_rows, n_rows - start) for start in range(0, n_rows, chunk_rows)]
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            # At most 2 chunks per thread in flight, so memory stays bounded by chunk size
+            pending = deque()
+            for n, chunk_seed in zip(sizes, chunk_seeds):
+                pending.append(pool.submit(make_chunk, n, chunk_seed))
+                if len(pending) >= 2 * n_threads:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def generate(self, drift_report: dict, n_samples: int = 500, seed: int | None = None) -> pd.DataFrame:
+        """`n_samples` rows in one DataFrame."""
+        import pandas as pd
+
+        chunks = list(self.iter_chunks(n_samples, drift_report, seed=seed))
+        if not chunks:
+            features = self.config["features"]["numeric"]
+            return pd.DataFrame({**{f: np.empty(0) for f in features}, self.config["target"]: np.empty(0, dtype=np.int64)})
+        return pd.concat(chunks, ignore_index=True)
+
+    def write_to_store(
+        self,
+        store,
+        n_rows: int,
+        round_id,
+        drift_report: dict | None = None,
+        chunk_rows: int | None = None,
+        seed: int | None = None,
+        n_threads: int | None = None,
+    ) -> dict:
+        """Stream `n_rows` generated rows into a new TrainingStore segment; returns its manifest entry."""
+        chunks = self.iter_chunks(n_rows, drift_report, chunk_rows=chunk_rows, seed=seed, n_threads=n_threads)
+        return store.append_chunks(chunks, round_id=round_id, source="synthetic")
@@ -1,15 +1,7 @@
 from .llm_client import LLMClient
+from .prompt_builder import PromptBuilder
 
-class DataPipelineAnalyst:
-    def __init__(self, llm: LLMClient):
-        self.llm = llm
-
-    def suggest_data_fixes(self, diagnosis: dict, memory_summary: dict) -> dict:
-        system_prompt = (
-            "You are a data engineer. "
-            "Given a diagnosis, suggest data quality or pipeline checks."
-        )
-        user_prompt = f"""
+ANALYST_PROMPT = """
 Diagnosis:
 {diagnosis}
 
@@ -20,6 +12,24 @@ Return JSON with:
 - data_checks: list of suggested new checks or validations
 - rationale: short explanation
 """
+
+class DataPipelineAnalyst:
+    def __init__(self, llm: LLMClient, config: dict | None = None):
+        self.llm = llm
+        self.prompts = PromptBuilder(config, llm)
+
+    def suggest_data_fixes(self, diagnosis: dict, memory_summary: dict) -> dict:
+        system_prompt = (
+            "You are a data engineer. "
+            "Given a diagnosis, suggest data quality or pipeline checks."
+        )
+        user_prompt = self.prompts.build(
+            "data_analyst",
+            ANALYST_PROMPT,
+            # Serialized whole: suspect_features must stay complete
+            diagnosis=self.prompts.dumps(diagnosis, truncate=False),
+            memory_summary=memory_summary,
+        )
         response = self.llm.chat(system_prompt, user_prompt)
         # Dummy fallback
         return {
@@ -0,0 +1,54 @@
+'''
+    Deterministic first tier of drift diagnosis.
+    Clear-cut monitoring reports are diagnosed locally with the same mechanical rules the
+    LLM prompt spells out; anything in between returns None and is escalated to the LLM.
+'''
+
+# Features above this PSI are reported as suspects (same cut-off as the LLM prompt)
+SUSPECT_PSI = 0.1
+# A single feature this far off is unambiguous data drift
+MASSIVE_PSI = 1.0
+
+def _suspects(psi_by_feature: dict) -> list:
+    return [f for f, psi in psi_by_feature.items() if psi > SUSPECT_PSI]
+
+def rule_based_diagnosis(
+    report: dict,
+    psi_threshold: float = 0.2,
+    accuracy_drop_threshold: float = 0.05,
+    massive_psi: float = MASSIVE_PSI,
+) -> dict | None:
+    """Diagnosis for a clear-cut report, or None if the case needs the LLM."""
+    psi_by_feature = report.get("psi_by_feature") or {}
+    accuracy_drop = report.get("accuracy_drop")
+    if accuracy_drop is None or not psi_by_feature or any(v is None for v in psi_by_feature.values()):
+        return None
+
+    max_feature = max(psi_by_feature, key=psi_by_feature.get)
+    max_psi = psi_by_feature[max_feature]
+
+    # Nothing moved: every feature stable and accuracy within tolerance
+    if max_psi < psi_threshold and accuracy_drop < accuracy_drop_threshold:
+        return {
+            "issue_type": "unknown",
+            "suspect_features": _suspects(psi_by_feature),
+            "severity": "low",
+            "reasoning": (
+                f"All PSI values are below {psi_threshold} (max {max_psi:.3f} on {max_feature}) and "
+                f"accuracy_drop {accuracy_drop:.3f} is below {accuracy_drop_threshold}; no drift detected."
+            ),
+        }
+
+    # One feature is massively shifted: data drift regardless of the rest
+    if max_psi >= massive_psi:
+        return {
+            "issue_type": "data_drift",
+            "suspect_features": _suspects(psi_by_feature),
+            "severity": "high",
+            "reasoning": (
+                f"PSI of {max_psi:.3f} on {max_feature} is above {massive_psi}, "
+                f"accuracy_drop is {accuracy_drop:.3f}; the input distribution has clearly shifted."
+            ),
+        }
+
+    return None
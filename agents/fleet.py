@@ -0,0 +1,139 @@
+import json
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import yaml
+
+from .llm_client import LLMClient
+from .model_context import ModelContext
+from .workflow import build_workflow
+from model.predict import predict
+from model.train_model import CONFIG_PATH, train
+from monitoring.baseline_profile import write_baseline_profile
+from monitoring.compute_metrics import compute_metrics
+
+'''
+    Fleet monitoring: many models watched by one compiled workflow.
+    Each model lives in its own directory (config.yaml, model.joblib, train_store/, memory.jsonl,
+    baseline profile and per-round reports), so concurrent runs never share mutable state.
+    All models share one LLMClient: one connection pool, one response cache and one
+    `llm.max_concurrency` limit across the fleet.
+'''
+
+class FleetModel:
+    def __init__(self, root: Path, llm: LLMClient):
+        self.root = Path(root)
+        self.ctx = ModelContext.for_directory(self.root, llm=llm)
+        self.baseline = json.loads((self.root / "baseline.json").read_text())
+
+    @property
+    def model_id(self) -> str:
+        return self.ctx.model_id
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        llm: LLMClient,
+        seed_train_path: str,
+        baseline_test_path: str,
+        config_path: Path = CONFIG_PATH,
+        config_overrides: dict | None = None,
+    ) -> "FleetModel":
+        """Lay out a model directory from a seed config and training set, then train and profile its baseline."""
+        root = Path(root)
+        if root.exists():
+            shutil.rmtree(root)
+        (root / "rounds").mkdir(parents=True)
+
+        cfg = yaml.safe_load(open(config_path))
+        for section, values in (config_overrides or {}).items():
+            cfg.setdefault(section, {}).update(values)
+        (root / "config.yaml").write_text(yaml.safe_dump(cfg))
+
+        ctx = ModelContext.for_directory(root, llm=llm)
+        ctx.store.reset(seed_path=seed_train_path)
+        baseline_acc = train(str(ctx.store.root), model_path=ctx.model_path, config_path=ctx.config_path)
+
+        baseline_pred = root / "rounds" / "round0_pred.csv"
+        predict(baseline_test_path, str(baseline_pred), model_path=ctx.model_path, config_path=ctx.config_path)
+        write_baseline_profile(str(baseline_pred), cfg["features"]["numeric"], path=root / "baseline_profile.npz")
+
+        (root / "baseline.json").write_text(json.dumps({
+            "baseline_accuracy": baseline_acc,
+            "baseline_pred_path": str(baseline_pred),
+        }))
+        return cls(root, llm)
+
+    def run_round(self, workflow, round_id: str, current_path: str) -> dict:
+        """Score `current_path`, write its drift report and run the agent workflow on it."""
+        ctx = self.ctx
+        pred_path = self.root / "rounds" / f"round{round_id}_pred.csv"
+        report_path = self.root / "rounds" / f"drift_report_round{round_id}.json"
+
+        predict(current_path, str(pred_path), model_path=ctx.model_path, config_path=ctx.config_path)
+        report = compute_metrics(
+            self.baseline["baseline_pred_path"],
+            str(pred_path),
+            str(report_path),
+            baseline_acc=self.baseline["baseline_accuracy"],
+            profile_path=self.root / "baseline_profile.npz",
+            config_path=ctx.config_path,
+        )
+        state = {
+            "drift_report_path": str(report_path),
+            "round_id": round_id,
+            "baseline_accuracy": report["baseline_accuracy"],
+            "current_accuracy": report["current_accuracy"],
+        }
+        return workflow.invoke(state, config={"configurable": {"model_context": ctx}})
+
+def _run_model(model: FleetModel, workflow, rounds: list) -> list:
+    # A model's rounds depend on each other (memory, config patches, retrained artifact): run them in order
+    results = []
+    for round_id, current_path in rounds:
+        start = time.perf_counter()
+        try:
+            model.run_round(workflow, round_id, current_path)
+            error = None
+        except Exception as e:
+            error = str(e)
+            print(f"[FLEET] {model.model_id} round {round_id} failed: {e}")
+        results.append({
+            "model_id": model.model_id,
+            "round_id": round_id,
+            "seconds": time.perf_counter() - start,
+            "error": error,
+        })
+    return results
+
+def run_fleet(models: list, rounds: list, max_workers: int = 8, parallel_graph: bool = True) -> dict:
+    """
+    Run every `(round_id, current_path)` in `rounds` for every model, with at most
+    `max_workers` models in flight. Returns per-round timings and fleet throughput.
+    """
+    workflow = build_workflow(parallel=parallel_graph)
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_model, model, workflow, rounds) for model in models]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    wall = time.perf_counter() - start
+
+    completed = [r for r in results if r["error"] is None]
+    rounds_per_min = len(completed) / wall * 60 if wall > 0 else float("inf")
+    print(
+        f"[FLEET] {len(completed)}/{len(results)} rounds over {len(models)} models in {wall:.1f}s "
+        f"({rounds_per_min:.1f} rounds/min, {max_workers} workers)"
+    )
+    return {
+        "models": len(models),
+        "rounds": len(results),
+        "failed": len(results) - len(completed),
+        "wall_seconds": wall,
+        "rounds_per_min": rounds_per_min,
+        "results": results,
+    }
@@ -1,4 +1,9 @@
-from typing import TypedDict, Optional, Dict, Any
+from typing import Annotated, TypedDict, Optional, Dict, Any
+
+
+def merge_dicts(left: Dict[str, Any] | None, right: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Reducer for keys that several (possibly parallel) nodes contribute to."""
+    return {**(left or {}), **(right or {})}
 
 
 class AgentState(TypedDict, total=False):
@@ -21,3 +26,5 @@ class AgentState(TypedDict, total=False):
 
     memory_summary: Dict[str, Any]
 
+    # Wall time per node, merged across parallel branches
+    node_timings: Annotated[Dict[str, float], merge_dicts]
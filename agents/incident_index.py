@@ -0,0 +1,185 @@
+import json
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+
+from .memory_store import MEMORY_PATH
+
+VECTORS_PATH = MEMORY_PATH.with_name(MEMORY_PATH.stem + ".vec")
+
+'''
+    Local similar-incident retrieval.
+    Each incident becomes a fixed-size vector by feature hashing: log1p(PSI) per feature,
+    suspect features, severity, issue type and the accuracy drop each land in a hashed
+    (signed) slot, then the vector is L2-normalized. Search is one float32 mat-vec
+    (cosine similarity) plus a partial sort. Vectors are appended to a raw sidecar file
+    and synced from the memory store by position, so the index grows incrementally.
+    The sidecar starts with a fixed-size header naming the memory it indexes (backend and
+    path) and fingerprints of its first and last indexed incidents; if another memory is
+    synced, or those incidents changed (memory cleared and refilled), the index is rebuilt.
+'''
+
+DIM = 32
+HEADER_SIZE = 4096  # room for the memory path (PATH_MAX)
+MAGIC = b"IVEC1\n"
+
+def _slot(token: str, dim: int) -> tuple[int, float]:
+    h = zlib.crc32(token.encode())
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+def incident_vector(
+    psi_by_feature: dict | None = None,
+    accuracy_drop: float | None = None,
+    suspect_features: list | None = None,
+    severity: str | None = None,
+    issue_type: str | None = None,
+    dim: int = DIM,
+) -> np.ndarray:
+    vec = np.zeros(dim, dtype=np.float32)
+
+    def put(token: str, value: float):
+        i, sign = _slot(token, dim)
+        vec[i] += sign * value
+
+    for feat, psi in (psi_by_feature or {}).items():
+        if psi is not None:
+            put(f"psi:{feat}", float(np.log1p(max(psi, 0.0))))
+    for feat in suspect_features or []:
+        put(f"suspect:{feat}", 0.5)
+    if severity:
+        put(f"severity:{severity}", 0.5)
+    if issue_type:
+        put(f"issue:{issue_type}", 0.5)
+    if accuracy_drop is not None:
+        put("accuracy_drop", float(np.clip(accuracy_drop * 5, -1.0, 1.0)))
+
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+def _fingerprint(incident: dict) -> int:
+    return zlib.crc32(json.dumps(incident, sort_keys=True, default=str).encode())
+
+def _memory_id(memory) -> str:
+    return f"{type(memory).__name__}:{Path(memory.path).resolve()}"
+
+def vector_for_incident(incident: dict, dim: int = DIM) -> np.ndarray:
+    diagnosis = incident.get("diagnosis") or {}
+    accuracy_drop = incident.get("accuracy_drop")
+    if accuracy_drop is None and incident.get("current_accuracy") is not None:
+        accuracy_drop = (incident.get("baseline_accuracy") or 0.0) - incident["current_accuracy"]
+    return incident_vector(
+        incident.get("psi_by_feature"),
+        accuracy_drop,
+        diagnosis.get("suspect_features"),
+        diagnosis.get("severity"),
+        diagnosis.get("issue_type"),
+        dim=dim,
+    )
+
+class IncidentIndex:
+    def __init__(self, path: Path | None = VECTORS_PATH, dim: int = DIM):
+        self.path = Path(path) if path else None
+        self.dim = dim
+        self._lock = threading.RLock()  # reset() runs inside sync()
+        self._buf = np.empty((0, dim), dtype=np.float32)
+        self._n = 0
+        self._meta = {}  # memory id, fingerprints of the first / last indexed incident
+        if self.path and self.path.exists():
+            with self.path.open("rb") as f:
+                header = f.read(HEADER_SIZE)
+                vectors = np.fromfile(f, dtype=np.float32)
+            meta = json.loads(header[len(MAGIC):]) if header.startswith(MAGIC) else {}
+            n = len(vectors) // dim
+            if meta.get("dim") == dim and meta.get("n") == n:
+                self._meta = meta
+                self._push(vectors[:n * dim].reshape(n, dim), persist=False)
+            else:
+                self.path.unlink()  # older format or partly written: rebuilt on the next sync
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _push(self, vectors: np.ndarray, persist: bool = True):
+        if self._n + len(vectors) > len(self._buf):
+            grown = np.empty((max(2 * len(self._buf), self._n + len(vectors), 1024), self.dim), dtype=np.float32)
+            grown[:self._n] = self._buf[:self._n]
+            self._buf = grown
+        self._buf[self._n:self._n + len(vectors)] = vectors
+        self._n += len(vectors)
+        if persist and self.path:
+            if not self.path.exists():
+                self.path.write_bytes(b"\0" * HEADER_SIZE)
+            with self.path.open("ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            self._write_header()
+
+    def _write_header(self):
+        header = MAGIC + json.dumps({**self._meta, "dim": self.dim, "n": self._n}).encode()
+        with self.path.open("r+b") as f:
+            f.write(header.ljust(HEADER_SIZE - 1) + b"\n")
+
+    def reset(self):
+        with self._lock:
+            self._buf = np.empty((0, self.dim), dtype=np.float32)
+            self._n = 0
+            self._meta = {}
+            if self.path:
+                self.path.unlink(missing_ok=True)
+
+    def _matches(self, memory, n_memory: int) -> bool:
+        """Whether the indexed vectors still describe the first `self._n` incidents of `memory`."""
+        if self._meta.get("memory") != _memory_id(memory) or n_memory < self._n:
+            return False
+        if self._n == 0:
+            return True
+        first, last = memory.load_at([0, self._n - 1])
+        return _fingerprint(first) == self._meta.get("first") and _fingerprint(last) == self._meta.get("last")
+
+    def sync(self, memory):
+        """Index the incidents appended to `memory` since the last sync."""
+        # One lock for the check and the push, so concurrent syncs can't index the same incidents twice
+        with self._lock:
+            n_memory = len(memory)
+            if not self._matches(memory, n_memory):
+                # Another memory, or this one was cleared (and maybe refilled): start over
+                self.reset()
+                self._meta = {"memory": _memory_id(memory)}
+            if n_memory == self._n:
+                return
+            new = memory.load_since(self._n)
+            if new:
+                if self._n == 0:
+                    self._meta["first"] = _fingerprint(new[0])
+                self._meta["last"] = _fingerprint(new[-1])
+                self._push(np.stack([vector_for_incident(inc, self.dim) for inc in new]))
+
+    def search(self, query: np.ndarray, k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """Positions of the `k` most similar incidents (best first) and their cosine similarities."""
+        with self._lock:
+            matrix = self._buf[:self._n]
+        if len(matrix) == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = matrix @ query.astype(np.float32)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+
+    def similar(self, memory, query: np.ndarray, k: int = 3) -> List[Dict[str, Any]]:
+        """Prompt context (round_id, diagnosis, config_suggestion, similarity) of the top-k incidents."""
+        self.sync(memory)
+        positions, scores = self.search(query, k)
+        incidents = memory.load_at(positions.tolist())
+        return [
+            {
+                "round_id": inc.get("round_id"),
+                "similarity": round(float(score), 3),
+                "diagnosis": inc.get("diagnosis"),
+                "config_suggestion": inc.get("config_suggestion"),
+                "trace": inc.get("trace"),
+            }
+            for inc, score in zip(incidents, scores)
+        ]
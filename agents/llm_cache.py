@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / "llm_cache"
+
+'''
+    Content-addressed cache for LLM responses.
+    The key is a SHA-256 of the full request (provider, model, sampling options,
+    system and user prompt), so byte-identical requests are answered locally.
+    Two tiers: an in-memory LRU and one JSON file per entry on disk (survives
+    restarts, shared across processes). Both honour the TTL and are size-bounded.
+'''
+
+class LLMCache:
+    def __init__(
+        self,
+        directory: Path | None = CACHE_DIR,
+        max_entries: int = 1024,
+        max_disk_entries: int = 10_000,
+        ttl_seconds: float | None = None,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count = None
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved_s = 0.0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(request: dict) -> str:
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._expired(entry["created_at"]):
+                del self._memory[key]
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None and self.directory:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.latency_saved_s += entry["latency_s"]
+        return entry["response"]
+
+    def _read_disk(self, key: str) -> dict | None:
+        path = self._disk_path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if self._expired(entry["created_at"]):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        return entry
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, response: str, latency_s: float):
+        entry = {"created_at": time.time(), "latency_s": latency_s, "response": response}
+        with self._lock:
+            self._remember(key, entry)
+        if not self.directory:
+            return
+
+        path = self._disk_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = sum(1 for _ in self.directory.glob("*/*.json"))
+            else:
+                self._disk_count += 1
+            if self._disk_count <= self.max_disk_entries:
+                return
+            # Drop the least recently used ~10% in one go so eviction stays amortized
+            files = sorted(self.directory.glob("*/*.json"), key=lambda p: p.stat().st_mtime)
+            n_drop = len(files) - int(self.max_disk_entries * 0.9)
+            for path in files[:max(n_drop, 0)]:
+                path.unlink(missing_ok=True)
+            self._disk_count = len(files) - max(n_drop, 0)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk_count = 0
+        if self.directory:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "latency_saved_s": self.latency_saved_s,
+                "memory_entries": len(self._memory),
+            }
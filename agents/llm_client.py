@@ -1,11 +1,69 @@
 import yaml
+import json
+import time
+import asyncio
+import contextvars
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+from . import tracing
+from .llm_cache import CACHE_DIR, LLMCache
 
 
 CONFIG_PATH = Path(__file__).parents[1] / "model" / "config.yaml"
 
 
+class JsonObjectScanner:
+    """
+    Incrementally scans streamed text for the first balanced top-level JSON object
+    (string- and escape-aware, text before the opening brace is ignored).
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.start = None
+        self.end = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, piece: str) -> bool:
+        """Append `piece`; returns True once the object is complete."""
+        offset = len(self.text)
+        self.text += piece
+        if self.end is not None:
+            return True
+        for i, ch in enumerate(piece, start=offset):
+            if self.start is None:
+                if ch == "{":
+                    self.start, self._depth = i, 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = i + 1
+                    return True
+        return False
+
+    @property
+    def json_text(self) -> str | None:
+        return self.text[self.start:self.end] if self.end is not None else None
+
+
 class LLMClient:
     def __init__(self, config_path: Path = CONFIG_PATH):
         self.config = self._load_config(config_path)
@@ -14,16 +72,117 @@ class LLMClient:
         self.temperature = self.config["llm"].get("temperature", 0.2)
         self.max_tokens = self.config["llm"].get("max_tokens", 512)
         self.endpoint = self.config["llm"].get("endpoint")
+        self.timeout = self.config["llm"].get("timeout", 180)
+        self.pool_size = self.config["llm"].get("pool_size", 8)
+        self.stream_json = self.config["llm"].get("stream_json", True)
+        self.session = self._make_session(self.pool_size)
+        self._local = threading.local()
+        self.cache = self._make_cache(self.config["llm"].get("cache", {}))
+        # Cap on requests in flight across every thread sharing this client (None = pool_size only)
+        max_concurrency = self.config["llm"].get("max_concurrency")
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        # Prompt characters per token, calibrated from the provider's reported prompt token counts
+        self.chars_per_token = 4.0
+
+    @staticmethod
+    def _make_cache(cache_cfg: dict) -> LLMCache | None:
+        if not cache_cfg.get("enabled", False):
+            return None
+        return LLMCache(
+            directory=cache_cfg.get("dir") or CACHE_DIR,
+            max_entries=cache_cfg.get("max_entries", 1024),
+            max_disk_entries=cache_cfg.get("max_disk_entries", 10_000),
+            ttl_seconds=cache_cfg.get("ttl_seconds"),
+        )
+
+    @property
+    def last_stats(self) -> dict:
+        """Timing of the calling thread's most recent request (ttft/ttlut only for streamed calls)."""
+        return getattr(self._local, "stats", {})
+
+    @staticmethod
+    def _make_session(pool_size: int) -> requests.Session:
+        """Persistent session: keep-alive connections reused across prompts, up to `pool_size` in flight."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def _load_config(self, path: Path):
         with open(path, "r") as f:
             return yaml.safe_load(f)
 
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
+    def chat(self, system_prompt: str, user_prompt: str, stop_at_json: bool = False, use_cache: bool = True) -> str:
         """
         Unified chat interface for all providers.
+        With `stop_at_json`, the response is streamed and cut off as soon as the first
+        top-level JSON object is complete; only that object's text is returned.
+        Identical requests are answered from the response cache (if enabled) unless `use_cache=False`.
+        Inside a traced workflow node, each call is recorded as an "llm" span.
         """
+        with tracing.span("llm.chat", provider=self.provider, model=self.model) as span:
+            self._local.stats = {}
+            response = self._chat_cached(system_prompt, user_prompt, stop_at_json, use_cache)
+            stats = self.last_stats
+            prompt_tokens, response_tokens = stats.get("prompt_tokens"), stats.get("response_tokens")
+            if prompt_tokens:
+                self._calibrate(len(system_prompt) + len(user_prompt), prompt_tokens)
+            span.set(
+                cache_hit=stats.get("cache_hit", False),
+                streamed=stats.get("streamed"),
+                early_stop=stats.get("early_stop"),
+                ttft_s=stats.get("ttft_s"),
+                # Cache hits, early-stopped streams and other providers report no counts: ~4 chars per token
+                prompt_tokens=prompt_tokens or (len(system_prompt) + len(user_prompt)) // 4,
+                response_tokens=response_tokens or len(response) // 4,
+                tokens_estimated=prompt_tokens is None or response_tokens is None,
+                llm_error=response.startswith("[LLM ERROR]"),
+            )
+            return response
+
+    def _calibrate(self, prompt_chars: int, prompt_tokens: int):
+        ratio = prompt_chars / prompt_tokens
+        # Chat-template tokens and prompt-prefix reuse skew single samples; ignore implausible ones
+        if 1.5 <= ratio <= 8.0:
+            self.chars_per_token = 0.8 * self.chars_per_token + 0.2 * ratio
+
+    def _chat_cached(self, system_prompt: str, user_prompt: str, stop_at_json: bool, use_cache: bool) -> str:
+        if self.cache is None or not use_cache:
+            return self._chat_provider(system_prompt, user_prompt, stop_at_json)
+
+        key = LLMCache.key({
+            "provider": self.provider,
+            "endpoint": self.endpoint,
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stop_at_json": stop_at_json and self.stream_json,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+        })
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._local.stats = {"cache_hit": True, "total_s": 0.0}
+            return cached
+
+        start = time.perf_counter()
+        response = self._chat_provider(system_prompt, user_prompt, stop_at_json)
+        # Errors and "not yet implemented" placeholders must not be replayed later
+        if not (response.startswith("[LLM ERROR]") or response.endswith("not yet implemented]")):
+            self.cache.put(key, response, time.perf_counter() - start)
+        return response
+
+    def _chat_provider(self, system_prompt: str, user_prompt: str, stop_at_json: bool) -> str:
+        if self._slots is None:
+            return self._dispatch(system_prompt, user_prompt, stop_at_json)
+        with self._slots:
+            return self._dispatch(system_prompt, user_prompt, stop_at_json)
+
+    def _dispatch(self, system_prompt: str, user_prompt: str, stop_at_json: bool) -> str:
         if self.provider == "ollama":
+            if stop_at_json and self.stream_json:
+                return self._chat_ollama_stream(system_prompt, user_prompt)
             return self._chat_ollama(system_prompt, user_prompt)
 
         elif self.provider == "openai":
@@ -38,13 +197,28 @@ class LLMClient:
         else:
             raise ValueError(f"Unknown LLM provider: {self.provider}")
 
+    async def achat(self, system_prompt: str, user_prompt: str, **chat_kwargs) -> str:
+        """Awaitable chat; the blocking request runs in a worker thread."""
+        return await asyncio.to_thread(self.chat, system_prompt, user_prompt, **chat_kwargs)
+
+    def chat_many(self, prompts: list, max_concurrency: int | None = None, **chat_kwargs) -> list:
+        """
+        Send independent (system_prompt, user_prompt) pairs concurrently over the pooled session.
+        Responses come back in the order of `prompts`.
+        """
+        if not prompts:
+            return []
+        workers = min(max_concurrency or self.pool_size, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each call runs in a copy of the caller's context, so it still belongs to the caller's trace span
+            context = contextvars.copy_context()
+            return list(pool.map(lambda p: context.copy().run(self.chat, *p, **chat_kwargs), prompts))
+
     # -----------------------------
     # OLLAMA IMPLEMENTATION
     # -----------------------------
-    def _chat_ollama(self, system_prompt: str, user_prompt: str) -> str:
-        url = f"{self.endpoint}/api/chat"
-
-        payload = {
+    def _ollama_payload(self, system_prompt: str, user_prompt: str, stream: bool) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
@@ -54,20 +228,73 @@ class LLMClient:
                 "temperature": self.temperature,
                 "num_predict": self.max_tokens,
             },
-            "stream": False,
+            "stream": stream,
         }
 
+    def _chat_ollama(self, system_prompt: str, user_prompt: str) -> str:
+        url = f"{self.endpoint}/api/chat"
+        payload = self._ollama_payload(system_prompt, user_prompt, stream=False)
+
+        start = time.perf_counter()
         try:
-            response = requests.post(url, json=payload, timeout=180)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
             # print(f"**[DEBUG] Response : {response.text}")
             data = response.json()
             # print(f"**[DEBUG] Data : {data}")
+            self._local.stats = {
+                "total_s": time.perf_counter() - start,
+                "streamed": False,
+                "prompt_tokens": data.get("prompt_eval_count"),
+                "response_tokens": data.get("eval_count"),
+            }
             return data.get("message", {}).get("content", "")
         except Exception as e:
             print(f"**[ERROR] Ollama request failed: {e}")
             return f"[LLM ERROR] Ollama request failed: {e}"
 
+    def _chat_ollama_stream(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Consume Ollama's NDJSON token stream and stop at the end of the first JSON object.
+        Closing the response drops the connection, which makes Ollama abort the generation.
+        """
+        url = f"{self.endpoint}/api/chat"
+        payload = self._ollama_payload(system_prompt, user_prompt, stream=True)
+        scanner = JsonObjectScanner()
+        stats = {"streamed": True, "ttft_s": None, "ttlut_s": None, "chunks": 0, "early_stop": False}
+
+        start = time.perf_counter()
+        try:
+            with self.session.post(url, json=payload, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    piece = data.get("message", {}).get("content", "")
+                    if piece:
+                        stats["chunks"] += 1
+                        if stats["ttft_s"] is None:
+                            stats["ttft_s"] = time.perf_counter() - start
+                    if scanner.feed(piece):
+                        stats["ttlut_s"] = time.perf_counter() - start
+                        stats["early_stop"] = not data.get("done", False)
+                        break
+                    if data.get("done"):
+                        stats["prompt_tokens"] = data.get("prompt_eval_count")
+                        stats["response_tokens"] = data.get("eval_count")
+                        break
+        except Exception as e:
+            print(f"**[ERROR] Ollama request failed: {e}")
+            return f"[LLM ERROR] Ollama request failed: {e}"
+
+        stats["total_s"] = time.perf_counter() - start
+        self._local.stats = stats
+        ttft = f"{stats['ttft_s']:.2f}s" if stats["ttft_s"] is not None else "n/a"
+        ttlut = f"{stats['ttlut_s']:.2f}s" if stats["ttlut_s"] is not None else "n/a"
+        print(f"[LLM] ttft={ttft} ttlut={ttlut} early_stop={stats['early_stop']}")
+        return scanner.json_text if scanner.json_text is not None else scanner.text
+
     # -----------------------------
     # PLACEHOLDERS FOR FUTURE PROVIDERS
     # -----------------------------
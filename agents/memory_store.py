@@ -1,32 +1,312 @@
+import contextlib
 import json
+import shutil
+import threading
+import time
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Any, List
 
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer only
+    fcntl = None
+
 MEMORY_PATH = Path(__file__).parent / "memory.jsonl"
 
+'''
+    Incidents are appended to memory.jsonl (one JSON object per line, still the export format).
+    A sidecar `<file>.idx` holds one fixed-size (offset, length, timestamp) record per line, so
+    the last / last-k incidents and time ranges are read with a seek instead of a full parse.
+    Each writer appends its line and then its index record under an exclusive file lock, so the
+    sidecar holds one record per line even with several stores / processes on the same file.
+    Readers index lines appended by other writers in memory only; records that go backwards
+    (e.g. duplicates from older versions) are dropped on load, and a sidecar that runs past
+    the end of the file is rebuilt.
+    round_id / feature lookups use in-process maps built on first use and extended on append.
+'''
+
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4"), ("timestamp", "<f8")])
+
+def _incident_features(incident: dict) -> list:
+    return (incident.get("diagnosis") or {}).get("suspect_features") or []
+
+def memory_sidecars(path: Path) -> dict:
+    """Files derived from the memory at `path` (shared by both backends), removed with it on clear()."""
+    path = Path(path)
+    return {"vectors": path.with_name(path.stem + ".vec"), "summary": path.with_name(path.stem + "_summary.json")}
+
+def open_memory_store(backend: str = "jsonl", path: Path | None = None):
+    """The incident memory for `memory.backend` in config.yaml ("jsonl" or "sqlite")."""
+    if backend == "jsonl":
+        return MemoryStore(path or MEMORY_PATH)
+    if backend == "sqlite":
+        from .sqlite_memory_store import SQLITE_MEMORY_PATH, SQLiteMemoryStore
+        return SQLiteMemoryStore(path or SQLITE_MEMORY_PATH)
+    raise ValueError(f"Unknown memory backend: {backend}")
+
 class MemoryStore:
     def __init__(self, path: Path = MEMORY_PATH):
-        self.path = path
+        self.path = Path(path)
         self.path.touch(exist_ok=True)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self._lock = threading.RLock()
+        self._buf = np.empty(0, dtype=INDEX_DTYPE)
+        self._n = 0
+        self._indexed_bytes = 0
+        self._all = None        # parsed incidents, kept once load_all has been called
+        self._by_round = None   # round_id -> positions
+        self._by_feature = None  # suspect feature -> positions
+        self._load_index()
 
-    def append_incident(self, incident: Dict[str, Any]):
-        with self.path.open("a") as f:
-            f.write(json.dumps(incident) + "\n")
+    # -----------------------------
+    # INDEX MAINTENANCE
+    # -----------------------------
+    @property
+    def _index(self) -> np.ndarray:
+        return self._buf[:self._n]
 
-    def load_all(self) -> List[Dict[str, Any]]:
-        incidents = []
-        with self.path.open("r") as f:
+    def _push(self, records: np.ndarray):
+        """Add index records in amortized O(1) (capacity doubles as needed)."""
+        if self._n + len(records) > len(self._buf):
+            grown = np.empty(max(2 * len(self._buf), self._n + len(records), 1024), dtype=INDEX_DTYPE)
+            grown[:self._n] = self._index
+            self._buf = grown
+        self._buf[self._n:self._n + len(records)] = records
+        self._n += len(records)
+
+    def _reset(self):
+        self._buf = np.empty(0, dtype=INDEX_DTYPE)
+        self._n = 0
+        self._indexed_bytes = 0
+        self._all = self._by_round = self._by_feature = None
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every store (and process) writing this file."""
+        with self.path.open("ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        with self._file_lock():
+            index = np.fromfile(self.index_path, dtype=INDEX_DTYPE) if self.index_path.exists() else None
+            if index is not None and len(index) > 1:
+                # Keep only records that start after the end of the previous one
+                ends = (index["offset"] + index["length"]).astype(np.int64)
+                prev_end = np.concatenate([[0], np.maximum.accumulate(ends)[:-1]])
+                valid = index["offset"].astype(np.int64) >= prev_end
+                if not valid.all():
+                    index = index[valid]
+                    index.tofile(self.index_path)
+            end = int(index[-1]["offset"] + index[-1]["length"]) if index is not None and len(index) else 0
+            if index is not None and end > self.path.stat().st_size:
+                # Stale: the file was replaced; rebuild from the data
+                self.index_path.unlink()
+                index, end = None, 0
+            if index is not None:
+                self._buf, self._n, self._indexed_bytes = index, len(index), end
+            self._refresh()
+            self._persist_index()
+
+    def _persist_index(self):
+        """Append records for lines the sidecar does not cover yet (caller holds the file lock)."""
+        covered = 0
+        if self.index_path.exists() and self.index_path.stat().st_size >= INDEX_DTYPE.itemsize:
+            with self.index_path.open("rb") as f:
+                f.seek(-INDEX_DTYPE.itemsize, 2)
+                last = np.frombuffer(f.read(INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)[0]
+            covered = int(last["offset"] + last["length"])
+        if covered > self._indexed_bytes:
+            # The file was truncated or rewritten since the sidecar was written
+            self._index.tofile(self.index_path)
+            return
+        pending = self._index[self._index["offset"] >= covered]
+        if len(pending):
+            with self.index_path.open("ab") as f:
+                f.write(pending.tobytes())
+
+    def _refresh(self):
+        """Index lines written since the last look (by us or another writer), in memory."""
+        size = self.path.stat().st_size
+        if size == self._indexed_bytes:
+            return
+        if size < self._indexed_bytes:
+            # Truncated or rewritten under us: start over (the sidecar is rewritten on the next append)
+            self._reset()
+
+        records = []
+        with self.path.open("rb") as f:
+            f.seek(self._indexed_bytes)
+            offset = self._indexed_bytes
             for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                incidents.append(json.loads(line))
+                if not line.endswith(b"\n"):
+                    break  # partially written line; pick it up next time
+                if line.strip():
+                    ts = json.loads(line).get("timestamp", np.nan)
+                    records.append((offset, len(line), ts if ts is not None else np.nan))
+                offset += len(line)
+        if not records:
+            return
+
+        new = np.array(records, dtype=INDEX_DTYPE)
+        start = len(self._index)
+        self._push(new)
+        self._indexed_bytes = offset
+        if self._all is not None or self._by_round is not None:
+            incidents = self._read_positions(range(start, len(self._index)))
+            self._remember(start, incidents)
+
+    def _remember(self, start: int, incidents: list):
+        if self._all is not None:
+            self._all.extend(incidents)
+        if self._by_round is not None:
+            for pos, incident in enumerate(incidents, start):
+                self._by_round[str(incident.get("round_id"))].append(pos)
+                for feat in _incident_features(incident):
+                    self._by_feature[feat].append(pos)
+
+    def _build_lookup_maps(self):
+        self._by_round, self._by_feature = defaultdict(list), defaultdict(list)
+        all_incidents, self._all = self._all, None
+        # Parse in blocks so building the maps never holds the whole history in memory
+        for start in range(0, self._n, 50_000):
+            stop = min(start + 50_000, self._n)
+            block = all_incidents[start:stop] if all_incidents is not None else self._read_range(start, stop)
+            self._remember(start, block)
+        self._all = all_incidents
+
+    def _read_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Incidents at positions [start, stop) with one sequential read."""
+        if start >= stop:
+            return []
+        index = self._index
+        first, last = index[start], index[stop - 1]
+        with self.path.open("rb") as f:
+            f.seek(int(first["offset"]))
+            data = f.read(int(last["offset"] + last["length"] - first["offset"]))
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    def _read_positions(self, positions) -> List[Dict[str, Any]]:
+        if isinstance(positions, range) and positions.step == 1:
+            return self._read_range(positions.start, positions.stop)
+        incidents = []
+        with self.path.open("rb") as f:
+            for pos in positions:
+                rec = self._index[pos]
+                f.seek(int(rec["offset"]))
+                incidents.append(json.loads(f.read(int(rec["length"]))))
         return incidents
-    
+
+    # -----------------------------
+    # WRITES
+    # -----------------------------
+    def append_incident(self, incident: Dict[str, Any]):
+        incident = {**incident, "timestamp": incident.get("timestamp", time.time())}
+        line = (json.dumps(incident) + "\n").encode()
+        with self._lock, self._file_lock() as f:
+            # Under the file lock nobody else appends, so after the refresh we are at the end
+            self._refresh()
+            offset = f.seek(0, 2)
+            f.write(line)
+            f.flush()
+            rec = np.array([(offset, len(line), incident["timestamp"])], dtype=INDEX_DTYPE)
+            self._push(rec)
+            self._indexed_bytes = offset + len(line)
+            self._persist_index()
+            self._remember(len(self._index) - 1, [incident])
+
+    def clear(self):
+        with self._lock, self._file_lock():
+            self.path.write_bytes(b"")
+            self.index_path.unlink(missing_ok=True)
+            for sidecar in memory_sidecars(self.path).values():
+                sidecar.unlink(missing_ok=True)
+            self._reset()
+
+    def export_jsonl(self, path: Path):
+        """Copy the incident history to `path` as JSONL."""
+        with self._lock:
+            shutil.copyfile(self.path, path)
+
+    # -----------------------------
+    # READS
+    # -----------------------------
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            if self._all is None:
+                self._all = self._read_positions(range(len(self._index)))
+            return list(self._all)
+
     def load_last(self) -> Dict[str, Any] | None:
         """Return the most recent incident, or None if memory is empty."""
-        incidents = self.load_all()
-        if not incidents:
-            return None
-        return incidents[-1]
+        last = self.load_last_k(1)
+        return last[0] if last else None
+
+    def load_last_k(self, k: int) -> List[Dict[str, Any]]:
+        """The `k` most recent incidents, oldest first."""
+        with self._lock:
+            self._refresh()
+            n = len(self._index)
+            if self._all is not None:
+                return self._all[max(n - k, 0):]
+            return self._read_positions(range(max(n - k, 0), n))
+
+    def load_since(self, n: int) -> List[Dict[str, Any]]:
+        """Incidents after the first `n`, i.e. those appended since `len(store)` was `n`."""
+        with self._lock:
+            self._refresh()
+            return self._read_range(n, self._n)
+
+    def load_at(self, positions: list) -> List[Dict[str, Any]]:
+        """Incidents at the given 0-based positions, in that order."""
+        with self._lock:
+            self._refresh()
+            return self._read_positions(positions)
+
+    def load_by_round(self, round_id) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            if self._by_round is None:
+                self._build_lookup_maps()
+            return self._read_positions(self._by_round.get(str(round_id), []))
+
+    def load_by_feature(self, feature: str) -> List[Dict[str, Any]]:
+        """Incidents whose diagnosis lists `feature` as a suspect."""
+        with self._lock:
+            self._refresh()
+            if self._by_round is None:
+                self._build_lookup_maps()
+            return self._read_positions(self._by_feature.get(feature, []))
+
+    def load_prompt_context(self, k: int = 3) -> List[Dict[str, Any]]:
+        """round_id, diagnosis, config_suggestion and trace summary of the last `k` incidents, oldest first."""
+        return [
+            {key: inc.get(key) for key in ("round_id", "diagnosis", "config_suggestion", "trace")}
+            for inc in self.load_last_k(k)
+        ]
 
+    def load_time_range(self, start: float | None = None, end: float | None = None) -> List[Dict[str, Any]]:
+        """Incidents with start <= timestamp < end (unix seconds); incidents without a timestamp are skipped."""
+        with self._lock:
+            self._refresh()
+            ts = self._index["timestamp"]
+            mask = ~np.isnan(ts)
+            if start is not None:
+                mask &= ts >= start
+            if end is not None:
+                mask &= ts < end
+            return self._read_positions(np.flatnonzero(mask))
@@ -1,18 +1,35 @@
+import json
+import threading
+from collections import Counter
+from pathlib import Path
 from typing import List, Dict, Any
 from .llm_client import LLMClient
+from .prompt_builder import PromptBuilder
 
-class MemorySummarizer:
-    def __init__(self):
-        self.llm = LLMClient()
+SUMMARY_PATH = Path(__file__).parent / "memory_summary.json"
 
-    def summarize(self, incidents: List[Dict[str, Any]]) -> Dict[str, Any]:
-        if not incidents:
-            return {"summary": "No past incidents.", "patterns": [], "recommendations": []}
+'''
+    Rolling memory summary. The summarizer persists its last summary with a watermark
+    (how many incidents it has folded in), and each round only the incidents past the
+    watermark go to the LLM, together with the previous summary and a bounded list of
+    per-window rollups (exact counts computed locally, no LLM). When there are more
+    rollups than `max_rollups`, the two oldest merge, so old history gets coarser instead
+    of longer. The prompt is therefore bounded regardless of how many incidents exist,
+    and the prompt builder drops the oldest new incidents if it is still over budget.
+    If the LLM fails or doesn't return a JSON object, nothing is persisted: the previous
+    summary is kept and the same incidents are retried next round.
+'''
 
-        prompt = f"""
-You are an ML reliability analyst. Summarize the following incidents into a compact JSON structure.
+SUMMARY_PROMPT = """
+You are an ML reliability analyst. Update the running summary of past incidents.
 
-INCIDENTS:
+PREVIOUS SUMMARY:
+{previous_summary}
+
+HISTORY ROLLUPS (exact counts per window of rounds, oldest first):
+{rollups}
+
+NEW INCIDENTS SINCE THE PREVIOUS SUMMARY (the most recent ones):
 {incidents}
 
 Provide:
@@ -25,10 +42,179 @@ Provide:
 Respond ONLY with valid JSON.
 """
 
+def _compact_incident(inc: dict) -> dict:
+    """The fields the summary is about, with floats rounded."""
+    diagnosis = inc.get("diagnosis") or {}
+    suggestion = inc.get("config_suggestion") or {}
+
+    def rounded(key):
+        value = inc.get(key)
+        return round(value, 3) if isinstance(value, float) else value
+
+    return {
+        "round_id": inc.get("round_id"),
+        "issue_type": diagnosis.get("issue_type"),
+        "severity": diagnosis.get("severity"),
+        "suspect_features": diagnosis.get("suspect_features"),
+        "config_changes": suggestion.get("changes"),
+        "current_accuracy": rounded("current_accuracy"),
+        "retrained": inc.get("retrained", False),
+        "post_retrain_accuracy": rounded("post_retrain_accuracy"),
+        "new_data_acquired": inc.get("new_data_acquired", False),
+    }
+
+def _parse_summary(response: str) -> dict | None:
+    """The JSON object in the LLM response, or None for an LLM error or unparseable output."""
+    if response.startswith("[LLM ERROR]") or response.endswith("not yet implemented]"):
+        return None
+    try:
+        start, end = response.index("{"), response.rindex("}") + 1
+        summary = json.loads(response[start:end])
+    except ValueError:
+        return None
+    return summary if isinstance(summary, dict) else None
+
+def _empty_rollup() -> dict:
+    return {
+        "first_round": None,
+        "last_round": None,
+        "n": 0,
+        "issue_types": {},
+        "severity": {},
+        "suspect_features": {},
+        "accuracy_sum": 0.0,
+        "retrained": 0,
+        "retrain_improved": 0,
+    }
+
+def _add_to_rollup(rollup: dict, inc: dict):
+    c = _compact_incident(inc)
+    if rollup["first_round"] is None:
+        rollup["first_round"] = c["round_id"]
+    rollup["last_round"] = c["round_id"]
+    rollup["n"] += 1
+    for key, value in (("issue_types", c["issue_type"]), ("severity", c["severity"])):
+        rollup[key][str(value)] = rollup[key].get(str(value), 0) + 1
+    for feat in c["suspect_features"] or []:
+        rollup["suspect_features"][feat] = rollup["suspect_features"].get(feat, 0) + 1
+    rollup["accuracy_sum"] += c["current_accuracy"] or 0.0
+    if c["retrained"]:
+        rollup["retrained"] += 1
+        post, current = c["post_retrain_accuracy"], c["current_accuracy"]
+        if post is not None and current is not None and post > current:
+            rollup["retrain_improved"] += 1
+
+def _merge_rollups(a: dict, b: dict) -> dict:
+    merged = {
+        "first_round": a["first_round"],
+        "last_round": b["last_round"],
+        "n": a["n"] + b["n"],
+        "accuracy_sum": a["accuracy_sum"] + b["accuracy_sum"],
+        "retrained": a["retrained"] + b["retrained"],
+        "retrain_improved": a["retrain_improved"] + b["retrain_improved"],
+    }
+    for key in ("issue_types", "severity", "suspect_features"):
+        merged[key] = dict(Counter(a[key]) + Counter(b[key]))
+    return merged
+
+def _rollup_for_prompt(rollup: dict) -> dict:
+    view = {k: v for k, v in rollup.items() if k != "accuracy_sum"}
+    view["mean_accuracy"] = round(rollup["accuracy_sum"] / rollup["n"], 3) if rollup["n"] else None
+    return view
+
+class MemorySummarizer:
+    def __init__(
+        self,
+        llm: LLMClient | None = None,
+        state_path: Path = SUMMARY_PATH,
+        batch_size: int = 20,
+        window_size: int = 100,
+        max_rollups: int = 8,
+        config: dict | None = None,
+    ):
+        self.llm = llm or LLMClient()
+        self.prompts = PromptBuilder(config, self.llm)
+        self.state_path = Path(state_path)
+        self.batch_size = batch_size
+        self.window_size = window_size
+        self.max_rollups = max_rollups
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # PERSISTED STATE
+    # -----------------------------
+    def _empty_state(self) -> dict:
+        return {"watermark": 0, "summary": None, "rollups": []}
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return self._empty_state()
+        return json.loads(self.state_path.read_text())
+
+    def _save_state(self, state: dict):
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self.state_path)
+
+    def _fold_into_rollups(self, rollups: list, incidents: list):
+        for inc in incidents:
+            if not rollups or rollups[-1]["n"] >= self.window_size:
+                rollups.append(_empty_rollup())
+            _add_to_rollup(rollups[-1], inc)
+        # Hierarchical compaction: the oldest windows merge first
+        while len(rollups) > self.max_rollups:
+            rollups[0:2] = [_merge_rollups(rollups[0], rollups[1])]
+
+    # -----------------------------
+    # LLM
+    # -----------------------------
+    def _ask(self, previous_summary, rollups: list, new_incidents: list):
+        prompt = self.prompts.build(
+            "summarizer",
+            SUMMARY_PROMPT,
+            incidents=[_compact_incident(inc) for inc in new_incidents],
+            previous_summary=previous_summary if previous_summary is not None else "None yet.",
+            rollups=[_rollup_for_prompt(r) for r in rollups],
+        )
+
         system_prompt = (
     "You are an ML reliability analyst. "
     "Summarize historical incidents into a compact JSON structure."
 )
 
         response = self.llm.chat(system_prompt, prompt)
-        return response
\ No newline at end of file
+        summary = _parse_summary(response)
+        if summary is None:
+            print(f"[SUMMARY] Unusable LLM response, keeping the previous summary: {response[:200]}")
+        return summary
+
+    def update(self, memory) -> Dict[str, Any]:
+        """Fold the incidents appended to `memory` since the last call into the persisted summary."""
+        with self._lock:
+            state = self._load_state()
+            if len(memory) < state["watermark"]:
+                state = self._empty_state()  # memory was cleared
+
+            new_incidents = memory.load_since(state["watermark"])
+            if not new_incidents:
+                return state["summary"] or {"summary": "No past incidents.", "patterns": [], "recommendations": []}
+
+            self._fold_into_rollups(state["rollups"], new_incidents)
+            # Only the newest incidents are shown in detail; older ones are covered by the rollups
+            summary = self._ask(state["summary"], state["rollups"], new_incidents[-self.batch_size:])
+            if summary is None:
+                # Don't persist the rollups or move the watermark: these incidents are retried next round
+                return state["summary"] or {"summary": "No summary available yet.", "patterns": [], "recommendations": []}
+            state["summary"] = summary
+            state["watermark"] += len(new_incidents)
+            self._save_state(state)
+            return state["summary"]
+
+    def summarize(self, incidents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """One-off summary of `incidents` (nothing persisted), with the same bounded prompt."""
+        if not incidents:
+            return {"summary": "No past incidents.", "patterns": [], "recommendations": []}
+        rollups = []
+        self._fold_into_rollups(rollups, incidents)
+        summary = self._ask(None, rollups, incidents[-self.batch_size:])
+        return summary or {"summary": "No summary available.", "patterns": [], "recommendations": []}
@@ -0,0 +1,103 @@
+import threading
+from pathlib import Path
+
+import yaml
+
+from .config_critic import ConfigCritic
+from .data_generator import SyntheticDataGenerator
+from .data_pipeline_analyst import DataPipelineAnalyst
+from .incident_index import IncidentIndex
+from .llm_client import LLMClient
+from .memory_store import MEMORY_PATH, memory_sidecars, open_memory_store
+from .memory_summarizer import MemorySummarizer
+from .monitoring_interpreter import MonitoringInterpreter
+from .retrainer import Retrainer
+from .tracing import Tracer
+from model.train_model import MODEL_PATH
+from monitoring.baseline_profile import PROFILE_PATH
+from storage.training_store import TRAIN_STORE_PATH, TrainingStore
+
+
+class ModelContext:
+    """
+    Everything one monitored model's workflow run touches: its config file, model artifact,
+    training store and incident memory (`memory.backend`: jsonl or sqlite, next to `memory_path`),
+    plus the agents bound to them.
+    Contexts can share one LLMClient (and with it the connection pool and concurrency limit).
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient | None = None,
+        config_path: Path = Path("model/config.yaml"),
+        model_path: Path = MODEL_PATH,
+        store_path: Path = TRAIN_STORE_PATH,
+        memory_path: Path = MEMORY_PATH,
+        profile_path: Path = PROFILE_PATH,
+        model_id: str = "default",
+    ):
+        self.model_id = model_id
+        self.config_path = Path(config_path)
+        self.config = yaml.safe_load(open(self.config_path))
+        self.model_path = Path(model_path)
+
+        self.llm = llm or LLMClient()
+        backend = self.config.get("memory", {}).get("backend", "jsonl")
+        memory_path = Path(memory_path)
+        self.memory = open_memory_store(backend, memory_path if backend == "jsonl" else memory_path.with_suffix(".sqlite"))
+        self.store = TrainingStore(store_path)
+        sidecars = memory_sidecars(memory_path)
+        self.incident_index = IncidentIndex(sidecars["vectors"])
+        self.monitor = MonitoringInterpreter(self.llm, self.config, memory=self.memory, incident_index=self.incident_index)
+        self.critic = ConfigCritic(self.llm, self.config, memory=self.memory, incident_index=self.incident_index)
+        self.analyst = DataPipelineAnalyst(self.llm, self.config)
+        self.summarizer = MemorySummarizer(
+            self.llm, state_path=sidecars["summary"], config=self.config
+        )
+        self.retrainer = Retrainer(model_path=self.model_path, config_path=self.config_path)
+        self.generator = SyntheticDataGenerator(self.config, profile_path=profile_path)
+        # Spans go to trace.jsonl (and trace.prom with `tracing.openmetrics`) next to the memory file
+        tracing_cfg = self.config.get("tracing", {})
+        self.tracer = Tracer(
+            memory_path.with_name("trace.jsonl"),
+            openmetrics_path=memory_path.with_name("trace.prom") if tracing_cfg.get("openmetrics") else None,
+            labels={"model": model_id},
+        ) if tracing_cfg.get("enabled", True) else None
+        # Parallel branches of one run may both write the config back
+        self.config_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, root: Path, llm: LLMClient | None = None, model_id: str | None = None) -> "ModelContext":
+        """Context for a self-contained model directory (config.yaml, model.joblib, train_store/, memory.jsonl)."""
+        root = Path(root)
+        return cls(
+            llm=llm,
+            config_path=root / "config.yaml",
+            model_path=root / "model.joblib",
+            store_path=root / "train_store",
+            memory_path=root / "memory.jsonl",
+            profile_path=root / "baseline_profile.npz",
+            model_id=model_id or root.name,
+        )
+
+    def save_config(self):
+        with self.config_lock:
+            with open(self.config_path, "w") as f:
+                yaml.safe_dump(self.config, f)
+
+    def retrain(self):
+        retrain_cfg = self.config["retrain"]
+        if retrain_cfg.get("mode", "full") == "incremental":
+            return self.retrainer.retrain(
+                train_path=self.store.root,
+                mode="incremental",
+                last_n_rounds=retrain_cfg.get("last_n_rounds"),
+                portfolio=retrain_cfg.get("portfolio", False),
+                tolerance=retrain_cfg.get("incremental_tolerance", 0.02),
+                max_iter=retrain_cfg.get("incremental_max_iter", 100),
+            )
+        return self.retrainer.retrain(
+            train_path=self.store.root,
+            last_n_rounds=retrain_cfg.get("last_n_rounds"),
+            portfolio=retrain_cfg.get("portfolio", False),
+        )
@@ -1,29 +1,95 @@
 import json
 import ast
+from .drift_rules import MASSIVE_PSI, SUSPECT_PSI, rule_based_diagnosis
+from .incident_index import IncidentIndex, incident_vector
 from .llm_client import LLMClient
 from .memory_store import MemoryStore
+from .prompt_builder import PromptBuilder
+
+DIAGNOSIS_PROMPT = """
+You are diagnosing ML drift.
+
+You MUST:
+1. Read the monitoring report carefully.
+2. Use the exact PSI values from the report.
+3. Use the exact accuracy_drop from the report.
+4. Identify which features have PSI > 0.1.
+5. Compare this round with past incidents.
+6. Explain differences explicitly.
+7. Return ONLY a JSON object.
+
+Monitoring report (per-feature metrics for the most drifted features; "omitted_features" summarizes the rest and names any omitted feature with PSI > 0.1):
+{report}
+
+{memory_label}:
+{incidents}
+
+Return ONLY a JSON object with EXACTLY these keys:
+- "issue_type": one of ["data_drift", "concept_drift", "pipeline_issue", "unknown"]
+- "suspect_features": list of feature names with PSI > 0.1
+- "severity": "low" | "medium" | "high"
+- "reasoning": a short explanation that MUST reference:
+    - the PSI values,
+    - the accuracy_drop,
+    - and differences vs past incidents.
+"""
 
 
 class MonitoringInterpreter:
-    def __init__(self, llm: LLMClient):
+    def __init__(
+        self,
+        llm: LLMClient,
+        config: dict | None = None,
+        memory: MemoryStore | None = None,
+        incident_index: IncidentIndex | None = None,
+        prompt_builder: PromptBuilder | None = None,
+    ):
         self.llm = llm
-        self.memory = MemoryStore()
-
-    def _summarize_memory(self, incidents):
-        if not incidents:
-            return "No past incidents available."
-
-        recent = incidents[-3:]
-        return json.dumps(
-            [
-                {
-                    "round_id": inc.get("round_id"),
-                    "diagnosis": inc.get("diagnosis"),
-                    "config_suggestion": inc.get("config_suggestion"),
-                }
-                for inc in recent
-            ],
-            indent=2,
+        self.config = config or {}
+        self.prompts = prompt_builder or PromptBuilder(self.config, llm)
+        self.memory = memory or MemoryStore()
+        # With an index, prompts carry the most similar past incidents instead of the latest ones
+        self.incident_index = incident_index
+        self.rule_diagnoses = 0
+        self.llm_diagnoses = 0
+
+    @property
+    def escalation_rate(self) -> float:
+        """Share of reports that needed the LLM."""
+        total = self.rule_diagnoses + self.llm_diagnoses
+        return self.llm_diagnoses / total if total else 0.0
+
+    def _rule_diagnosis(self, report: dict) -> dict | None:
+        monitoring_cfg = self.config.get("monitoring", {})
+        if not monitoring_cfg.get("rules_enabled", True):
+            return None
+        return rule_based_diagnosis(
+            report,
+            psi_threshold=monitoring_cfg.get("psi_threshold", 0.2),
+            accuracy_drop_threshold=monitoring_cfg.get("accuracy_drop_threshold", 0.05),
+            massive_psi=monitoring_cfg.get("massive_psi_threshold", MASSIVE_PSI),
+        )
+
+    def _prompt_incidents(self, incidents) -> list:
+        return [
+            {
+                "round_id": inc.get("round_id"),
+                **({"similarity": inc["similarity"]} if "similarity" in inc else {}),
+                "diagnosis": inc.get("diagnosis"),
+                "config_suggestion": inc.get("config_suggestion"),
+            }
+            for inc in incidents[-3:]
+        ]
+
+    def build_prompt(self, report: dict, past_incidents: list, memory_label: str, ranked: bool = False) -> str:
+        return self.prompts.build(
+            "monitor",
+            DIAGNOSIS_PROMPT,
+            report=report,
+            incidents=self._prompt_incidents(past_incidents),
+            drop_incidents_from="back" if ranked else "front",
+            suspect_psi=SUSPECT_PSI,
+            memory_label=memory_label,
         )
 
     def _parse_llm_json(self, text: str, fallback_report: dict) -> dict:
@@ -66,42 +132,35 @@ class MonitoringInterpreter:
     def interpret(self, drift_report_path: str) -> dict:
         report = json.loads(open(drift_report_path).read())
 
-        past_incidents = self.memory.load_all()
-        memory_summary = self._summarize_memory(past_incidents)
+        # Tier 1: clear-cut reports never reach the LLM
+        diagnosis = self._rule_diagnosis(report)
+        if diagnosis is not None:
+            self.rule_diagnoses += 1
+            diagnosis["diagnosis_source"] = "rules"
+            print(f"[MONITORING_INTERPRETER] Rule-based diagnosis (escalation rate {self.escalation_rate:.0%})")
+            return diagnosis
+
+        if self.incident_index is not None:
+            psi = report.get("psi_by_feature") or {}
+            query = incident_vector(
+                psi, report.get("accuracy_drop"), [f for f, v in psi.items() if v is not None and v > SUSPECT_PSI]
+            )
+            past_incidents = self.incident_index.similar(self.memory, query, k=3)
+            memory_label = "Most similar past incidents"
+        else:
+            past_incidents = self.memory.load_prompt_context(3)
+            memory_label = "Recent past incidents"
 
         system_prompt = (
             "You are an ML reliability engineer. "
             "You diagnose drift issues using monitoring metrics and past incidents."
         )
 
-        user_prompt = f"""
-You are diagnosing ML drift.
-
-You MUST:
-1. Read the monitoring report carefully.
-2. Use the exact PSI values from the report.
-3. Use the exact accuracy_drop from the report.
-4. Identify which features have PSI > 0.1.
-5. Compare this round with past incidents.
-6. Explain differences explicitly.
-7. Return ONLY a JSON object.
-
-Monitoring report:
-{json.dumps(report, indent=2)}
-
-Recent past incidents:
-{memory_summary}
-
-Return ONLY a JSON object with EXACTLY these keys:
-- "issue_type": one of ["data_drift", "concept_drift", "pipeline_issue", "unknown"]
-- "suspect_features": list of feature names with PSI > 0.1
-- "severity": "low" | "medium" | "high"
-- "reasoning": a short explanation that MUST reference:
-    - the PSI values,
-    - the accuracy_drop,
-    - and differences vs past incidents.
-"""
+        user_prompt = self.build_prompt(report, past_incidents, memory_label, ranked=self.incident_index is not None)
 
-        response = self.llm.chat(system_prompt, user_prompt)
+        response = self.llm.chat(system_prompt, user_prompt, stop_at_json=True)
         diagnosis = self._parse_llm_json(response, report)
+        self.llm_diagnoses += 1
+        diagnosis["diagnosis_source"] = "llm"
+        print(f"[MONITORING_INTERPRETER] Escalated to LLM (escalation rate {self.escalation_rate:.0%})")
         return diagnosis
\ No newline at end of file
@@ -1,136 +1,152 @@
+import contextlib
+import functools
 import json
-import pandas as pd
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
 
 from .graph_state import AgentState
-from .monitoring_interpreter import MonitoringInterpreter
-from .config_critic import ConfigCritic
-from .data_pipeline_analyst import DataPipelineAnalyst
-from .memory_store import MemoryStore
-from .retrainer import Retrainer
-from .data_generator import SyntheticDataGenerator
-from .memory_summarizer import MemorySummarizer
+from .llm_client import LLMClient
+from .memory_store import MEMORY_PATH
+from .model_context import ModelContext
+from .tracing import trace_summary
 from pathlib import Path
-import yaml
 
 
-# Shared singletons (mirroring your Orchestrator.__init__)
-_config_path = Path("model/config.yaml")
-_config = yaml.safe_load(open(_config_path))
+# Shared default context (mirroring your Orchestrator.__init__); a run can bring its
+# own via config={"configurable": {"model_context": ctx}} (see agents/fleet.py)
+_default_context = None
 
-_llm = None
-_monitor = None
-_critic = None
-_analyst = None
-_memory = None
-_retrainer = None
-_generator = None
+# Parallel branches may hit _ensure_singletons at the same time
+_lock = threading.RLock()
 
-_summarizer = None
+def init_nodes(llm: LLMClient | None = None, config_path: Path | None = None, memory_path: Path = MEMORY_PATH):
+    """(Re)build the default context, optionally around a given LLM client, config file or memory file."""
+    global _default_context
+    with _lock:
+        _default_context = ModelContext(
+            llm=llm,
+            config_path=Path(config_path) if config_path else Path("model/config.yaml"),
+            memory_path=memory_path,
+        )
 
 def _ensure_singletons():
-    global _llm, _monitor, _critic, _analyst, _memory, _retrainer, _generator
-    from .llm_client import LLMClient
-
-    global _summarizer
-    if _summarizer is None:
-        _summarizer = MemorySummarizer()
-
-    if _llm is None:
-        _llm = LLMClient()
-        from .monitoring_interpreter import MonitoringInterpreter
-        from .config_critic import ConfigCritic
-        from .data_pipeline_analyst import DataPipelineAnalyst
-        from .memory_store import MemoryStore
-        from .retrainer import Retrainer
-        from .data_generator import SyntheticDataGenerator
-
-        _monitor = MonitoringInterpreter(_llm)
-        _critic = ConfigCritic(_llm, _config)
-        _analyst = DataPipelineAnalyst(_llm)
-        _memory = MemoryStore()
-        _retrainer = Retrainer()
-        _generator = SyntheticDataGenerator()
-
-
-def node_monitor(state: AgentState) -> AgentState:
+    with _lock:
+        if _default_context is None:
+            init_nodes()
+
+def _context(config: RunnableConfig | None) -> ModelContext:
+    ctx = ((config or {}).get("configurable") or {}).get("model_context")
+    if ctx is not None:
+        return ctx
     _ensure_singletons()
+    return _default_context
+
+def _trace_id(ctx: ModelContext, state: AgentState) -> str:
+    return f"{ctx.model_id}/round-{state['round_id']}"
+
+def timed(node):
+    """
+    Record the node's wall time under `node_timings` in its state update, and run it
+    inside a tracing span (LLM calls made by the node become its child spans).
+    """
+    name = node.__name__.removeprefix("node_")
+
+    @functools.wraps(node)
+    def wrapper(state: AgentState, config: RunnableConfig) -> dict:
+        ctx = _context(config)
+        span = (
+            ctx.tracer.span(name, kind="node", trace_id=_trace_id(ctx, state), round_id=state["round_id"])
+            if ctx.tracer is not None else contextlib.nullcontext()
+        )
+        start = time.perf_counter()
+        with span:
+            update = node(state, config)
+        return {**update, "node_timings": {name: time.perf_counter() - start}}
+
+    return wrapper
+
+
+# Nodes return only the keys they produce, so branches running in parallel never
+# write the same state key (LangGraph merges the partial updates).
+
+@timed
+def node_monitor(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
     print(f"\n[GRAPH] === Round {state['round_id']} ===")
-    diagnosis = _monitor.interpret(state["drift_report_path"])
+    diagnosis = ctx.monitor.interpret(state["drift_report_path"])
     print("[GRAPH] Diagnosis:", diagnosis)
-    state["diagnosis"] = diagnosis
-    return state
+    return {"diagnosis": diagnosis}
 
 
-def node_config_critic(state: AgentState) -> AgentState:
-    _ensure_singletons()
-    config_suggestion = _critic.suggest_changes(state["diagnosis"])
+@timed
+def node_config_critic(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
+    report = json.loads(open(state["drift_report_path"]).read())
+    config_suggestion = ctx.critic.suggest_changes(state["diagnosis"], report)
     print("[GRAPH] Config suggestion:", config_suggestion)
-    state["config_suggestion"] = config_suggestion
 
     should_retrain = config_suggestion.get("should_retrain", False)
     print("[GRAPH] Should retrain:", should_retrain)
 
     # Prevent infinite retraining loops (same as orchestrator)
-    last_incident = _memory.load_last()
+    last_incident = ctx.memory.load_last()
     if should_retrain and last_incident and last_incident.get("retrained", False):
         print("[GRAPH] Skipping retraining — already retrained last round.")
         should_retrain = False
 
-    state["should_retrain"] = should_retrain
-
     # Apply config patch + persist
-    _critic.apply_patch(config_suggestion)
-    with open(_config_path, "w") as f:
-        yaml.safe_dump(_config, f)
+    ctx.critic.apply_patch(config_suggestion)
+    ctx.save_config()
 
-    return state
+    return {"config_suggestion": config_suggestion, "should_retrain": should_retrain}
 
 
-def node_data_analyst(state: AgentState) -> AgentState:
-    _ensure_singletons()
-    data_suggestion = _analyst.suggest_data_fixes(
+@timed
+def node_data_analyst(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
+    data_suggestion = ctx.analyst.suggest_data_fixes(
         state["diagnosis"],
         state.get("memory_summary", {})
     )
     print("[GRAPH] Data suggestion:", data_suggestion)
-    state["data_suggestion"] = data_suggestion
-    return state
+    return {"data_suggestion": data_suggestion}
 
 
-def node_retrain(state: AgentState) -> AgentState:
-    _ensure_singletons()
+@timed
+def node_retrain(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
     print("[GRAPH] Retraining triggered...")
-    new_acc = _retrainer.retrain()
-    state["retrained"] = True
-    state["post_retrain_accuracy"] = new_acc
-    return state
+    new_acc = ctx.retrain()
+    return {"retrained": True, "post_retrain_accuracy": new_acc}
 
 
-def node_new_data(state: AgentState) -> AgentState:
-    _ensure_singletons()
+@timed
+def node_new_data(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
     print("[GRAPH] Retraining ineffective — acquiring new data...")
 
     drift_report_path = state["drift_report_path"]
     drift_report = json.loads(open(drift_report_path).read())
 
-    new_data = _generator.generate(drift_report, n_samples=500)
-
-    train_df = pd.read_csv("data/train.csv")
-    updated_train = pd.concat([train_df, new_data], ignore_index=True)
-    updated_train.to_csv("data/train.csv", index=False)
-
-    state["new_data_acquired"] = True
-    state["new_data_samples"] = len(new_data)
+    # New rows stream into their own segment: O(new rows), history is never rewritten
+    segment = ctx.generator.write_to_store(ctx.store, 500, round_id=state["round_id"], drift_report=drift_report)
 
     print("[GRAPH] Retraining with new data...")
-    improved_acc = _retrainer.retrain()
-    state["post_newdata_accuracy"] = improved_acc
+    improved_acc = ctx.retrain()
 
-    return state
+    return {
+        "new_data_acquired": True,
+        "new_data_samples": segment["n_rows"],
+        "post_newdata_accuracy": improved_acc,
+    }
 
 
-def node_memory(state: AgentState) -> AgentState:
-    _ensure_singletons()
+@timed
+def node_memory(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
+    report = json.loads(open(state["drift_report_path"]).read())
     incident = {
         "round_id": state["round_id"],
         "diagnosis": state["diagnosis"],
@@ -138,6 +154,8 @@ def node_memory(state: AgentState) -> AgentState:
         "data_suggestion": state["data_suggestion"],
         "baseline_accuracy": state["baseline_accuracy"],
         "current_accuracy": state["current_accuracy"],
+        "accuracy_drop": report.get("accuracy_drop"),
+        "psi_by_feature": report.get("psi_by_feature"),
         "should_retrain": state["should_retrain"],
         "retrained": state.get("retrained", False),
         "post_retrain_accuracy": state.get("post_retrain_accuracy"),
@@ -145,14 +163,24 @@ def node_memory(state: AgentState) -> AgentState:
         "new_data_samples": state.get("new_data_samples"),
         "post_newdata_accuracy": state.get("post_newdata_accuracy"),
     }
-    _memory.append_incident(incident)
+    if ctx.tracer is not None:
+        # Every earlier node of this round (and its LLM calls) has finished by now
+        incident["trace"] = trace_summary(ctx.tracer.pop_trace(_trace_id(ctx, state)))
+    ctx.memory.append_incident(incident)
+    ctx.incident_index.sync(ctx.memory)
     print("[GRAPH] Incident stored in memory.")
-    return state
+    return {}
 
-def node_summarize_memory(state: AgentState) -> AgentState:
-    _ensure_singletons()
-    incidents = _memory.load_all()
-    summary = _summarizer.summarize(incidents)
+
+@timed
+def node_summarize_memory(state: AgentState, config: RunnableConfig) -> dict:
+    ctx = _context(config)
+    # Only incidents appended since the last round are sent to the LLM
+    summary = ctx.summarizer.update(ctx.memory)
     print("[GRAPH] Memory summary generated.")
-    state["memory_summary"] = summary
-    return state
\ No newline at end of file
+    return {"memory_summary": summary}
+
+
+def node_join(state: AgentState) -> dict:
+    """Fan-in point: runs once both the critic and data analyst branches are done."""
+    return {}
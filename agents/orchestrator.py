@@ -9,7 +9,6 @@ from .data_pipeline_analyst import DataPipelineAnalyst
 from .memory_store import MemoryStore
 from agents.retrainer import Retrainer
 from agents.data_generator import SyntheticDataGenerator
-import pandas as pd
 
 ''' THIS CLASS HAS BEEN DEPRECATED IN FAVOR OF THE LangGraph WORKFLOW-BASED ORCHESTRATOR IN workflow.py'''
 class Orchestrator:
@@ -19,7 +18,7 @@ class Orchestrator:
         self.config = yaml.safe_load(open(self.config_path))
         self.llm = LLMClient()
         self.retrainer = Retrainer()
-        self.monitoring_interpreter = MonitoringInterpreter(self.llm)
+        self.monitoring_interpreter = MonitoringInterpreter(self.llm, self.config)
         #self.code_critic = CodeConfigCritic(self.llm)
         self.code_critic = ConfigCritic(self.llm, self.config)
         self.data_analyst = DataPipelineAnalyst(self.llm)
@@ -86,6 +85,8 @@ class Orchestrator:
                 new_data = self.data_generator.generate(drift_report, n_samples=500)
 
                 # Append to training set
+                import pandas as pd
+
                 train_df = pd.read_csv("data/train.csv")
                 updated_train = pd.concat([train_df, new_data], ignore_index=True)
                 updated_train.to_csv("data/train.csv", index=False)
@@ -0,0 +1,160 @@
+import json
+from typing import Any, Dict, List
+
+'''
+    Compact, budgeted prompt sections.
+    Reports, configs and incidents are serialized as minified JSON with rounded floats;
+    per-feature report metrics keep only the top-k features by PSI (plus a note on what was
+    left out, naming every omitted feature above the suspect PSI threshold), and long lists
+    (not dicts, and not the report, which top-k already bounds) are cut to `max_list_items`.
+    If the rendered prompt is still
+    over `max_tokens`, the report's top-k is halved, then incidents are dropped (the oldest,
+    or the least similar), until it fits. Token counts use the LLM client's measured characters per token
+    (calibrated from the provider's prompt_eval_count), else ~4 characters per token.
+    Each build prints the prompt's size and keeps it in `last_stats`.
+
+    prompts:
+      max_tokens: 3000        # null = no budget
+      top_k_features: 20      # null = every feature
+      float_digits: 4         # null = no rounding
+      max_list_items: 20      # null = no truncation
+'''
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+def round_floats(obj: Any, digits: int | None) -> Any:
+    if digits is None:
+        return obj
+    if isinstance(obj, float):
+        return round(obj, digits)
+    if isinstance(obj, dict):
+        return {k: round_floats(v, digits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(v, digits) for v in obj]
+    return obj
+
+def truncate_lists(obj: Any, max_items: int | None) -> Any:
+    """Cut lists longer than `max_items`, noting how many entries were left out (dicts keep every key)."""
+    if max_items is None:
+        return obj
+    if isinstance(obj, dict):
+        return {k: truncate_lists(v, max_items) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        kept = [truncate_lists(v, max_items) for v in obj[:max_items]]
+        if len(obj) > max_items:
+            kept.append(f"... {len(obj) - max_items} more")
+        return kept
+    return obj
+
+def top_drift_features(report: dict, k: int | None) -> List[str]:
+    """The `k` features with the highest PSI (all of them, highest first, if `k` is None)."""
+    psi = report.get("psi_by_feature") or {}
+    ranked = sorted(psi, key=lambda f: -(psi[f] if psi[f] is not None else float("-inf")))
+    return ranked if k is None else ranked[:k]
+
+def compact_report(report: dict, top_k: int | None, suspect_psi: float | None = None) -> dict:
+    """
+    The drift report with every `*_by_feature` metric restricted to the top-k drifting features.
+    Omitted features with PSI above `suspect_psi` are still named, so none can go unreported.
+    """
+    features = top_drift_features(report, top_k)
+    keep = set(features)
+    compact = {}
+    for key, value in report.items():
+        if key.endswith("_by_feature") and isinstance(value, dict):
+            compact[key] = {f: value[f] for f in features if f in value} if top_k is not None else value
+        else:
+            compact[key] = value
+    omitted = [f for f in report.get("psi_by_feature") or {} if f not in keep]
+    if omitted:
+        psi = report["psi_by_feature"]
+        compact["omitted_features"] = {
+            "count": len(omitted),
+            "max_psi": max((psi[f] for f in omitted if psi[f] is not None), default=None),
+        }
+        if suspect_psi is not None:
+            compact["omitted_features"][f"psi_above_{suspect_psi:g}"] = [
+                f for f in omitted if psi[f] is not None and psi[f] > suspect_psi
+            ]
+    return compact
+
+class PromptBuilder:
+    def __init__(self, config: dict | None = None, llm=None):
+        cfg = (config or {}).get("prompts", {})
+        self.max_tokens = cfg.get("max_tokens", 3000)
+        self.top_k = cfg.get("top_k_features", 20)
+        self.digits = cfg.get("float_digits", 4)
+        self.max_list_items = cfg.get("max_list_items", 20)
+        # Indent > 0 reproduces the old pretty-printed prompts (e.g. to benchmark against them)
+        self.indent = cfg.get("indent")
+        self.llm = llm
+        self.last_stats: Dict[str, Any] = {}
+
+    def count_tokens(self, text: str) -> int:
+        ratio = getattr(self.llm, "chars_per_token", None) or DEFAULT_CHARS_PER_TOKEN
+        return int(len(text) / ratio) + 1
+
+    def dumps(self, obj: Any, truncate: bool = True) -> str:
+        obj = round_floats(obj, self.digits)
+        if truncate:
+            obj = truncate_lists(obj, self.max_list_items)
+        if self.indent:
+            return json.dumps(obj, indent=self.indent, default=str)
+        return json.dumps(obj, separators=(",", ":"), default=str)
+
+    def build(
+        self,
+        name: str,
+        template: str,
+        report: dict | None = None,
+        incidents: list | None = None,
+        drop_incidents_from: str = "front",
+        suspect_psi: float | None = None,
+        **fields,
+    ) -> str:
+        """
+        Render `template` (str.format) with `report` and `incidents` serialized compactly,
+        shrinking both until the prompt fits `max_tokens`. Incidents are dropped from the
+        front (chronological lists) or the "back" (lists ranked best first). Features omitted
+        from the report with PSI above `suspect_psi` are always named. Other fields are
+        serialized as-is (strings verbatim, everything else as compact JSON).
+        """
+        values = {k: v if isinstance(v, str) else self.dumps(v) for k, v in fields.items()}
+        n_features = len((report or {}).get("psi_by_feature") or {})
+        top_k = self.top_k if self.top_k is not None else n_features
+        incidents = list(incidents or [])
+        n_incidents = len(incidents)
+
+        while True:
+            if report is not None:
+                compact = compact_report(report, top_k if top_k < n_features else None, suspect_psi)
+                values["report"] = self.dumps(compact, truncate=False)
+            if "{incidents}" in template:
+                values["incidents"] = self.dumps(incidents) if incidents else "No past incidents available."
+            prompt = template.format(**values)
+            tokens = self.count_tokens(prompt)
+            if self.max_tokens is None or tokens <= self.max_tokens:
+                break
+            if report is not None and top_k > 1 and n_features > 1:
+                top_k = max(1, min(top_k, n_features) // 2)
+            elif incidents:
+                incidents = incidents[1:] if drop_incidents_from == "front" else incidents[:-1]
+            else:
+                break
+
+        self.last_stats = {
+            "prompt": name,
+            "prompt_tokens_est": tokens,
+            "budget": self.max_tokens,
+            "over_budget": self.max_tokens is not None and tokens > self.max_tokens,
+        }
+        if report is not None:
+            self.last_stats["features"] = f"{min(top_k, n_features)}/{n_features}"
+        if "{incidents}" in template:
+            self.last_stats["incidents"] = f"{len(incidents)}/{n_incidents}"
+        shown = ", ".join(f"{key} {self.last_stats[key]}" for key in ("features", "incidents") if key in self.last_stats)
+        print(
+            f"[PROMPT] {name}: ~{tokens} tokens (budget {self.max_tokens}{', ' + shown if shown else ''})"
+            + (" OVER BUDGET" if self.last_stats["over_budget"] else "")
+        )
+        return prompt
@@ -1,8 +1,33 @@
-from model.train_model import train
+from model.train_model import CONFIG_PATH, MODEL_PATH, train, train_incremental
+from storage.training_store import TRAIN_STORE_PATH
 
 class Retrainer:
-    def retrain(self, train_path="data/train.csv"):
-        print("[RETRAIN] Starting retraining...")
-        new_acc = train(train_path)
+    def __init__(self, model_path=MODEL_PATH, config_path=CONFIG_PATH):
+        self.model_path = model_path
+        self.config_path = config_path
+
+    def retrain(self, train_path=TRAIN_STORE_PATH, last_n_rounds=None, mode="full", portfolio=False, **incremental_opts):
+        """
+        `mode="incremental"` updates the current model with the new segments (full refit as fallback).
+        `portfolio=True` makes full refits train the candidate portfolio in parallel and promote the best.
+        """
+        print(f"[RETRAIN] Starting retraining ({mode})...")
+        if mode == "incremental":
+            new_acc = train_incremental(
+                train_path,
+                last_n_rounds=last_n_rounds,
+                portfolio=portfolio,
+                model_path=self.model_path,
+                config_path=self.config_path,
+                **incremental_opts,
+            )
+        else:
+            new_acc = train(
+                train_path,
+                last_n_rounds=last_n_rounds,
+                portfolio=portfolio,
+                model_path=self.model_path,
+                config_path=self.config_path,
+            )
         print(f"[RETRAIN] New validation accuracy: {new_acc}")
         return new_acc
\ No newline at end of file
@@ -0,0 +1,206 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+from .memory_store import MEMORY_PATH, _incident_features, memory_sidecars
+
+SQLITE_MEMORY_PATH = MEMORY_PATH.with_suffix(".sqlite")
+
+'''
+    SQLite backend for incident memory (same API as MemoryStore).
+    WAL mode lets readers run alongside one writer; every writer, from any thread or process,
+    goes through SQLite's locking, so concurrent workflows never interleave or drop incidents.
+    The full incident is stored as JSON in `body`; the fields agents filter on are
+    duplicated into indexed columns (and suspect features into their own table).
+    `pos` is the incident's 0-based position in append order (what load_since / load_at and
+    the summarizer's watermark count in), assigned inside the write transaction and indexed,
+    so positional reads are index lookups instead of OFFSET scans.
+'''
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    pos INTEGER,
+    round_id TEXT,
+    timestamp REAL,
+    issue_type TEXT,
+    severity TEXT,
+    baseline_accuracy REAL,
+    current_accuracy REAL,
+    retrained INTEGER,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_round ON incidents(round_id);
+CREATE INDEX IF NOT EXISTS idx_incidents_timestamp ON incidents(timestamp);
+CREATE INDEX IF NOT EXISTS idx_incidents_severity ON incidents(severity);
+CREATE INDEX IF NOT EXISTS idx_incidents_accuracy ON incidents(current_accuracy);
+CREATE TABLE IF NOT EXISTS incident_features (
+    feature TEXT NOT NULL,
+    seq INTEGER NOT NULL REFERENCES incidents(seq) ON DELETE CASCADE,
+    PRIMARY KEY (feature, seq)
+) WITHOUT ROWID;
+"""
+
+INSERT_INCIDENT = """
+INSERT INTO incidents (pos, round_id, timestamp, issue_type, severity, baseline_accuracy, current_accuracy, retrained, body)
+VALUES ((SELECT COALESCE(MAX(pos), -1) + 1 FROM incidents), ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Databases created before `pos` existed get it added and backfilled in append order
+ADD_POSITIONS = """
+ALTER TABLE incidents ADD COLUMN pos INTEGER;
+UPDATE incidents SET pos = ranked.rn
+FROM (SELECT seq, ROW_NUMBER() OVER (ORDER BY seq) - 1 AS rn FROM incidents) AS ranked
+WHERE incidents.seq = ranked.seq;
+"""
+# What the interpreter and critic prompts show of past incidents
+PROMPT_CONTEXT = """
+SELECT round_id, json_extract(body, '$.diagnosis'), json_extract(body, '$.config_suggestion'),
+       json_extract(body, '$.trace')
+FROM incidents ORDER BY seq DESC LIMIT ?
+"""
+
+class SQLiteMemoryStore:
+    def __init__(self, path: Path = SQLITE_MEMORY_PATH, timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(incidents)")}
+            if "pos" not in columns:
+                conn.executescript(ADD_POSITIONS)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_incidents_pos ON incidents(pos)")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; statements are cached (prepared once) per connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------
+    # WRITES
+    # -----------------------------
+    def append_incident(self, incident: Dict[str, Any]):
+        self.append_incidents([incident])
+
+    def append_incidents(self, incidents: List[Dict[str, Any]]):
+        """Insert a batch in one transaction."""
+        conn = self._conn()
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue instead of deadlocking
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for incident in incidents:
+                incident = {**incident, "timestamp": incident.get("timestamp", time.time())}
+                diagnosis = incident.get("diagnosis") or {}
+                cur = conn.execute(INSERT_INCIDENT, (
+                    None if incident.get("round_id") is None else str(incident["round_id"]),
+                    incident["timestamp"],
+                    diagnosis.get("issue_type"),
+                    diagnosis.get("severity"),
+                    incident.get("baseline_accuracy"),
+                    incident.get("current_accuracy"),
+                    int(bool(incident.get("retrained", False))),
+                    json.dumps(incident),
+                ))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO incident_features (feature, seq) VALUES (?, ?)",
+                    [(feat, cur.lastrowid) for feat in _incident_features(incident)],
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM incident_features")
+            conn.execute("DELETE FROM incidents")
+        for sidecar in memory_sidecars(self.path).values():
+            sidecar.unlink(missing_ok=True)
+
+    def export_jsonl(self, path: Path):
+        """Write the incident history to `path` as JSONL (the MemoryStore file format)."""
+        with open(path, "w") as f:
+            for (body,) in self._conn().execute("SELECT body FROM incidents ORDER BY seq"):
+                f.write(body + "\n")
+
+    # -----------------------------
+    # READS
+    # -----------------------------
+    def _bodies(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        return [json.loads(body) for (body,) in self._conn().execute(sql, params)]
+
+    def __len__(self) -> int:
+        # Positions are dense from 0 (rows are only ever deleted all at once), so this is an index lookup
+        return self._conn().execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM incidents").fetchone()[0]
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        return self._bodies("SELECT body FROM incidents ORDER BY seq")
+
+    def load_last(self) -> Dict[str, Any] | None:
+        """Return the most recent incident, or None if memory is empty."""
+        last = self.load_last_k(1)
+        return last[0] if last else None
+
+    def load_last_k(self, k: int) -> List[Dict[str, Any]]:
+        """The `k` most recent incidents, oldest first."""
+        rows = self._bodies("SELECT body FROM incidents ORDER BY seq DESC LIMIT ?", (k,))
+        return rows[::-1]
+
+    def load_since(self, n: int) -> List[Dict[str, Any]]:
+        """Incidents after the first `n`, i.e. those appended since `len(store)` was `n`."""
+        return self._bodies("SELECT body FROM incidents WHERE pos >= ? ORDER BY pos", (n,))
+
+    def load_at(self, positions: list) -> List[Dict[str, Any]]:
+        """Incidents at the given 0-based positions, in that order (one query)."""
+        positions = [int(pos) for pos in positions]
+        if not positions:
+            return []
+        placeholders = ",".join("?" * len(set(positions)))
+        rows = self._conn().execute(
+            f"SELECT pos, body FROM incidents WHERE pos IN ({placeholders})", tuple(set(positions))
+        )
+        by_pos = {pos: json.loads(body) for pos, body in rows}
+        return [by_pos[pos] for pos in positions if pos in by_pos]
+
+    def load_by_round(self, round_id) -> List[Dict[str, Any]]:
+        return self._bodies("SELECT body FROM incidents WHERE round_id = ? ORDER BY seq", (str(round_id),))
+
+    def load_by_feature(self, feature: str) -> List[Dict[str, Any]]:
+        """Incidents whose diagnosis lists `feature` as a suspect."""
+        return self._bodies(
+            "SELECT i.body FROM incident_features f JOIN incidents i ON i.seq = f.seq "
+            "WHERE f.feature = ? ORDER BY f.seq",
+            (feature,),
+        )
+
+    def load_time_range(self, start: float | None = None, end: float | None = None) -> List[Dict[str, Any]]:
+        """Incidents with start <= timestamp < end (unix seconds)."""
+        return self._bodies(
+            "SELECT body FROM incidents WHERE timestamp >= ? AND timestamp < ? ORDER BY seq",
+            (start if start is not None else float("-inf"), end if end is not None else float("inf")),
+        )
+
+    def load_by_severity(self, severity: str) -> List[Dict[str, Any]]:
+        return self._bodies("SELECT body FROM incidents WHERE severity = ? ORDER BY seq", (severity,))
+
+    def load_prompt_context(self, k: int = 3) -> List[Dict[str, Any]]:
+        """round_id, diagnosis, config_suggestion and trace summary of the last `k` incidents, oldest first."""
+        rows = self._conn().execute(PROMPT_CONTEXT, (k,)).fetchall()
+        return [
+            {
+                "round_id": round_id,
+                "diagnosis": json.loads(diagnosis) if diagnosis else None,
+                "config_suggestion": json.loads(suggestion) if suggestion else None,
+                "trace": json.loads(trace) if trace else None,
+            }
+            for round_id, diagnosis, suggestion, trace in reversed(rows)
+        ]
@@ -0,0 +1,162 @@
+import contextvars
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List
+
+TRACE_PATH = Path(__file__).parent / "trace.jsonl"
+
+'''
+    Lightweight tracing for workflow rounds.
+    A span records wall time, CPU time of the running thread, and how much the process's
+    peak RSS grew while it was open (ru_maxrss, so cheap but process-wide: spans running in
+    parallel share it). Spans are appended to a JSONL file as they end; with `openmetrics_path`
+    the running per-node / LLM totals are also rewritten there in OpenMetrics text format.
+    The active span lives in a context variable, so anything called inside a node (e.g.
+    LLMClient.chat) can open a child span with the module-level `span()` without knowing the
+    tracer; outside any traced node it is a no-op.
+'''
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+# ru_maxrss is in KB on Linux and in bytes on macOS
+_MAXRSS_BYTES = 1 if sys.platform == "darwin" else 1024
+
+def _peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_BYTES
+
+class Span:
+    def __init__(self, tracer: "Tracer | None", name: str, kind: str, trace_id: str | None, parent_id: str | None):
+        self.tracer = tracer
+        self.record = {
+            "trace_id": trace_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent_id,
+            "name": name,
+            "kind": kind,
+        }
+
+    def set(self, **attrs):
+        if self.tracer is not None:
+            self.record.update(attrs)
+
+_NOOP = Span(None, "", "", None, None)
+
+class Tracer:
+    def __init__(self, path: Path | None = TRACE_PATH, openmetrics_path: Path | None = None, labels: dict | None = None):
+        self.path = Path(path) if path else None
+        self.openmetrics_path = Path(openmetrics_path) if openmetrics_path else None
+        # Constant labels on every OpenMetrics sample (e.g. the model id in a fleet)
+        self.labels = labels or {}
+        self._lock = threading.Lock()
+        # Spans per trace until pop_trace; traces that are never popped (failed rounds) are evicted oldest first
+        self._traces = OrderedDict()
+        self.max_traces = 256
+        self._totals = defaultdict(lambda: defaultdict(float))
+
+    @contextmanager
+    def span(self, name: str, kind: str = "node", trace_id: str | None = None, **attrs):
+        parent = _current.get()
+        if trace_id is None and parent is not None:
+            trace_id = parent.record["trace_id"]
+        s = Span(self, name, kind, trace_id, parent.record["span_id"] if parent is not None else None)
+        s.set(**attrs)
+        token = _current.set(s)
+        start_ts, start, cpu, rss = time.time(), time.perf_counter(), time.thread_time(), _peak_rss()
+        try:
+            yield s
+        except BaseException as e:
+            s.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current.reset(token)
+            s.set(
+                start=start_ts,
+                wall_s=time.perf_counter() - start,
+                cpu_s=time.thread_time() - cpu,
+                peak_rss_delta_mb=(_peak_rss() - rss) / 1e6,
+            )
+            self._emit(s.record)
+
+    def _emit(self, record: dict):
+        with self._lock:
+            self._traces.setdefault(record["trace_id"], []).append(record)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+            totals = self._totals[(record["kind"], record["name"])]
+            totals["calls"] += 1
+            for key in ("wall_s", "cpu_s", "prompt_tokens", "response_tokens"):
+                totals[key] += record.get(key) or 0
+            totals["cache_hits"] += bool(record.get("cache_hit"))
+            if self.path:
+                with self.path.open("a") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+            if self.openmetrics_path and record["kind"] == "node":
+                self._write_openmetrics()
+
+    def pop_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """The spans recorded so far under `trace_id` (forgotten afterwards; the JSONL file keeps them)."""
+        with self._lock:
+            return self._traces.pop(trace_id, [])
+
+    # -----------------------------
+    # OPENMETRICS EXPORT
+    # -----------------------------
+    def _write_openmetrics(self):
+        metrics = {
+            "agent_node_calls": ("node", "calls", "Completed node runs"),
+            "agent_node_wall_seconds": ("node", "wall_s", "Wall time spent in nodes"),
+            "agent_node_cpu_seconds": ("node", "cpu_s", "Thread CPU time spent in nodes"),
+            "agent_llm_calls": ("llm", "calls", "LLM calls"),
+            "agent_llm_cache_hits": ("llm", "cache_hits", "LLM calls answered from the response cache"),
+            "agent_llm_wall_seconds": ("llm", "wall_s", "Wall time spent in LLM calls"),
+            "agent_llm_prompt_tokens": ("llm", "prompt_tokens", "Prompt tokens sent"),
+            "agent_llm_response_tokens": ("llm", "response_tokens", "Response tokens received"),
+        }
+        const = "".join(f',{k}="{v}"' for k, v in self.labels.items())
+        lines = []
+        for metric, (kind, field, help_text) in metrics.items():
+            lines += [f"# TYPE {metric} counter", f"# HELP {metric} {help_text}"]
+            for (k, name), totals in sorted(self._totals.items()):
+                if k == kind:
+                    lines.append(f'{metric}_total{{{kind}="{name}"{const}}} {totals[field]:g}')
+        lines.append("# EOF")
+        tmp = self.openmetrics_path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(self.openmetrics_path)
+
+@contextmanager
+def span(name: str, kind: str = "llm", **attrs):
+    """Child span of the active span (same tracer and trace); a no-op when nothing is being traced."""
+    parent = _current.get()
+    if parent is None or parent.tracer is None:
+        yield _NOOP
+        return
+    with parent.tracer.span(name, kind=kind, **attrs) as s:
+        yield s
+
+def trace_summary(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compact per-round view of a trace: node wall times and LLM totals (stored with the incident)."""
+    nodes = [s for s in spans if s["kind"] == "node"]
+    llm = [s for s in spans if s["kind"] == "llm"]
+    node_wall = {s["name"]: round(s["wall_s"], 3) for s in nodes}
+    return {
+        "wall_s": round(max((s["start"] + s["wall_s"] for s in spans), default=0.0)
+                        - min((s["start"] for s in spans), default=0.0), 3),
+        "cpu_s": round(sum(s["cpu_s"] for s in nodes), 3),
+        "peak_rss_delta_mb": round(sum(s["peak_rss_delta_mb"] for s in nodes), 1),
+        "slowest_node": max(node_wall, key=node_wall.get) if node_wall else None,
+        "node_wall_s": node_wall,
+        "llm_calls": len(llm),
+        "llm_wall_s": round(sum(s["wall_s"] for s in llm), 3),
+        "llm_cache_hits": sum(bool(s.get("cache_hit")) for s in llm),
+        "prompt_tokens": sum(s.get("prompt_tokens") or 0 for s in llm),
+        "response_tokens": sum(s.get("response_tokens") or 0 for s in llm),
+    }
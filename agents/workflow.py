@@ -1,19 +1,30 @@
-from langgraph.graph import StateGraph, END
+from .graph_state import AgentState
 
-from .nodes import node_summarize_memory
+# LangGraph and the nodes (which pull in the agents, NumPy, ...) are imported in
+# build_workflow, so `import agents.workflow` stays cheap for short-lived runs
 
-from .graph_state import AgentState
-from .nodes import (
-    node_monitor,
-    node_config_critic,
-    node_data_analyst,
-    node_retrain,
-    node_new_data,
-    node_memory,
-)
 
+def build_workflow(parallel: bool = True):
+    """
+    With `parallel`, independent LLM-backed nodes run concurrently:
+        START -> {monitor, summarize};  monitor -> critic;  {monitor, summarize} -> data_analyst
+        {critic, data_analyst} -> join -> retrain? -> new_data? -> memory
+    so a round costs two LLM round-trips on the critical path instead of four.
+    `parallel=False` keeps the original monitor -> summarize -> critic -> data_analyst chain.
+    """
+    from langgraph.graph import StateGraph, START, END
+
+    from .nodes import (
+        node_monitor,
+        node_summarize_memory,
+        node_config_critic,
+        node_data_analyst,
+        node_retrain,
+        node_new_data,
+        node_memory,
+        node_join,
+    )
 
-def build_workflow():
     graph = StateGraph(AgentState)
 
     graph.add_node("monitor", node_monitor)
@@ -25,19 +36,35 @@ def build_workflow():
 
     graph.add_node("summarize", node_summarize_memory)
 
-    graph.set_entry_point("monitor")
+    if parallel:
+        graph.add_node("join", node_join)
+
+        # Fan out: summarization only reads memory, not this round's diagnosis
+        graph.add_edge(START, "monitor")
+        graph.add_edge(START, "summarize")
+
+        # The critic needs the diagnosis; the analyst needs the diagnosis and the summary
+        graph.add_edge("monitor", "critic")
+        graph.add_edge(["monitor", "summarize"], "data_analyst")
+
+        # Fan in before deciding on retraining
+        graph.add_edge(["critic", "data_analyst"], "join")
+        decision_node = "join"
+    else:
+        graph.set_entry_point("monitor")
 
-    graph.add_edge("monitor", "summarize")
-    graph.add_edge("summarize", "critic")
-    graph.add_edge("critic", "data_analyst")
+        graph.add_edge("monitor", "summarize")
+        graph.add_edge("summarize", "critic")
+        graph.add_edge("critic", "data_analyst")
+        decision_node = "data_analyst"
 
-    # After data_analyst: branch on should_retrain
-    def branch_after_data_analyst(state: AgentState) -> str:
+    # Once critic and data_analyst are done: branch on should_retrain
+    def branch_on_should_retrain(state: AgentState) -> str:
         return "retrain" if state.get("should_retrain", False) else "memory"
 
     graph.add_conditional_edges(
-        "data_analyst",
-        branch_after_data_analyst,
+        decision_node,
+        branch_on_should_retrain,
         {
             "retrain": "retrain",
             "memory": "memory",
@@ -66,4 +93,4 @@ def build_workflow():
 
     graph.add_edge("memory", END)
 
-    return graph.compile()
\ No newline at end of file
+    return graph.compile()
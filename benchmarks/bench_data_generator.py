@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from agents.data_generator import SyntheticDataGenerator
+from storage.training_store import TrainingStore
+
+'''
+    Synthetic training rows: generation alone, then streamed into a TrainingStore segment
+    (npcols, i.e. raw .npy columns), in fixed-size chunks with a seeded generator.
+
+    uv run python -m benchmarks.bench_data_generator [n_rows]
+'''
+
+N_ROWS = 100_000_000
+CHUNK_ROWS = 1_000_000
+REPORT = {
+    "psi_by_feature": {"age": 0.8, "income": 0.05, "balance": 0.3},
+    "mean_by_feature": {"age": 55.0, "income": 30000.0, "balance": 2600.0},
+    "std_by_feature": {"age": 9.0, "income": 9000.0, "balance": 400.0},
+}
+
+def run(n_rows: int = N_ROWS, chunk_rows: int = CHUNK_ROWS):
+    generator = SyntheticDataGenerator()
+    n_cols = len(generator.config["features"]["numeric"]) + 1
+    gb = n_rows * n_cols * 8 / 1e9
+
+    start = time.perf_counter()
+    for _ in generator.iter_chunks(n_rows, REPORT, chunk_rows=chunk_rows, seed=0):
+        pass
+    t_gen = time.perf_counter() - start
+
+    store = TrainingStore(Path(tempfile.mkdtemp()) / "train_store")
+    start = time.perf_counter()
+    generator.write_to_store(store, n_rows, round_id="bench", drift_report=REPORT, chunk_rows=chunk_rows, seed=0)
+    t_store = time.perf_counter() - start
+
+    print(f"{n_rows:,} rows x {n_cols} columns ({gb:.1f} GB as float64/int64), {chunk_rows:,}-row chunks")
+    print(f"  generate only      : {t_gen:7.2f}s  {n_rows / t_gen / 1e6:6.1f}M rows/s  {gb / t_gen:5.2f} GB/s")
+    print(f"  into TrainingStore : {t_store:7.2f}s  {n_rows / t_store / 1e6:6.1f}M rows/s  {gb / t_store:5.2f} GB/s")
+    return {"generate_s": t_gen, "store_s": t_store}
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS)
@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from storage.dataset_io import FORMATS, iter_dataset, read_dataset, write_dataset
+
+'''
+    Load times of the same prediction file in every supported dataset format:
+    full load, projected load (what compute_metrics needs) and chunked scan.
+
+    uv run python -m benchmarks.bench_dataset_io
+'''
+
+N_ROWS = 500_000
+N_FEATURES = 20
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def _size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.iterdir())
+    return path.stat().st_size
+
+def run(n_rows: int = N_ROWS, n_features: int = N_FEATURES, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    features = [f"f{j}" for j in range(n_features)]
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=features)
+    df["default"] = rng.integers(0, 2, n_rows)
+    df["prediction"] = rng.integers(0, 2, n_rows).astype(float)
+    projection = features[:3] + ["default", "prediction"]
+
+    tmp = Path(tempfile.mkdtemp())
+    print(f"{n_rows} rows x {df.shape[1]} columns, projection = {len(projection)} columns")
+    print(f"{'format':>8} {'size MB':>8} {'write s':>8} {'full s':>8} {'proj s':>8} {'chunked s':>10}")
+    results = []
+    try:
+        for fmt in FORMATS:
+            path = tmp / f"data.{fmt}"
+            try:
+                t_write = _timed(lambda: write_dataset(df, path))
+            except ImportError as e:
+                print(f"{fmt:>8} skipped: {e}")
+                continue
+            t_full = _timed(lambda: read_dataset(path))
+            t_proj = _timed(lambda: read_dataset(path, columns=projection))
+            t_chunk = _timed(lambda: sum(len(c) for c in iter_dataset(path, columns=projection, chunksize=100_000)))
+            size_mb = _size(path) / 1e6
+            print(f"{fmt:>8} {size_mb:>8.1f} {t_write:>8.3f} {t_full:>8.3f} {t_proj:>8.3f} {t_chunk:>10.3f}")
+            results.append({"format": fmt, "size_mb": size_mb, "write_s": t_write, "full_s": t_full,
+                            "projected_s": t_proj, "chunked_s": t_chunk})
+    finally:
+        shutil.rmtree(tmp)
+    return results
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,48 @@
+import time
+import numpy as np
+
+from monitoring.compute_metrics import batch_drift, population_stability_index
+
+'''
+    Per-feature PSI loop vs. the batched drift API (PSI + KS + JS) as the
+    number of features grows. Edges/counts of the baseline are precomputed once,
+    like the persisted baseline profile.
+
+    uv run python -m benchmarks.bench_drift
+'''
+
+N_ROWS = 50_000
+BINS = 10
+FEATURE_COUNTS = (3, 10, 100, 300, 1000)
+
+def _timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+def run(n_rows: int = N_ROWS, feature_counts=FEATURE_COUNTS, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    print(f"{'features':>8} {'loop (s)':>10} {'batched (s)':>12} {'speedup':>8} {'max |dPSI|':>11}")
+    results = []
+    for n_feat in feature_counts:
+        base = rng.normal(0.0, 1.0, size=(n_rows, n_feat))
+        curr = rng.normal(0.3, 1.2, size=(n_rows, n_feat))
+
+        edges = np.stack([np.histogram_bin_edges(base[:, j], bins=BINS) for j in range(n_feat)])
+        base_counts = np.stack([np.histogram(base[:, j], bins=edges[j])[0] for j in range(n_feat)])
+
+        t_loop, psi_loop = _timed(
+            lambda: np.array([population_stability_index(base[:, j], curr[:, j], bins=BINS) for j in range(n_feat)])
+        )
+        t_batch, stats = _timed(lambda: batch_drift(curr, edges, base_counts))
+
+        diff = float(np.max(np.abs(psi_loop - stats["psi"])))
+        print(f"{n_feat:>8} {t_loop:>10.4f} {t_batch:>12.4f} {t_loop / t_batch:>7.1f}x {diff:>11.2e}")
+        results.append({"features": n_feat, "loop_s": t_loop, "batched_s": t_batch, "max_psi_diff": diff})
+    return results
+
+if __name__ == "__main__":
+    run()
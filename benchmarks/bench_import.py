@@ -0,0 +1,88 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+'''
+    Cold-start cost of the agents package, measured in fresh interpreters with `python -X importtime`.
+    `import agents.workflow` must stay within IMPORT_BUDGET_MS and must not load any of HEAVY_MODULES
+    (they are imported on first use); the script exits non-zero when either regresses.
+    The cold `build_workflow()` time (LangGraph + nodes) is reported for reference; building the
+    workflow may load LangGraph and NumPy, but none of BUILD_HEAVY_MODULES (pandas, scikit-learn, ...
+    are only needed once a round actually reads data or trains), which is checked the same way.
+
+    uv run python -m benchmarks.bench_import [--runs 7] [--budget-ms 100]
+'''
+
+TARGET = "agents.workflow"
+IMPORT_BUDGET_MS = 100.0
+HEAVY_MODULES = ("numpy", "pandas", "sklearn", "scipy", "langgraph", "langchain_core", "requests")
+BUILD_WORKFLOW = "from agents.workflow import build_workflow; build_workflow()"
+BUILD_HEAVY_MODULES = ("pandas", "sklearn", "scipy", "pyarrow", "joblib")
+N_RUNS = 7
+
+def _importtime(module: str) -> tuple[int, dict]:
+    """Cumulative import time (µs) of `module` in a fresh interpreter, and of each module it pulled in."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    subtree = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not name.startswith("  "):
+            # A top-level import finished: everything listed since the previous one was its subtree
+            if name.strip() == module:
+                return int(cumulative_us), subtree
+            subtree = {}
+        else:
+            subtree[name.strip()] = int(cumulative_us)
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+def _wall_ms(code: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import time; t = time.perf_counter(); {code}; print((time.perf_counter() - t) * 1e3)"],
+        capture_output=True, text=True, check=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+def _loaded_heavy_modules(code: str, heavy: tuple = HEAVY_MODULES) -> list:
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import sys; {code}; print(' '.join(sorted(sys.modules)))"],
+        capture_output=True, text=True, check=True,
+    )
+    loaded = set(proc.stdout.split())
+    return [m for m in heavy if m in loaded]
+
+def run(n_runs: int = N_RUNS, budget_ms: float = IMPORT_BUDGET_MS) -> dict:
+    runs = [_importtime(TARGET) for _ in range(n_runs)]
+    import_ms = statistics.median(total for total, _ in runs) / 1e3
+    slowest = sorted(runs[-1][1].items(), key=lambda kv: -kv[1])[:8]
+    build_ms = statistics.median(_wall_ms(BUILD_WORKFLOW) for _ in range(3))
+    heavy = _loaded_heavy_modules(f"import {TARGET}")
+    build_heavy = _loaded_heavy_modules(BUILD_WORKFLOW, BUILD_HEAVY_MODULES)
+
+    print(f"import {TARGET}: {import_ms:.1f} ms median over {n_runs} fresh interpreters (budget {budget_ms:.0f} ms)")
+    for name, us in slowest:
+        print(f"  {us / 1e3:8.1f} ms  {name}")
+    print(f"heavy modules loaded by the import: {', '.join(heavy) or 'none'}")
+    print(f"cold import + build_workflow(): {build_ms:.0f} ms")
+    print(f"heavy modules loaded by build_workflow(): {', '.join(build_heavy) or 'none'}")
+
+    ok = import_ms <= budget_ms and not heavy and not build_heavy
+    print("OK" if ok else "REGRESSION")
+    return {
+        "import_ms": import_ms,
+        "build_workflow_ms": build_ms,
+        "heavy_modules": heavy,
+        "build_workflow_heavy_modules": build_heavy,
+        "ok": ok,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=N_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.runs, args.budget_ms)["ok"] else 1)
@@ -0,0 +1,72 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from agents.incident_index import IncidentIndex, vector_for_incident
+from agents.memory_store import MemoryStore
+
+'''
+    Similar-incident retrieval over a large memory: index build from scratch,
+    top-k search latency, search + fetching the incidents, and incremental sync after an append.
+
+    uv run python -m benchmarks.bench_incident_index [n_incidents]
+'''
+
+N_INCIDENTS = 100_000
+FEATURES = ["age", "income", "balance", "tenure", "n_products", "credit_score"]
+
+def _incident(rng, i: int) -> dict:
+    psi = {f: float(rng.exponential(0.1) * (10 if rng.random() < 0.1 else 1)) for f in FEATURES}
+    return {
+        "round_id": str(i),
+        "psi_by_feature": psi,
+        "accuracy_drop": float(rng.normal(0.02, 0.03)),
+        "diagnosis": {
+            "issue_type": "data_drift",
+            "severity": ["low", "medium", "high"][i % 3],
+            "suspect_features": [f for f, v in psi.items() if v > 0.1],
+        },
+        "config_suggestion": {"changes": {}, "should_retrain": False},
+    }
+
+def _timed(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+def run(n: int = N_INCIDENTS):
+    rng = np.random.default_rng(0)
+    tmp = Path(tempfile.mkdtemp())
+    memory_path = tmp / "memory.jsonl"
+    with memory_path.open("w") as f:
+        for i in range(n):
+            f.write(json.dumps(_incident(rng, i)) + "\n")
+    memory = MemoryStore(memory_path)
+
+    rows = {}
+    index = IncidentIndex(tmp / "memory.vec")
+    rows["build index (sync from empty)"], _ = _timed(lambda: index.sync(memory))
+    rows["reopen index (read .vec)"], _ = _timed(lambda: IncidentIndex(tmp / "memory.vec"))
+    query = vector_for_incident(_incident(rng, n))
+    rows["search top-3"], (positions, _) = _timed(lambda: index.search(query, k=3), repeat=1000)
+    rows["search top-3 + load incidents"], _ = _timed(lambda: index.similar(memory, query, k=3), repeat=1000)
+    memory.append_incident(_incident(rng, n + 1))
+    rows["sync after one append"], _ = _timed(lambda: index.sync(memory))
+
+    # Sanity check: a stored incident's own vector finds it first
+    probe = n // 2
+    own, _ = index.search(vector_for_incident(memory.load_at([probe])[0]), k=1)
+
+    print(f"{n:,} incidents, {index.dim}-dim hashed vectors ({index.dim * 4 * len(index) / 1e6:.1f} MB)")
+    for label, seconds in rows.items():
+        print(f"  {label:<32}: {seconds * 1000:9.3f} ms")
+    print(f"  self-retrieval check            : {'ok' if own[0] == probe else 'MISS'}")
+    return rows
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_INCIDENTS)
@@ -0,0 +1,111 @@
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from agents.llm_client import CONFIG_PATH, LLMClient
+from simulations.stub_llm import start_stub_server
+
+'''
+    Sequential chat vs. chat_many / achat against the stub Ollama server,
+    for one round's worth of prompts (monitor, summarize, critic, analyst, summarizer),
+    then a full completion vs. streaming with early JSON termination,
+    then a cold vs. warm pass through the response cache.
+
+    uv run python -m benchmarks.bench_llm_client
+'''
+
+N_PROMPTS = 5
+DELAY = 0.2
+TOKEN_DELAY = 0.005
+TRAILER = "\n\nExplanation: " + "the drift is mostly explained by the shifted features. " * 30
+
+def stub_client(endpoint: str, **llm_overrides) -> LLMClient:
+    """An LLMClient whose config points at `endpoint` (written to a temp config file), uncached by default."""
+    cfg = yaml.safe_load(open(CONFIG_PATH))
+    cfg["llm"].update({"provider": "ollama", "endpoint": endpoint, "cache": {"enabled": False}, **llm_overrides})
+    path = Path(tempfile.mkdtemp()) / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg))
+    return LLMClient(path)
+
+def run(n_prompts: int = N_PROMPTS, delay: float = DELAY):
+    server, url = start_stub_server(delay=delay)
+    try:
+        client = stub_client(url)
+        prompts = [("You are a test.", f"Prompt {i}") for i in range(n_prompts)]
+
+        start = time.perf_counter()
+        for p in prompts:
+            client.chat(*p)
+        t_seq = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.chat_many(prompts)
+        t_many = time.perf_counter() - start
+
+        async def gather():
+            return await asyncio.gather(*(client.achat(*p) for p in prompts))
+
+        start = time.perf_counter()
+        asyncio.run(gather())
+        t_async = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"{n_prompts} prompts, stub delay {delay}s")
+    print(f"  sequential chat : {t_seq:.3f}s")
+    print(f"  chat_many       : {t_many:.3f}s ({t_seq / t_many:.1f}x)")
+    print(f"  achat + gather  : {t_async:.3f}s ({t_seq / t_async:.1f}x)")
+    server, url = start_stub_server(delay=delay, token_delay=TOKEN_DELAY, trailer=TRAILER)
+    try:
+        client = stub_client(url)
+        start = time.perf_counter()
+        client.chat("You are a test.", "Prompt")
+        t_full = time.perf_counter() - start
+        client.chat("You are a test.", "Prompt", stop_at_json=True)
+        stream_stats = client.last_stats
+    finally:
+        server.shutdown()
+
+    print(f"JSON answer followed by {len(TRAILER)} chars of chatter, {TOKEN_DELAY}s per chunk")
+    print(f"  full completion : {t_full:.3f}s")
+    print(f"  stop_at_json    : {stream_stats['total_s']:.3f}s "
+          f"(ttft {stream_stats['ttft_s']:.3f}s, last useful token {stream_stats['ttlut_s']:.3f}s)")
+
+    server, url = start_stub_server(delay=delay)
+    try:
+        cache_dir = tempfile.mkdtemp()
+        client = stub_client(url, cache={"enabled": True, "dir": cache_dir})
+        start = time.perf_counter()
+        for p in prompts:
+            client.chat(*p)
+        t_cold = time.perf_counter() - start
+
+        # A fresh client only shares the on-disk tier, as a re-run of the round would
+        client = stub_client(url, cache={"enabled": True, "dir": cache_dir})
+        start = time.perf_counter()
+        for p in prompts:
+            client.chat(*p)
+        t_warm = time.perf_counter() - start
+        cache_stats = client.cache.stats()
+    finally:
+        server.shutdown()
+
+    print(f"Response cache, {n_prompts} prompts")
+    print(f"  cold            : {t_cold:.3f}s")
+    print(f"  warm (disk)     : {t_warm * 1000:.2f}ms "
+          f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['latency_saved_s']:.3f}s saved)")
+    return {
+        "sequential_s": t_seq,
+        "chat_many_s": t_many,
+        "achat_s": t_async,
+        "full_completion_s": t_full,
+        "stop_at_json_s": stream_stats["total_s"],
+        "cache_cold_s": t_cold,
+        "cache_warm_s": t_warm,
+    }
+
+if __name__ == "__main__":
+    run()
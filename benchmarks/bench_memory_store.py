@@ -0,0 +1,74 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from agents.memory_store import MemoryStore
+
+'''
+    MemoryStore at 1M incidents: the old full-parse load_last vs. the offset index
+    (cold open builds the sidecar once, warm opens just map it), windowed queries and append.
+
+    uv run python -m benchmarks.bench_memory_store [n_incidents]
+'''
+
+N_INCIDENTS = 1_000_000
+FEATURES = ["age", "income", "balance"]
+
+def write_history(path: Path, n: int):
+    rng = np.random.default_rng(0)
+    t0 = time.time() - n * 60
+    with path.open("w") as f:
+        for i in range(n):
+            f.write(json.dumps({
+                "round_id": str(i),
+                "diagnosis": {
+                    "issue_type": "data_drift",
+                    "suspect_features": [FEATURES[j] for j in np.flatnonzero(rng.random(3) < 0.3)],
+                    "severity": "medium",
+                    "reasoning": "Synthetic incident for benchmarking.",
+                },
+                "config_suggestion": {"changes": {}, "should_retrain": bool(i % 2)},
+                "baseline_accuracy": 0.86,
+                "current_accuracy": float(rng.uniform(0.6, 0.9)),
+                "retrained": bool(i % 2),
+                "timestamp": t0 + i * 60,
+            }) + "\n")
+
+def _legacy_load_last(path: Path):
+    incidents = [json.loads(line) for line in path.open() if line.strip()]
+    return incidents[-1] if incidents else None
+
+def _timed(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+def run(n: int = N_INCIDENTS):
+    path = Path(tempfile.mkdtemp()) / "memory.jsonl"
+    t_write, _ = _timed(lambda: write_history(path, n))
+    print(f"{n:,} incidents, {path.stat().st_size / 1e6:.0f} MB (written in {t_write:.1f}s)")
+
+    rows = {}
+    rows["legacy load_last (parse all)"], _ = _timed(lambda: _legacy_load_last(path))
+    rows["open, cold (build .idx)"], _ = _timed(lambda: MemoryStore(path))
+    rows["open, warm (read .idx)"], store = _timed(lambda: MemoryStore(path))
+    rows["load_last"], _ = _timed(store.load_last, repeat=1000)
+    rows["load_last_k(3)"], _ = _timed(lambda: store.load_last_k(3), repeat=1000)
+    t_hour = time.time() - 3600
+    rows["load_time_range(last hour)"], _ = _timed(lambda: store.load_time_range(t_hour), repeat=100)
+    rows["load_by_round, first (builds maps)"], _ = _timed(lambda: store.load_by_round(str(n // 2)))
+    rows["load_by_round"], _ = _timed(lambda: store.load_by_round(str(n // 3)), repeat=1000)
+    incident = {"round_id": "new", "diagnosis": {"suspect_features": ["age"]}}
+    rows["append_incident"], _ = _timed(lambda: store.append_incident(incident), repeat=1000)
+
+    for label, seconds in rows.items():
+        print(f"  {label:<36}: {seconds * 1000:10.3f} ms")
+    return rows
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_INCIDENTS)
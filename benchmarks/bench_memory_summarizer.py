@@ -0,0 +1,82 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from agents.memory_summarizer import MemorySummarizer
+from agents.sqlite_memory_store import SQLiteMemoryStore
+from benchmarks.bench_llm_client import stub_client
+from simulations.stub_llm import start_stub_server
+
+'''
+    Cost of one round's memory summary as history grows: the old full-history prompt
+    vs. the rolling summary (previous summary + bounded rollups + incidents since the watermark).
+    LLM calls go to the stub Ollama server, so latency is mostly prompt transfer and parsing.
+
+    uv run python -m benchmarks.bench_memory_summarizer
+'''
+
+SIZES = [10, 1_000, 100_000]
+DELAY = 0.05
+FEATURES = ["age", "income", "balance"]
+
+class _PromptMeter:
+    """Wraps an LLMClient and records the size of every prompt it sends."""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.prompt_chars = []
+
+    def chat(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        self.prompt_chars.append(len(system_prompt) + len(user_prompt))
+        return self.llm.chat(system_prompt, user_prompt, **kwargs)
+
+def _incidents(rng, start: int, n: int) -> list:
+    return [
+        {
+            "round_id": str(i),
+            "diagnosis": {
+                "issue_type": "data_drift",
+                "severity": ["low", "medium", "high"][i % 3],
+                "suspect_features": [FEATURES[j] for j in np.flatnonzero(rng.random(3) < 0.3)],
+            },
+            "config_suggestion": {"changes": {}, "should_retrain": bool(i % 2)},
+            "current_accuracy": float(rng.uniform(0.6, 0.9)),
+            "retrained": bool(i % 2),
+            "post_retrain_accuracy": float(rng.uniform(0.6, 0.9)),
+        }
+        for i in range(start, start + n)
+    ]
+
+def run(sizes=SIZES, delay: float = DELAY):
+    rng = np.random.default_rng(0)
+    server, url = start_stub_server(delay=delay)
+    rows = []
+    try:
+        for n in sizes:
+            tmp = Path(tempfile.mkdtemp())
+            memory = SQLiteMemoryStore(tmp / "memory.sqlite")
+            memory.append_incidents(_incidents(rng, 0, n - 1))
+            legacy_chars = len(str(memory.load_all()))
+
+            llm = _PromptMeter(stub_client(url))
+            summarizer = MemorySummarizer(llm, state_path=tmp / "summary.json")
+            summarizer.update(memory)  # catch up once; later rounds are incremental
+
+            # One round: one new incident, one update
+            memory.append_incidents(_incidents(rng, n - 1, 1))
+            start = time.perf_counter()
+            summarizer.update(memory)
+            rows.append((n, legacy_chars, llm.prompt_chars[-1], time.perf_counter() - start))
+    finally:
+        server.shutdown()
+
+    print(f"Per-round memory summary, stub LLM delay {delay}s")
+    print(f"  {'incidents':>10} {'full prompt chars':>18} {'rolling prompt chars':>21} {'round time':>11}")
+    for n, legacy, rolling, seconds in rows:
+        print(f"  {n:>10,} {legacy:>18,} {rolling:>21,} {seconds * 1000:>9.1f}ms")
+    return rows
+
+if __name__ == "__main__":
+    run()
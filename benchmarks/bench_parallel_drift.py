@@ -0,0 +1,54 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from monitoring.baseline_profile import bin_matrix
+from monitoring.compute_metrics import drift_statistics
+from monitoring.parallel_drift import parallel_bin_matrix
+
+'''
+    Sequential vs. process-pool binning of one large partition.
+    Workers read the feature matrix from shared memory; the benchmark checks that
+    the parallel counts and drift statistics are exactly the sequential ones.
+
+    uv run python -m benchmarks.bench_parallel_drift
+'''
+
+N_ROWS = 400_000
+N_FEATURES = 200
+BINS = 10
+
+def run(n_rows: int = N_ROWS, n_features: int = N_FEATURES, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0.0, 1.0, size=(n_rows // 4, n_features))
+    curr = rng.normal(0.2, 1.1, size=(n_rows, n_features))
+    edges = np.stack([np.histogram_bin_edges(base[:, j], bins=BINS) for j in range(n_features)])
+    base_counts = bin_matrix(base, edges)
+
+    start = time.perf_counter()
+    seq_counts = bin_matrix(curr, edges)
+    t_seq = time.perf_counter() - start
+    seq_stats = drift_statistics(base_counts, seq_counts)
+    print(f"{n_rows} rows x {n_features} features, sequential: {t_seq:.3f}s")
+
+    print(f"{'n_jobs':>6} {'wall (s)':>9} {'speedup':>8} {'exact':>6}")
+    results = []
+    n_cpu = os.cpu_count() or 1
+    for n_jobs in sorted({j for j in (2, 4, 8, 16, 32) if j <= n_cpu} | {n_cpu}):
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parallel_bin_matrix(curr[:n_jobs], edges, pool, n_jobs)  # warm up the workers
+            start = time.perf_counter()
+            par_counts = parallel_bin_matrix(curr, edges, pool, n_jobs)
+            t_par = time.perf_counter() - start
+        par_stats = drift_statistics(base_counts, par_counts)
+        exact = bool(
+            np.array_equal(seq_counts, par_counts)
+            and all(np.array_equal(seq_stats[k], par_stats[k]) for k in seq_stats)
+        )
+        print(f"{n_jobs:>6} {t_par:>9.3f} {t_seq / t_par:>7.1f}x {str(exact):>6}")
+        results.append({"n_jobs": n_jobs, "wall_s": t_par, "speedup": t_seq / t_par, "exact": exact})
+    return results
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,176 @@
+import argparse
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+from agents.llm_client import LLMClient
+from agents.model_context import ModelContext
+from agents.workflow import build_workflow
+from model.predict import predict
+from model.train_model import train
+from monitoring.baseline_profile import write_baseline_profile
+from monitoring.compute_metrics import compute_metrics
+from simulations.scenarios import DRIFT_TYPES, write_scenario
+from simulations.stub_llm import start_stub_server
+
+'''
+    The whole monitoring loop on a generated drift scenario (simulations.scenarios):
+    train once, then per round predict -> compute_metrics -> workflow.invoke, with every
+    LLM call answered by the stub Ollama server. Reports wall time, throughput and peak RSS
+    per stage. Everything is written to a scratch directory.
+
+    uv run python -m benchmarks.bench_pipeline --rows 1000000 --features 20 --rounds 3 --drift mean_shift missingness
+'''
+
+N_ROWS = 200_000
+N_FEATURES = 20
+N_ROUNDS = 3
+STUB_DELAY = 0.05
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # No procfs: fall back to the process-wide high-water mark (KB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class _PeakRSS:
+    """Samples the resident set size on a background thread while a stage runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+class StageTimer:
+    def __init__(self):
+        self.stages = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "rows": 0, "peak_rss": 0})
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        with _PeakRSS() as rss:
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+        s = self.stages[name]
+        s["calls"] += 1
+        s["seconds"] += elapsed
+        s["rows"] += rows
+        s["peak_rss"] = max(s["peak_rss"], rss.peak)
+
+    def report(self):
+        print(f"  {'stage':<16} {'calls':>5} {'total s':>9} {'per call s':>10} {'rows/s':>12} {'peak RSS MB':>12}")
+        for name, s in self.stages.items():
+            rate = f"{s['rows'] / s['seconds']:,.0f}" if s["rows"] and s["seconds"] > 0 else "-"
+            print(
+                f"  {name:<16} {s['calls']:>5} {s['seconds']:>9.2f} {s['seconds'] / s['calls']:>10.3f} "
+                f"{rate:>12} {s['peak_rss'] / 1e6:>12.0f}"
+            )
+
+def run(
+    n_rows: int = N_ROWS,
+    n_features: int = N_FEATURES,
+    n_rounds: int = N_ROUNDS,
+    drifts: tuple = ("mean_shift",),
+    magnitude: float = 0.25,
+    fmt: str = "npcols",
+    chunksize: int | None = 200_000,
+    delay: float = STUB_DELAY,
+):
+    tmp = Path(tempfile.mkdtemp())
+    timer = StageTimer()
+    server, url = start_stub_server(delay=delay)
+    try:
+        with timer.stage("scenario", rows=n_rows * (n_rounds + 2)):
+            scenario = write_scenario(tmp / "scenario", n_rows, n_features, n_rounds, drifts, magnitude, fmt=fmt)
+
+        # A self-contained model directory (see agents.fleet), with the LLM pointed at the stub
+        root = tmp / "model"
+        (root / "rounds").mkdir(parents=True)
+        cfg = yaml.safe_load(open(scenario["config_path"]))
+        cfg["llm"].update({"provider": "ollama", "endpoint": url, "cache": {"enabled": False}})
+        (root / "config.yaml").write_text(yaml.safe_dump(cfg))
+        llm = LLMClient(root / "config.yaml")
+        ctx = ModelContext.for_directory(root, llm=llm)
+        ctx.store.reset(seed_path=scenario["train_path"])
+
+        with timer.stage("train", rows=n_rows):
+            baseline_acc = train(str(ctx.store.root), model_path=ctx.model_path, config_path=ctx.config_path)
+
+        baseline_pred = root / "rounds" / f"round0_pred.{fmt}"
+        with timer.stage("predict", rows=n_rows):
+            predict(scenario["baseline_path"], str(baseline_pred), model_path=ctx.model_path, config_path=ctx.config_path)
+        with timer.stage("baseline_profile", rows=n_rows):
+            write_baseline_profile(
+                str(baseline_pred), ctx.config["features"]["numeric"], path=root / "baseline_profile.npz",
+                chunksize=chunksize,
+            )
+
+        workflow = build_workflow()
+        accuracies = []
+        for round_id, current_path in scenario["rounds"]:
+            pred_path = root / "rounds" / f"round{round_id}_pred.{fmt}"
+            report_path = root / "rounds" / f"drift_report_round{round_id}.json"
+            with timer.stage("predict", rows=n_rows):
+                predict(current_path, str(pred_path), model_path=ctx.model_path, config_path=ctx.config_path)
+            with timer.stage("compute_metrics", rows=n_rows):
+                report = compute_metrics(
+                    str(baseline_pred), str(pred_path), str(report_path), baseline_acc=baseline_acc,
+                    chunksize=chunksize, profile_path=root / "baseline_profile.npz", config_path=ctx.config_path,
+                )
+            state = {
+                "drift_report_path": str(report_path),
+                "round_id": round_id,
+                "baseline_accuracy": report["baseline_accuracy"],
+                "current_accuracy": report["current_accuracy"],
+            }
+            with timer.stage("workflow.invoke"):
+                workflow.invoke(state, config={"configurable": {"model_context": ctx}})
+            accuracies.append(report["current_accuracy"])
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(
+        f"\n{n_rows:,} rows x {n_features} features, {n_rounds} rounds of {'+'.join(drifts)} "
+        f"(magnitude {magnitude}/round, {fmt}, stub LLM delay {delay}s)"
+    )
+    print(f"  accuracy: baseline {baseline_acc:.3f} -> " + ", ".join(f"{a:.3f}" for a in accuracies))
+    timer.report()
+    return dict(timer.stages)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=N_ROWS)
+    parser.add_argument("--features", type=int, default=N_FEATURES)
+    parser.add_argument("--rounds", type=int, default=N_ROUNDS)
+    parser.add_argument("--drift", nargs="+", default=["mean_shift"], choices=DRIFT_TYPES)
+    parser.add_argument("--magnitude", type=float, default=0.25)
+    parser.add_argument("--format", default="npcols")
+    parser.add_argument("--delay", type=float, default=STUB_DELAY)
+    args = parser.parse_args()
+    run(args.rows, args.features, args.rounds, tuple(args.drift), args.magnitude, args.format, delay=args.delay)
@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from agents.llm_client import CONFIG_PATH, LLMClient
+from agents.memory_store import MemoryStore
+from agents.monitoring_interpreter import MonitoringInterpreter
+from agents.prompt_builder import PromptBuilder
+from simulations.stub_llm import start_stub_server
+
+'''
+    Diagnosis prompt size and LLM latency vs. feature count: the old pretty-printed full
+    report (json.dumps(report, indent=2)) against the compact, budgeted prompt builder.
+    Latency comes from the stub Ollama server with a per-prompt-token prefill delay, so it
+    scales with prompt size like a real model would.
+
+    uv run python -m benchmarks.bench_prompt_builder
+'''
+
+FEATURE_COUNTS = (3, 30, 300, 3000)
+PREFILL_S_PER_TOKEN = 0.0002  # ~5k prompt tokens/s, a 7B model on a single GPU
+N_CALLS = 3
+# The old prompts: whole report, pretty-printed, no rounding, no truncation, no budget
+LEGACY = {"prompts": {"indent": 2, "top_k_features": None, "float_digits": None, "max_list_items": None, "max_tokens": None}}
+
+def drift_report(n_features: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    features = [f"feature_{j:04d}" for j in range(n_features)]
+    psi = rng.gamma(0.5, 0.1, n_features)
+    metrics = {
+        "psi_by_feature": psi,
+        "ks_by_feature": np.sqrt(psi) / 3,
+        "js_by_feature": psi / 4,
+        "mean_by_feature": rng.normal(100, 50, n_features),
+        "std_by_feature": rng.gamma(2.0, 10.0, n_features),
+    }
+    return {
+        "baseline_accuracy": 0.8612345678,
+        "current_accuracy": 0.8012345678,
+        "accuracy_drop": 0.06,
+        **{key: dict(zip(features, values.tolist())) for key, values in metrics.items()},
+    }
+
+PAST_INCIDENTS = [
+    {
+        "round_id": str(i),
+        "diagnosis": {"issue_type": "data_drift", "severity": "medium", "suspect_features": ["feature_0001"],
+                      "reasoning": "PSI above threshold on feature_0001 with a moderate accuracy drop."},
+        "config_suggestion": {"changes": {"monitoring.psi_threshold": 0.25}, "should_retrain": True},
+    }
+    for i in range(3)
+]
+
+def _chat_latency(llm: LLMClient, prompt: str, n_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        llm.chat("You are an ML reliability engineer.", prompt, use_cache=False)
+    return (time.perf_counter() - start) / n_calls
+
+def run(feature_counts=FEATURE_COUNTS, prefill: float = PREFILL_S_PER_TOKEN, n_calls: int = N_CALLS):
+    server, url = start_stub_server(delay=0.0, prompt_token_delay=prefill)
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        cfg = yaml.safe_load(open(CONFIG_PATH))
+        cfg["llm"].update({"provider": "ollama", "endpoint": url, "cache": {"enabled": False}})
+        config_path = tmp / "config.yaml"
+        config_path.write_text(yaml.safe_dump(cfg))
+        llm = LLMClient(config_path)
+        memory = MemoryStore(tmp / "memory.jsonl")
+
+        builders = {"legacy": PromptBuilder(LEGACY, llm), "compact": PromptBuilder(cfg, llm)}
+        print(f"\nStub prefill {prefill * 1e3:.2f} ms/token, budget {builders['compact'].max_tokens} tokens")
+        print(f"{'features':>8} {'prompt':>8} {'chars':>10} {'~tokens':>9} {'build ms':>9} {'latency s':>10}")
+        results = []
+        for n in feature_counts:
+            report = drift_report(n)
+            for label, builder in builders.items():
+                interpreter = MonitoringInterpreter(llm, cfg, memory=memory, prompt_builder=builder)
+                start = time.perf_counter()
+                prompt = interpreter.build_prompt(report, PAST_INCIDENTS, "Recent past incidents")
+                build_ms = (time.perf_counter() - start) * 1e3
+                latency = _chat_latency(llm, prompt, n_calls)
+                tokens = builder.count_tokens(prompt)
+                print(f"{n:>8} {label:>8} {len(prompt):>10,} {tokens:>9,} {build_ms:>9.2f} {latency:>10.3f}")
+                results.append({"features": n, "prompt": label, "chars": len(prompt), "tokens": tokens,
+                                "build_ms": build_ms, "latency_s": latency})
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    run()
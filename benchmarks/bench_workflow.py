@@ -0,0 +1,78 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from agents.llm_client import CONFIG_PATH, LLMClient
+from agents.nodes import init_nodes
+from agents.workflow import build_workflow
+from simulations.stub_llm import start_stub_server
+
+'''
+    End-to-end latency of one LangGraph round, sequential chain vs. fan-out/fan-in,
+    with every LLM call answered by the stub Ollama server after a fixed delay.
+    Config, memory and drift report are scratch copies, so the repository is left untouched.
+
+    uv run python -m benchmarks.bench_workflow
+'''
+
+DELAY = 0.5
+N_ROUNDS = 3
+REPORT = {
+    "baseline_accuracy": 0.86,
+    "current_accuracy": 0.80,
+    "accuracy_drop": 0.06,
+    "psi_by_feature": {"age": 0.35, "income": 0.12, "balance": 0.04},
+}
+
+def _scratch_setup(url: str) -> tuple[Path, Path, Path]:
+    tmp = Path(tempfile.mkdtemp())
+    cfg = yaml.safe_load(open(CONFIG_PATH))
+    cfg["llm"].update({"provider": "ollama", "endpoint": url, "cache": {"enabled": False}})
+    # Force every diagnosis through the LLM so the benchmark measures the graph, not the rules
+    cfg["monitoring"]["rules_enabled"] = False
+    config_path = tmp / "config.yaml"
+    config_path.write_text(yaml.safe_dump(cfg))
+
+    # Non-empty memory, so the summarizer calls the LLM as well
+    memory_path = tmp / "memory.jsonl"
+    memory_path.write_text(json.dumps({"round_id": "0", "diagnosis": {}, "config_suggestion": {}}) + "\n")
+
+    report_path = tmp / "drift_report.json"
+    report_path.write_text(json.dumps(REPORT))
+    return config_path, memory_path, report_path
+
+def run(delay: float = DELAY, n_rounds: int = N_ROUNDS):
+    server, url = start_stub_server(delay=delay)
+    results = {}
+    try:
+        config_path, memory_path, report_path = _scratch_setup(url)
+        init_nodes(llm=LLMClient(config_path), config_path=config_path, memory_path=memory_path)
+        for label, parallel in (("sequential", False), ("parallel", True)):
+            workflow = build_workflow(parallel=parallel)
+            latencies = []
+            for i in range(n_rounds):
+                state = {
+                    "drift_report_path": str(report_path),
+                    "round_id": str(i + 1),
+                    "baseline_accuracy": REPORT["baseline_accuracy"],
+                    "current_accuracy": REPORT["current_accuracy"],
+                }
+                start = time.perf_counter()
+                final = workflow.invoke(state)
+                latencies.append(time.perf_counter() - start)
+            results[label] = {"mean_s": sum(latencies) / n_rounds, "node_timings": final["node_timings"]}
+    finally:
+        server.shutdown()
+
+    print(f"\n{n_rounds} rounds per graph, stub LLM delay {delay}s")
+    for label, r in results.items():
+        nodes = ", ".join(f"{k}={v:.2f}s" for k, v in r["node_timings"].items())
+        print(f"  {label:<10} : {r['mean_s']:.3f}s per round  ({nodes})")
+    print(f"  speedup    : {results['sequential']['mean_s'] / results['parallel']['mean_s']:.2f}x")
+    return results
+
+if __name__ == "__main__":
+    run()
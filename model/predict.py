@@ -1,25 +1,167 @@
 import pandas as pd
+import numpy as np
 import joblib
+import hashlib
+import threading
+import time
 from pathlib import Path
 import yaml
 
+from storage.dataset_io import DatasetWriter, iter_dataset, npy_header, read_dataset, write_dataset
+
 CONFIG_PATH = Path(__file__).parent / "config.yaml"
 MODEL_PATH = Path(__file__).parent / "model.joblib"
 
-def load_config():
-    with open(CONFIG_PATH, "r") as f:
+def load_config(config_path=CONFIG_PATH):
+    with open(config_path, "r") as f:
         return yaml.safe_load(f)
 
-def predict(test_path: str, output_path: str):
-    cfg = load_config()
-    df = pd.read_csv(test_path)
-    model = joblib.load(MODEL_PATH)
+class ModelHandle:
+    """
+    Keeps a fitted model warm in memory.
+    The file is only re-hashed when its mtime/size changes, and only reloaded
+    when the hash changes (e.g. after Retrainer.retrain rewrote it).
+    """
+
+    def __init__(self, model_path: Path = MODEL_PATH):
+        self.model_path = Path(model_path)
+        self.model = None
+        self.reloads = 0
+        self._stat = None
+        self._digest = None
+        self._lock = threading.Lock()
+
+    def _file_digest(self) -> str:
+        h = hashlib.sha256()
+        with self.model_path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def get(self):
+        st = self.model_path.stat()
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat and self.model is not None:
+            return self.model
+
+        with self._lock:
+            if stat != self._stat or self.model is None:
+                digest = self._file_digest()
+                if digest != self._digest or self.model is None:
+                    self.model = joblib.load(self.model_path)
+                    self._digest = digest
+                    self.reloads += 1
+                    print(f"[PREDICT] Loaded model {self.model_path} (sha256 {digest[:12]})")
+                self._stat = stat
+        return self.model
+
+_handle = ModelHandle()
+# Warm handles for other model artifacts (one per path, e.g. per fleet model)
+_handles = {Path(MODEL_PATH): _handle}
+_handles_lock = threading.Lock()
+
+def get_handle(model_path=MODEL_PATH) -> ModelHandle:
+    model_path = Path(model_path)
+    with _handles_lock:
+        if model_path not in _handles:
+            _handles[model_path] = ModelHandle(model_path)
+        return _handles[model_path]
+
+def predict(test_path: str, output_path: str, model_path=MODEL_PATH, config_path=CONFIG_PATH):
+    cfg = load_config(config_path)
+    df = read_dataset(test_path)
+    model = get_handle(model_path).get()
 
     X = df[cfg["features"]["numeric"]]
     preds = model.predict(X)
     df["prediction"] = preds
-    df.to_csv(output_path, index=False)
+    write_dataset(df, output_path)
     return df
 
+# -----------------------------
+# CHUNKED BATCH SCORING
+# -----------------------------
+# Only the feature columns (and the optional id column) are read, chunk by chunk,
+# and only (row_id, prediction) pairs are written; join them back to the input by row id.
+
+class _NpyPredictionWriter:
+    """Appends (row_id, prediction) records to a .npy file that np.load(..., mmap_mode="r") can map."""
+
+    HEADER_SIZE = 256
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.f = None
+        self.dtype = None
+        self.n_rows = 0
+
+    def write(self, row_ids, preds):
+        if self.dtype is None:
+            self.dtype = np.dtype([("row_id", np.asarray(row_ids).dtype), ("prediction", preds.dtype)])
+            if self.dtype.hasobject:
+                raise ValueError("Non-numeric row ids/predictions can't be memory-mapped; write Parquet instead")
+            self.f = self.path.open("wb")
+            self.f.write(npy_header(self.dtype, 0, self.HEADER_SIZE))
+        records = np.empty(len(preds), dtype=self.dtype)
+        records["row_id"] = row_ids
+        records["prediction"] = preds
+        self.f.write(records.tobytes())
+        self.n_rows += len(records)
+
+    def close(self):
+        if self.f is None:
+            return
+        self.f.seek(0)
+        self.f.write(npy_header(self.dtype, self.n_rows, self.HEADER_SIZE))
+        self.f.close()
+
+class _DatasetPredictionWriter:
+    def __init__(self, path: Path):
+        self.writer = DatasetWriter(path)
+
+    def write(self, row_ids, preds):
+        self.writer.write(pd.DataFrame({"row_id": row_ids, "prediction": preds}))
+
+    def close(self):
+        self.writer.close()
+
+def predict_batch(
+    test_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    id_column: str | None = None,
+    model_path=MODEL_PATH,
+    config_path=CONFIG_PATH,
+) -> dict:
+    """
+    Score `test_path` chunk by chunk with bounded memory.
+    Writes (row_id, prediction) to `output_path` (a memory-mappable .npy, or any
+    storage.dataset_io format: .parquet, .feather, .npcols, .csv); row_id is
+    `id_column` when given, else the 0-based row position in the input file.
+    """
+    cfg = load_config(config_path)
+    features = cfg["features"]["numeric"]
+    output_path = Path(output_path)
+    suffix = output_path.suffix.lower()
+    model = get_handle(model_path).get()
+    writer = _NpyPredictionWriter(output_path) if suffix == ".npy" else _DatasetPredictionWriter(output_path)
+    columns = features + ([id_column] if id_column else [])
+
+    start = time.perf_counter()
+    n_rows = 0
+    try:
+        for chunk in iter_dataset(test_path, columns=columns, chunksize=chunksize):
+            preds = np.asarray(model.predict(chunk[features]))
+            row_ids = chunk[id_column].to_numpy() if id_column else np.arange(n_rows, n_rows + len(chunk))
+            writer.write(row_ids, preds)
+            n_rows += len(chunk)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    rows_per_sec = n_rows / elapsed if elapsed > 0 else float("inf")
+    print(f"[PREDICT] Scored {n_rows} rows in {elapsed:.2f}s ({rows_per_sec:,.0f} rows/s) -> {output_path}")
+    return {"rows": n_rows, "seconds": elapsed, "rows_per_sec": rows_per_sec, "output_path": str(output_path)}
+
 if __name__ == "__main__":
-    predict("data/test_round0.csv", "data/test_round0_pred.csv")
\ No newline at end of file
+    predict("data/test_round0.csv", "data/test_round0_pred.csv")
@@ -0,0 +1,285 @@
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .predict import MODEL_PATH, ModelHandle, load_config
+
+'''
+    Long-lived scoring process for online use.
+    The model stays warm in a ModelHandle (reloaded only when model.joblib changes),
+    and concurrent requests are coalesced into micro-batches: a single worker thread
+    waits up to `max_wait_ms` for up to `max_batch_size` records, then scores them
+    with one model.predict call. Records are validated as they are submitted (a missing
+    feature becomes NaN for the model's imputer, a non-numeric one fails that request
+    only), and if a batch still fails it is re-scored record by record so one bad request
+    can't fail the others coalesced with it.
+
+    uv run python -m model.server            # HTTP on serving.host:serving.port
+    uv run python -m model.server --stdin    # JSONL records in, JSONL predictions out
+'''
+
+DEFAULT_SERVING = {
+    "host": "127.0.0.1",
+    "port": 8080,
+    "max_batch_size": 64,
+    "max_wait_ms": 5,
+}
+
+class MicroBatcher:
+    def __init__(
+        self,
+        handle: ModelHandle,
+        features: list,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        latency_window: int = 10_000,
+    ):
+        self.handle = handle
+        self.features = features
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._stats_lock = threading.Lock()
+        self._n_records = 0
+        self._n_batches = 0
+        self._first_submit = None
+        self._last_done = None
+        self._stopped = threading.Event()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def _coerce(self, record: dict) -> list:
+        """The record's feature values as floats, in `features` order (missing -> NaN)."""
+        if not isinstance(record, dict):
+            raise TypeError(f"record must be a JSON object, got {type(record).__name__}")
+        row = []
+        for feat in self.features:
+            value = record.get(feat)
+            try:
+                row.append(float("nan") if value is None else float(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"feature {feat!r} is not numeric: {value!r}") from None
+        return row
+
+    def submit(self, record: dict) -> Future:
+        """Queue one record; the future resolves to its prediction (or fails if the record is invalid)."""
+        future = Future()
+        try:
+            row = self._coerce(record)
+        except (TypeError, ValueError) as e:
+            future.set_exception(e)
+            return future
+        now = time.perf_counter()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is stopped")
+            if self._first_submit is None:
+                self._first_submit = now
+            self._queue.put((row, future, now))
+        return future
+
+    def predict_many(self, records: list) -> list:
+        futures = [self.submit(r) for r in records]
+        return [f.result() for f in futures]
+
+    def _collect(self) -> list:
+        item = self._queue.get()
+        if item is None:
+            return []
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                break
+            try:
+                preds = self._predict([row for row, _, _ in batch])
+            except Exception:
+                # Score each record on its own so only the one(s) that fail get the error
+                preds = []
+                for row, future, _ in batch:
+                    try:
+                        preds.append(self._predict([row])[0])
+                    except Exception as e:
+                        future.set_exception(e)
+                        preds.append(None)
+
+            done = time.perf_counter()
+            for (_, future, submitted), pred in zip(batch, preds):
+                if not future.done():
+                    future.set_result(pred.item() if hasattr(pred, "item") else pred)
+            with self._stats_lock:
+                self._latencies.extend(done - submitted for _, _, submitted in batch)
+                self._n_records += len(batch)
+                self._n_batches += 1
+                self._last_done = done
+
+    def _predict(self, rows: list):
+        return self.handle.get().predict(pd.DataFrame(rows, columns=self.features))
+
+    def stop(self):
+        """Stop accepting records, score what is queued, and fail anything left over."""
+        with self._submit_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._worker.join()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and not item[1].done():
+                item[1].set_exception(RuntimeError("MicroBatcher stopped before scoring this record"))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            latencies = np.array(self._latencies)
+            n_records, n_batches = self._n_records, self._n_batches
+            elapsed = (self._last_done - self._first_submit) if self._last_done else 0.0
+        return {
+            "records": n_records,
+            "batches": n_batches,
+            "avg_batch_size": n_records / n_batches if n_batches else 0.0,
+            "p50_latency_ms": float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+            "p99_latency_ms": float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+            "throughput_rps": n_records / elapsed if elapsed > 0 else 0.0,
+            "model_reloads": self.handle.reloads,
+        }
+
+def build_batcher(cfg: dict | None = None, model_path=MODEL_PATH) -> MicroBatcher:
+    cfg = cfg or load_config()
+    serving = {**DEFAULT_SERVING, **cfg.get("serving", {})}
+    handle = ModelHandle(model_path)
+    handle.get()  # load once up front so the first request doesn't pay for it
+    return MicroBatcher(
+        handle,
+        cfg["features"]["numeric"],
+        max_batch_size=serving["max_batch_size"],
+        max_wait_ms=serving["max_wait_ms"],
+    )
+
+# -----------------------------
+# HTTP INTERFACE
+# -----------------------------
+def _make_handler(batcher: MicroBatcher):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, batcher.stats())
+            elif self.path == "/health":
+                self._reply(200, {"status": "ok"})
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": f"unknown path {self.path}"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                records = body["records"] if isinstance(body, dict) and "records" in body else body
+                if isinstance(records, dict):
+                    records = [records]
+                self._reply(200, {"predictions": batcher.predict_many(records)})
+            except Exception as e:
+                self._reply(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 resets bursts of concurrent clients
+
+def serve_http(batcher: MicroBatcher, host: str, port: int):
+    server = _Server((host, port), _make_handler(batcher))
+    print(f"[SERVER] Listening on http://{host}:{port} (POST /predict, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+        print("[SERVER] Stats:", batcher.stats())
+
+# -----------------------------
+# STDIN-JSONL INTERFACE
+# -----------------------------
+def serve_stdin(batcher: MicroBatcher, stdin=sys.stdin, stdout=sys.stdout):
+    """One JSON record per input line, one {"prediction": ...} per output line, in order."""
+    pending = deque()
+
+    def flush(block: bool):
+        while pending and (block or pending[0].done()):
+            future = pending.popleft()
+            try:
+                out = {"prediction": future.result()}
+            except Exception as e:
+                out = {"error": str(e)}
+            stdout.write(json.dumps(out) + "\n")
+        stdout.flush()
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            # Answer the bad line in its place and keep serving the rest
+            future = Future()
+            future.set_exception(ValueError(f"invalid JSON: {e}"))
+            pending.append(future)
+        else:
+            pending.append(batcher.submit(record))
+        flush(block=False)
+    flush(block=True)
+    batcher.stop()
+    print("[SERVER] Stats:", batcher.stats(), file=sys.stderr)
+
+if __name__ == "__main__":
+    cfg = load_config()
+    serving = {**DEFAULT_SERVING, **cfg.get("serving", {})}
+    batcher = build_batcher(cfg)
+    if "--stdin" in sys.argv[1:]:
+        serve_stdin(batcher)
+    else:
+        serve_http(batcher, serving["host"], serving["port"])
@@ -1,38 +1,340 @@
-import pandas as pd
+import os
 import yaml
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-import joblib
+import json
+import time
+import tracemalloc
+from functools import partial
 from pathlib import Path
 
+# scikit-learn and joblib are imported inside the functions that fit or load models, so
+# importing this module (for load_config, MODEL_PATH, ...) doesn't pay for them
+
+from storage.dataset_io import iter_dataset, read_dataset
+from storage.training_store import TRAIN_STORE_PATH, TrainingStore
+
 CONFIG_PATH = Path(__file__).parent / "config.yaml"
 MODEL_PATH = Path(__file__).parent / "model.joblib"
+# Sidecar recording which training-store segments the current model has seen
+MODEL_META_PATH = Path(__file__).parent / "model_meta.json"
+# Per-candidate fit time / memory / accuracy of the last portfolio run
+CANDIDATES_PATH = Path(__file__).parent / "candidates.json"
 
-def load_config():
-    with open(CONFIG_PATH, "r") as f:
+def load_config(config_path=CONFIG_PATH):
+    with open(config_path, "r") as f:
         return yaml.safe_load(f)
 
-def train(train_path: str):
-    print(f"[TRAIN] Starting training with data from {train_path}")
-    cfg = load_config()
-    df = pd.read_csv(train_path)
+# A model's sidecar files live next to its artifact, so each model directory is self-contained
+def _meta_path(model_path) -> Path:
+    return Path(model_path).parent / MODEL_META_PATH.name
+
+def _candidates_path(model_path) -> Path:
+    return Path(model_path).parent / CANDIDATES_PATH.name
+
+def _dump_model(model, model_path):
+    """Write the model next to `model_path` and move it into place, so readers never see a partial pickle."""
+    import joblib
+
+    model_path = Path(model_path)
+    tmp_path = model_path.with_name(f".{model_path.name}.tmp.{os.getpid()}")
+    try:
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, model_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def load_training_data(train_path, columns: list, last_n_rounds: int | None = None):
+    """Read a dataset file, or the selected segments of a TrainingStore directory."""
+    if TrainingStore.is_store(train_path):
+        return TrainingStore(train_path).read(columns=columns, last_n_rounds=last_n_rounds)
+    return read_dataset(train_path, columns=columns)
+
+def load_model_meta(model_path=MODEL_PATH) -> dict:
+    meta_path = _meta_path(model_path)
+    if not meta_path.exists():
+        return {}
+    return json.loads(meta_path.read_text())
+
+def _save_model_meta(train_path, acc: float, mode: str, model_path=MODEL_PATH):
+    watermark = TrainingStore(train_path).last_segment_id() if TrainingStore.is_store(train_path) else None
+    meta = {
+        "train_path": str(train_path),
+        "trained_through_segment": watermark,
+        "val_accuracy": acc,
+        "mode": mode,
+        "trained_at": time.time(),
+    }
+    _meta_path(model_path).write_text(json.dumps(meta, indent=2))
+
+def _imputed(estimator, *steps):
+    """`estimator` behind mean imputation, so missing feature values don't fail fit/predict."""
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([("impute", SimpleImputer(keep_empty_features=True)), *steps, ("model", estimator)])
+
+def build_model(model_type: str, random_state: int = 42):
+    """Estimator for a `model.type` value in config.yaml."""
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    if model_type == "logistic_regression":
+        return _imputed(LogisticRegression(max_iter=1000))
+    if model_type == "gradient_boosting":
+        # Handles missing values natively
+        return HistGradientBoostingClassifier(random_state=random_state)
+    if model_type == "sgd":
+        # Scaled so SGD behaves on raw incomes/balances; the pipeline still supports incremental updates
+        return _imputed(SGDClassifier(loss="log_loss", random_state=random_state), ("scale", StandardScaler()))
+    raise ValueError(f"Unknown model type: {model_type}")
+
+def candidate_models(cfg: dict) -> dict:
+    """The retraining portfolio: several regularization strengths, gradient boosting and SGD."""
+    from sklearn.linear_model import LogisticRegression
+
+    random_state = cfg["model"].get("random_state", 42)
+    candidates = {
+        f"logistic_regression_C{c:g}": _imputed(LogisticRegression(C=c, max_iter=1000))
+        for c in cfg["model"].get("portfolio_C", [0.01, 0.1, 1.0, 10.0])
+    }
+    candidates["gradient_boosting"] = build_model("gradient_boosting", random_state)
+    candidates["sgd"] = build_model("sgd", random_state)
+    return candidates
+
+def _load_split(train_path, cfg: dict, last_n_rounds: int | None = None):
+    from sklearn.model_selection import train_test_split
+
+    df = load_training_data(
+        train_path, cfg["features"]["numeric"] + [cfg["target"]], last_n_rounds=last_n_rounds
+    )
 
     X = df[cfg["features"]["numeric"]]
     y = df[cfg["target"]]
 
-    X_train, X_val, y_train, y_val = train_test_split(
+    return train_test_split(
         X, y, test_size=0.2, random_state=42
     )
 
-    model = LogisticRegression(max_iter=1000)
+def _fit_candidate(name: str, model, X_train, y_train, X_val, y_val):
+    """Fit one candidate (in a worker process) and measure it."""
+    from sklearn.metrics import accuracy_score
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        acc = accuracy_score(y_val, model.predict(X_val))
+        error = None
+    except Exception as e:
+        fit_seconds = time.perf_counter() - start
+        acc, error = None, str(e)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report = {
+        "name": name,
+        "val_accuracy": acc,
+        "fit_seconds": fit_seconds,
+        "peak_memory_mb": peak / 1e6,
+        "error": error,
+    }
+    return model, report
+
+def train_portfolio(
+    train_path,
+    last_n_rounds: int | None = None,
+    n_jobs: int | None = None,
+    model_path=MODEL_PATH,
+    config_path=CONFIG_PATH,
+):
+    """
+    Fit every candidate in parallel (joblib/loky), score each on the same held-out
+    split and promote the most accurate one to model.joblib (ties go to the faster fit).
+    """
+    from joblib import Parallel, delayed
+
+    print(f"[TRAIN] Starting portfolio training with data from {train_path}")
+    cfg = load_config(config_path)
+    X_train, X_val, y_train, y_val = _load_split(train_path, cfg, last_n_rounds)
+    n_jobs = n_jobs if n_jobs is not None else cfg["model"].get("n_jobs", -1)
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_fit_candidate)(name, model, X_train, y_train, X_val, y_val)
+        for name, model in candidate_models(cfg).items()
+    )
+    wall = time.perf_counter() - start
+
+    for _, report in results:
+        if report["error"]:
+            print(f"[TRAIN]   {report['name']:<28} failed: {report['error']}")
+        else:
+            print(
+                f"[TRAIN]   {report['name']:<28} acc={report['val_accuracy']:.3f} "
+                f"fit={report['fit_seconds']:.2f}s mem={report['peak_memory_mb']:.1f}MB"
+            )
+    fitted = [(model, report) for model, report in results if report["error"] is None]
+    if not fitted:
+        raise RuntimeError("Every portfolio candidate failed to fit")
+    best_model, best = max(fitted, key=lambda mr: (mr[1]["val_accuracy"], -mr[1]["fit_seconds"]))
+    acc = best["val_accuracy"]
+    print(f"[TRAIN] Promoted {best['name']} (validation accuracy {acc:.3f}, portfolio wall time {wall:.2f}s)")
+
+    _candidates_path(model_path).write_text(json.dumps(
+        {"promoted": best["name"], "wall_seconds": wall, "candidates": [r for _, r in results]},
+        indent=2,
+    ))
+    _dump_model(best_model, model_path)
+    _save_model_meta(train_path, acc, mode="portfolio", model_path=model_path)
+    return acc
+
+def train(
+    train_path: str,
+    last_n_rounds: int | None = None,
+    portfolio: bool = False,
+    model_path=MODEL_PATH,
+    config_path=CONFIG_PATH,
+):
+    """Fit `model.type` (or the whole candidate portfolio) and save it to `model_path`."""
+    from sklearn.metrics import accuracy_score
+
+    cfg = load_config(config_path)
+    if portfolio or cfg["model"].get("type") == "portfolio":
+        return train_portfolio(train_path, last_n_rounds, model_path=model_path, config_path=config_path)
+
+    print(f"[TRAIN] Starting training with data from {train_path}")
+    X_train, X_val, y_train, y_val = _load_split(train_path, cfg, last_n_rounds)
+
+    model = build_model(cfg["model"].get("type", "logistic_regression"), cfg["model"].get("random_state", 42))
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_val)
     acc = accuracy_score(y_val, y_pred)
     print(f"[TRAIN] Validation accuracy: {acc:.3f}")
 
-    joblib.dump(model, MODEL_PATH)
+    _dump_model(model, model_path)
+    _save_model_meta(train_path, acc, mode="full", model_path=model_path)
+    return acc
+
+# -----------------------------
+# INCREMENTAL (WARM-START) RETRAINING
+# -----------------------------
+def _incremental_estimator(model):
+    """The estimator an incremental update acts on (a Pipeline's last step), or None if there is none."""
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.pipeline import Pipeline
+
+    if isinstance(model, Pipeline):
+        return _incremental_estimator(model[-1])
+    if hasattr(model, "partial_fit") or isinstance(model, HistGradientBoostingClassifier):
+        return model
+    return None
+
+def _warm_start_fit(model, X, y, max_iter: int):
+    """Update `model` in place from its current parameters using only the new rows (X, y)."""
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.pipeline import Pipeline
+
+    if isinstance(model, Pipeline):
+        # Keep the fitted preprocessing frozen, update the final estimator
+        _warm_start_fit(model[-1], model[:-1].transform(X), y, max_iter)
+    elif hasattr(model, "partial_fit"):
+        model.partial_fit(X, y)
+    elif isinstance(model, HistGradientBoostingClassifier):
+        # Keep the existing trees and boost `max_iter` more rounds on the new rows
+        model.set_params(warm_start=True, max_iter=model.n_iter_ + max_iter)
+        model.fit(X, y)
+    else:
+        raise ValueError(f"{type(model).__name__} can't be updated from new rows only")
+    return model
+
+def _historical_sample(store: TrainingStore, watermark: int, columns: list, n_rows: int, last_n_rounds=None):
+    """Up to `n_rows` rows from the newest segments at or before `watermark`, read chunk-wise."""
+    import pandas as pd
+
+    entries = [e for e in store.segments(last_n_rounds=last_n_rounds) if e["segment_id"] <= watermark]
+    frames, n = [], 0
+    for entry in reversed(entries):
+        # One chunk per segment, so the sample spans several segments when they're small
+        chunk = next(iter_dataset(store.root / entry["path"], columns=columns, chunksize=n_rows), None)
+        if chunk is not None:
+            frames.append(chunk.iloc[:n_rows - n])
+            n += len(frames[-1])
+        if n >= n_rows:
+            break
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+def train_incremental(
+    train_path=TRAIN_STORE_PATH,
+    last_n_rounds: int | None = None,
+    tolerance: float = 0.02,
+    max_iter: int = 100,
+    min_rows: int = 20,
+    holdout_rows: int = 10_000,
+    portfolio: bool = False,
+    model_path=MODEL_PATH,
+    config_path=CONFIG_PATH,
+):
+    """
+    Update the current model with only the training-store segments added since it was last fit:
+    partial_fit for online learners (SGD), extra boosting rounds for gradient boosting. Models
+    with neither (e.g. LogisticRegression, whose warm start would refit the whole history) get
+    a full refit with `train` instead, with the reason logged.
+    Validation uses a bounded hold-out: up to `holdout_rows` / 2 held-out new rows plus as many
+    rows sampled from the historical segments. If the update is worse than the current model on
+    it by more than `tolerance`, falls back to a full refit as well.
+    """
+    import joblib
+    import pandas as pd
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import train_test_split
+
+    cfg = load_config(config_path)
+    meta = load_model_meta(model_path)
+    watermark = meta.get("trained_through_segment")
+    refit = partial(
+        train, train_path, last_n_rounds=last_n_rounds, portfolio=portfolio,
+        model_path=model_path, config_path=config_path,
+    )
+
+    if not TrainingStore.is_store(train_path) or watermark is None or not Path(model_path).exists():
+        print("[TRAIN] No incremental state for this model, running a full refit")
+        return refit()
+
+    model = joblib.load(model_path)
+    if _incremental_estimator(model) is None:
+        name = type(model[-1] if hasattr(model, "steps") else model).__name__
+        print(f"[TRAIN] {name} supports neither partial_fit nor boosting more rounds, running a full refit")
+        return refit()
+
+    store = TrainingStore(train_path)
+    columns = cfg["features"]["numeric"] + [cfg["target"]]
+    new_rows = store.read(columns=columns, last_n_rounds=last_n_rounds, after_segment=watermark)
+    if new_rows.empty:
+        print(f"[TRAIN] No new segments since segment {watermark}, keeping current model")
+        return meta["val_accuracy"]
+
+    fit_rows, val_new = train_test_split(new_rows, test_size=0.2, random_state=42)
+    if len(fit_rows) < min_rows:
+        print(f"[TRAIN] Only {len(fit_rows)} new training rows, running a full refit")
+        return refit()
+    val_new = val_new.iloc[:holdout_rows // 2]
+    history = _historical_sample(store, watermark, columns, max(len(val_new), 1), last_n_rounds)
+    val = pd.concat([val_new, history], ignore_index=True) if history is not None else val_new
+    X_val, y_val = val[cfg["features"]["numeric"]], val[cfg["target"]]
+
+    print(f"[TRAIN] Incremental update with {len(fit_rows)} rows added after segment {watermark}")
+    old_acc = accuracy_score(y_val, model.predict(X_val))
+    model = _warm_start_fit(model, fit_rows[cfg["features"]["numeric"]], fit_rows[cfg["target"]], max_iter=max_iter)
+
+    acc = accuracy_score(y_val, model.predict(X_val))
+    print(f"[TRAIN] Validation accuracy ({len(val_new)} new + {len(val) - len(val_new)} historical rows): {old_acc:.3f} -> {acc:.3f}")
+    if acc + tolerance < old_acc:
+        print("[TRAIN] Incremental update regressed, running a full refit")
+        return refit()
+
+    _dump_model(model, model_path)
+    _save_model_meta(train_path, acc, mode="incremental", model_path=model_path)
     return acc
 
 if __name__ == "__main__":
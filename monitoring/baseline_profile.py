@@ -0,0 +1,187 @@
+import os
+import numpy as np
+from pathlib import Path
+
+from storage.dataset_io import iter_dataset, read_dataset
+
+PROFILE_PATH = Path(__file__).parent / "baseline_profile.npz"
+QUANTILE_LEVELS = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+'''
+    The baseline profile freezes everything PSI needs from the baseline data:
+    per-feature bin edges, bin counts, row counts and a few quantiles.
+    It is written once (round 0) as a compressed .npz, so later rounds only
+    scan the current data and every round is binned against the same edges.
+    It also records the baseline file it came from (path, mtime, size) and the bin
+    count, so a profile built from a different or since-modified file can be detected.
+'''
+
+def bin_matrix(X, edges, block_rows: int | None = None) -> np.ndarray:
+    """
+    Histogram every column of `X` (n_rows x n_features) against its own row of
+    frozen `edges` (n_features x bins+1) in one vectorized pass; returns counts
+    of shape (n_features, bins).
+    Bins are right-open like np.histogram (last bin closed), but the outer bins are
+    open-ended so values outside the baseline range still count. NaNs are skipped.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, None]
+    n_feat, n_bins = edges.shape[0], edges.shape[1] - 1
+    counts = np.zeros(n_feat * n_bins + 1, dtype=np.int64)
+    # Flat bin id per cell: feature offset + bin index; NaNs go to a trailing sentinel bin
+    offsets = np.arange(n_feat, dtype=np.intp) * n_bins
+    interior = edges[:, 1:-1]
+    # Keep the (block x features) temporaries small enough to stay in cache
+    block_rows = block_rows or max(1, (1 << 16) // max(n_feat, 1))
+    idx_dtype = np.uint8 if n_bins <= np.iinfo(np.uint8).max else np.intp
+
+    for start in range(0, X.shape[0], block_rows):
+        block = X[start:start + block_rows]
+        idx = np.zeros(block.shape, dtype=idx_dtype)
+        above = np.empty(block.shape, dtype=bool)
+        # bin index == number of interior edges <= value (same as searchsorted side="right")
+        for k in range(n_bins - 1):
+            np.greater_equal(block, interior[:, k], out=above)
+            idx += above
+        flat = idx.astype(np.intp)
+        flat += offsets
+        flat[np.isnan(block)] = n_feat * n_bins
+        counts += np.bincount(flat.ravel(), minlength=n_feat * n_bins + 1)
+
+    return counts[:-1].reshape(n_feat, n_bins)
+
+def bin_counts(values, edges) -> np.ndarray:
+    """Histogram a single column against frozen `edges` (see bin_matrix)."""
+    return bin_matrix(np.asarray(values, dtype=np.float64)[:, None], np.asarray(edges)[None, :])[0]
+
+def merge_moments(n, mean, m2, X):
+    """
+    Fold the non-NaN values of each column of `X` into running per-column (count, mean, M2)
+    with the pairwise update of Chan et al.; std is sqrt(M2 / count). Unlike sums of squares,
+    this doesn't cancel catastrophically for features with a large mean and small spread.
+    """
+    n_chunk = (~np.isnan(X)).sum(axis=0)
+    mean_chunk = np.nansum(X, axis=0) / np.maximum(n_chunk, 1)
+    m2_chunk = np.nansum((X - mean_chunk) ** 2, axis=0)
+    n_total = n + n_chunk
+    delta = mean_chunk - mean
+    weight = n_chunk / np.maximum(n_total, 1)
+    return n_total, mean + delta * weight, m2 + m2_chunk + delta ** 2 * n * weight
+
+def _quantiles_from_counts(counts, edges, levels) -> np.ndarray:
+    # Linear interpolation of the binned CDF (used when the data is never fully in memory)
+    cdf = np.concatenate([[0.0], np.cumsum(counts) / max(counts.sum(), 1)])
+    return np.interp(levels, cdf, edges)
+
+def build_baseline_profile(
+    baseline_path: str,
+    features: list,
+    bins: int = 10,
+    chunksize: int | None = None,
+) -> dict:
+    """
+    Build the profile of `features` in `baseline_path`.
+    In memory, quantiles are exact; with `chunksize` the file is streamed twice
+    (min/max, then counts) and quantiles are interpolated from the counts.
+    """
+    n_feat = len(features)
+    edges = np.empty((n_feat, bins + 1))
+    counts = np.zeros((n_feat, bins), dtype=np.int64)
+    quantiles = np.empty((n_feat, len(QUANTILE_LEVELS)))
+    n_rows = np.zeros(n_feat, dtype=np.int64)
+    mean = np.empty(n_feat)
+    std = np.empty(n_feat)
+
+    if chunksize:
+        lo = np.full(n_feat, np.inf)
+        hi = np.full(n_feat, -np.inf)
+        for chunk in iter_dataset(baseline_path, columns=features, chunksize=chunksize):
+            lo = np.fmin(lo, chunk[features].min().to_numpy(dtype=np.float64))
+            hi = np.fmax(hi, chunk[features].max().to_numpy(dtype=np.float64))
+        for i in range(n_feat):
+            edges[i] = np.histogram_bin_edges(np.array([lo[i], hi[i]]), bins=bins)
+        m2 = np.zeros(n_feat)
+        mean[:] = 0.0
+        for chunk in iter_dataset(baseline_path, columns=features, chunksize=chunksize):
+            X = chunk[features].to_numpy(dtype=np.float64)
+            counts += bin_matrix(X, edges)
+            n_rows[:], mean[:], m2 = merge_moments(n_rows, mean, m2, X)
+        std[:] = np.sqrt(m2 / np.maximum(n_rows, 1))
+        for i in range(n_feat):
+            quantiles[i] = _quantiles_from_counts(counts[i], edges[i], QUANTILE_LEVELS)
+    else:
+        base = read_dataset(baseline_path, columns=features)
+        for i, feat in enumerate(features):
+            values = base[feat].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            edges[i] = np.histogram_bin_edges(values, bins=bins)
+            counts[i] = bin_counts(values, edges[i])
+            quantiles[i] = np.quantile(values, QUANTILE_LEVELS)
+            n_rows[i] = len(values)
+            mean[i], std[i] = values.mean(), values.std()
+
+    source = os.stat(baseline_path)
+    return {
+        "features": list(features),
+        "source_path": str(Path(baseline_path).resolve()),
+        "source_mtime": source.st_mtime,
+        "source_size": source.st_size,
+        "bins": bins,
+        "edges": edges,
+        "counts": counts,
+        "n_rows": n_rows,
+        "quantile_levels": np.array(QUANTILE_LEVELS),
+        "quantiles": quantiles,
+        "mean": mean,
+        "std": std,
+    }
+
+def profile_moments(profile: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Per-feature (mean, std); estimated from the bin counts for profiles saved without them."""
+    if "mean" in profile and "std" in profile:
+        return profile["mean"], profile["std"]
+    mids = (profile["edges"][:, :-1] + profile["edges"][:, 1:]) / 2
+    weights = profile["counts"] / np.maximum(profile["counts"].sum(axis=1, keepdims=True), 1)
+    mean = (weights * mids).sum(axis=1)
+    std = np.sqrt((weights * (mids - mean[:, None]) ** 2).sum(axis=1))
+    return mean, std
+
+def profile_matches_source(profile: dict, baseline_path, features: list, bins: int = 10) -> bool:
+    """True if `profile` covers `features` with `bins` bins and was built from `baseline_path` as it is now."""
+    if not set(features) <= set(profile["features"]):
+        return False
+    if int(profile.get("bins", profile["edges"].shape[1] - 1)) != bins:
+        return False
+    if "source_path" not in profile:
+        return False  # saved before sources were recorded
+    source = os.stat(baseline_path)
+    return (
+        str(profile["source_path"]) == str(Path(baseline_path).resolve())
+        and float(profile["source_mtime"]) == source.st_mtime
+        and int(profile["source_size"]) == source.st_size
+    )
+
+def save_baseline_profile(profile: dict, path=PROFILE_PATH):
+    path = Path(path)
+    with path.open("wb") as f:
+        np.savez_compressed(f, **{**profile, "features": np.array(profile["features"])})
+    print(f"[MONITORING] Baseline profile written to {path}")
+
+def load_baseline_profile(path=PROFILE_PATH) -> dict:
+    with np.load(path, allow_pickle=False) as data:
+        profile = {key: data[key] for key in data.files}
+    profile["features"] = [str(f) for f in profile["features"]]
+    return profile
+
+def write_baseline_profile(
+    baseline_path: str,
+    features: list,
+    path=PROFILE_PATH,
+    bins: int = 10,
+    chunksize: int | None = None,
+) -> dict:
+    """Build and persist the baseline profile (called once at round 0)."""
+    profile = build_baseline_profile(baseline_path, features, bins=bins, chunksize=chunksize)
+    save_baseline_profile(profile, path)
+    return profile
@@ -1,14 +1,29 @@
-import pandas as pd
 import numpy as np
-from sklearn.metrics import accuracy_score
 import json
 from pathlib import Path
 import yaml
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
+from monitoring.baseline_profile import (
+    PROFILE_PATH,
+    bin_counts,
+    bin_matrix,
+    build_baseline_profile,
+    load_baseline_profile,
+    merge_moments,
+    profile_matches_source,
+    write_baseline_profile,
+)
+from monitoring.parallel_drift import parallel_bin_matrix
+from storage.dataset_io import iter_dataset, read_dataset
 
 CONFIG_PATH = Path(__file__).parents[1] / "model" / "config.yaml"
 
-def load_config():
-    with open(CONFIG_PATH, "r") as f:
+def load_config(config_path=CONFIG_PATH):
+    with open(config_path, "r") as f:
         return yaml.safe_load(f)
     
 '''
@@ -20,40 +35,162 @@ def load_config():
     and production ML systems because it’s simple, interpretable, and works well for both continuous and categorical features.
 '''
 def population_stability_index(expected, actual, bins=10):
-    e_perc, _ = np.histogram(expected, bins=bins)
-    a_perc, _ = np.histogram(actual, bins=bins)
-    e_perc = e_perc / len(expected)
-    a_perc = a_perc / len(actual)
+    # Both sides share the bin edges derived from the expected (baseline) sample
+    edges = np.histogram_bin_edges(expected, bins=bins)
+    e_counts = bin_counts(expected, edges)
+    a_counts = bin_counts(actual, edges)
+    return psi_from_counts(e_counts, a_counts, e_counts.sum(), a_counts.sum())
+
+def psi_from_counts(e_counts, a_counts, n_expected: int, n_actual: int) -> float:
+    """PSI from (possibly merged) histogram counts and the row counts behind them."""
+    e_perc = e_counts / n_expected
+    a_perc = a_counts / n_actual
     e_perc = np.where(e_perc == 0, 1e-6, e_perc)
     a_perc = np.where(a_perc == 0, 1e-6, a_perc)
     psi = np.sum((a_perc - e_perc) * np.log(a_perc / e_perc))
     return float(psi)
 
+# -----------------------------
+# BATCHED DRIFT STATISTICS
+# -----------------------------
+# All features are handled as rows of (n_features x bins) count matrices,
+# so the per-feature Python overhead disappears.
+
+def drift_statistics(base_counts, curr_counts) -> dict:
+    """
+    PSI, KS and Jensen-Shannon divergence for every feature at once from
+    binned counts of shape (n_features, bins). KS is computed on the binned CDFs,
+    JS uses log base 2 (0 = identical, 1 = disjoint).
+    """
+    base_counts = np.asarray(base_counts, dtype=np.float64)
+    curr_counts = np.asarray(curr_counts, dtype=np.float64)
+    e_perc = base_counts / base_counts.sum(axis=1, keepdims=True)
+    a_perc = curr_counts / curr_counts.sum(axis=1, keepdims=True)
+
+    # PSI: same 1e-6 smoothing of empty bins as psi_from_counts
+    e_psi = np.where(e_perc == 0, 1e-6, e_perc)
+    a_psi = np.where(a_perc == 0, 1e-6, a_perc)
+    psi = np.sum((a_psi - e_psi) * np.log(a_psi / e_psi), axis=1)
+
+    ks = np.max(np.abs(np.cumsum(a_perc, axis=1) - np.cumsum(e_perc, axis=1)), axis=1)
+
+    m = 0.5 * (e_perc + a_perc)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        e_term = np.where(e_perc > 0, e_perc * np.log2(e_perc / m), 0.0)
+        a_term = np.where(a_perc > 0, a_perc * np.log2(a_perc / m), 0.0)
+    js = 0.5 * e_term.sum(axis=1) + 0.5 * a_term.sum(axis=1)
+
+    return {"psi": psi, "ks": ks, "js": js}
+
+def batch_drift(current, edges, base_counts) -> dict:
+    """
+    Drift of every column of the `current` feature matrix (n_rows x n_features)
+    against the baseline `base_counts` binned on `edges`, in a single pass.
+    """
+    return drift_statistics(base_counts, bin_matrix(current, edges))
+
+def _resolve_profile(baseline_path: str, profile_path, features: list, chunksize: int | None, bins: int = 10) -> dict:
+    """Load the persisted baseline profile, building (and saving) it only when missing or stale."""
+    if profile_path is None:
+        return build_baseline_profile(baseline_path, features, bins=bins, chunksize=chunksize)
+
+    if Path(profile_path).exists():
+        profile = load_baseline_profile(profile_path)
+        if profile_matches_source(profile, baseline_path, features, bins):
+            return profile
+        print(f"[MONITORING] Baseline profile {profile_path} is stale (features, bins or baseline file changed), rebuilding")
+
+    return write_baseline_profile(baseline_path, features, path=profile_path, bins=bins, chunksize=chunksize)
+
+# -----------------------------
+# STREAMING (CHUNKED) SCAN
+# -----------------------------
+# Only per-feature partial counts are kept, so peak memory is bounded by
+# `chunksize`, not by the file size. The baseline side comes from the profile.
+
+def _scan_current(path: str, features: list, edges, target: str, chunksize: int, bin_fn=bin_matrix):
+    """Single pass over the current file: accuracy, histogram counts and per-feature mean/std."""
+    columns = list(features) + [target, "prediction"]
+    counts = np.zeros((len(features), edges.shape[1] - 1), dtype=np.int64)
+    n_values = np.zeros(len(features), dtype=np.int64)
+    mean = np.zeros(len(features))
+    m2 = np.zeros(len(features))
+    n_rows = 0
+    n_correct = 0
+    for chunk in iter_dataset(path, columns=columns, chunksize=chunksize):
+        n_rows += len(chunk)
+        n_correct += int((chunk[target].to_numpy() == chunk["prediction"].to_numpy()).sum())
+        X = chunk[features].to_numpy(dtype=np.float64)
+        counts += bin_fn(X, edges)
+        n_values, mean, m2 = merge_moments(n_values, mean, m2, X)
+    std = np.sqrt(m2 / np.maximum(n_values, 1))
+    return n_correct / n_rows, counts, mean, std
+
 def compute_metrics(
     baseline_path: str,
     current_path: str,
     drift_report_path: str,
     baseline_acc: float,
+    chunksize: int | None = None,
+    profile_path: str | Path | None = None,
+    n_jobs: int | None = None,
+    config_path=CONFIG_PATH,
+    bins: int = 10,
 ):
-    cfg = load_config()
-    base = pd.read_csv(baseline_path)
-    curr = pd.read_csv(current_path)
+    """
+    Write the drift report comparing `current_path` against the baseline.
+    The baseline side comes from the profile at `profile_path` (built from `baseline_path`
+    on first use), so later rounds never rescan the baseline file. With `chunksize`,
+    files are streamed in chunks of that many rows instead of being loaded whole;
+    histograms and accuracy match the in-memory report exactly, means/stds up to
+    floating-point rounding (they are merged per chunk).
+    With `n_jobs` > 1, binning of the current data is split by rows across a
+    process pool sharing the feature matrix; the result is identical to the sequential one.
+    The profile is rebuilt when it doesn't match `baseline_path` (path, mtime, size), `bins`
+    or the configured features.
+    """
+    cfg = load_config(config_path)
+    features = cfg["features"]["numeric"]
 
-    # assume both have target + prediction
-    acc = accuracy_score(curr[cfg["target"]], curr["prediction"])
-    acc_drop = baseline_acc - acc
+    profile = _resolve_profile(baseline_path, profile_path, features, chunksize, bins)
+    rows = [profile["features"].index(feat) for feat in features]
+    edges = profile["edges"][rows]
+    base_counts = profile["counts"][rows]
 
-    psi_by_feature = {}
-    for feat in cfg["features"]["numeric"]:
-        psi_by_feature[feat] = population_stability_index(
-            base[feat].values, curr[feat].values
-        )
+    parallel = n_jobs is not None and n_jobs > 1
+    with (ProcessPoolExecutor(max_workers=n_jobs) if parallel else nullcontext()) as pool:
+        bin_fn = partial(parallel_bin_matrix, executor=pool, n_partitions=n_jobs) if parallel else bin_matrix
+        start = time.perf_counter()
+
+        if chunksize:
+            acc, curr_counts, curr_mean, curr_std = _scan_current(
+                current_path, features, edges, cfg["target"], chunksize, bin_fn=bin_fn
+            )
+        else:
+            curr = read_dataset(current_path, columns=features + [cfg["target"], "prediction"])
+
+            # assume current has target + prediction
+            acc = float((curr[cfg["target"]].to_numpy() == curr["prediction"].to_numpy()).mean())
+            X = curr[features].to_numpy(dtype=np.float64)
+            curr_counts = bin_fn(X, edges)
+            curr_mean, curr_std = np.nanmean(X, axis=0), np.nanstd(X, axis=0)
+
+        elapsed = time.perf_counter() - start
+    print(f"[MONITORING] Scanned current data for {len(features)} features in {elapsed:.3f}s (n_jobs={n_jobs or 1})")
+
+    acc_drop = baseline_acc - acc
+    stats = drift_statistics(base_counts, curr_counts)
 
     report = {
         "baseline_accuracy": baseline_acc,
         "current_accuracy": acc,
         "accuracy_drop": acc_drop,
-        "psi_by_feature": psi_by_feature,
+        "psi_by_feature": dict(zip(features, stats["psi"].tolist())),
+        "ks_by_feature": dict(zip(features, stats["ks"].tolist())),
+        "js_by_feature": dict(zip(features, stats["js"].tolist())),
+        # Current-data moments, e.g. for generating training rows that match the drifted inputs
+        "mean_by_feature": dict(zip(features, curr_mean.tolist())),
+        "std_by_feature": dict(zip(features, curr_std.tolist())),
     }
 
     Path(drift_report_path).write_text(json.dumps(report, indent=2))
@@ -66,4 +203,5 @@ if __name__ == "__main__":
         "data/test_round1_pred.csv",
         "monitoring/drift_report_round1.json",
         baseline_acc=0.9,
-    )
\ No newline at end of file
+        profile_path=PROFILE_PATH,
+    )
@@ -0,0 +1,54 @@
+import numpy as np
+from concurrent.futures import Executor, wait
+from multiprocessing import shared_memory
+
+from monitoring.baseline_profile import bin_matrix
+
+'''
+    Row-partitioned binning across a process pool.
+    The feature matrix is copied once into a shared memory block; workers attach
+    to it by name and bin their own row range, returning only small
+    (n_features x bins) count matrices. Counts are integers, so summing the
+    partitions gives exactly the sequential result.
+'''
+
+def _bin_partition(shm_name: str, shape: tuple, dtype: str, start: int, stop: int, edges) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    X = None
+    try:
+        X = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        return bin_matrix(X[start:stop], edges)
+    finally:
+        X = None  # release the buffer export before closing, also when binning raised
+        shm.close()
+
+def parallel_bin_matrix(X, edges, executor: Executor, n_partitions: int) -> np.ndarray:
+    """Same result as bin_matrix(X, edges), computed over `n_partitions` row ranges on `executor`."""
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    n_rows = X.shape[0]
+    n_partitions = max(1, min(n_partitions, n_rows))
+    bounds = np.linspace(0, n_rows, n_partitions + 1).astype(int)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    shared, futures = None, []
+    try:
+        shared = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+        shared[:] = X
+        futures = [
+            executor.submit(_bin_partition, shm.name, X.shape, X.dtype.str, int(a), int(b), edges)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        counts = np.zeros((edges.shape[0], edges.shape[1] - 1), dtype=np.int64)
+        for future in futures:
+            counts += future.result()
+    finally:
+        # On error: cancel what hasn't started and let running partitions finish before unlinking
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        shared = None  # release the buffer export, or close() raises BufferError
+        try:
+            shm.close()
+        finally:
+            shm.unlink()
+    return counts
@@ -1,13 +1,14 @@
-import pandas as pd
 import numpy as np
 
+from storage.dataset_io import read_dataset, write_dataset
+
 def inject_drift(input_path: str, output_path: str, shift: float = 10.0):
-    df = pd.read_csv(input_path)
+    df = read_dataset(input_path)
     if "age" in df.columns:
         df["age"] = df["age"] + shift
     if "income" in df.columns:
         df["income"] = df["income"] * (1 + shift / 100.0)
-    df.to_csv(output_path, index=False)
+    write_dataset(df, output_path)
     print(f"[DRIFT] Wrote drifted data to {output_path}")
 
 if __name__ == "__main__":
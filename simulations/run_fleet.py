@@ -0,0 +1,67 @@
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from agents.fleet import FleetModel, run_fleet
+from agents.llm_client import LLMClient
+from model.train_model import CONFIG_PATH
+from simulations.stub_llm import start_stub_server
+
+'''
+    Fleet demo: N copies of the demo model, each with its own directory under fleet/,
+    all monitored through the same workflow over the drift rounds in data/.
+
+    uv run python -m simulations.run_fleet --models 20 --workers 8 --llm-concurrency 4
+    uv run python -m simulations.run_fleet --models 100 --stub-delay 0.5   # no Ollama needed
+'''
+
+DATA_DIR = Path("data")
+FLEET_DIR = Path("fleet")
+ROUNDS = [
+    ("1", str(DATA_DIR / "test_round1_drift.csv")),
+    ("2", str(DATA_DIR / "test_round2_drift.csv")),
+]
+
+def fleet_llm(llm_concurrency: int | None, endpoint: str | None = None) -> LLMClient:
+    """One client for the whole fleet, with the global concurrency limit applied."""
+    cfg = yaml.safe_load(open(CONFIG_PATH))
+    cfg["llm"]["max_concurrency"] = llm_concurrency
+    if endpoint:
+        cfg["llm"].update({"provider": "ollama", "endpoint": endpoint})
+    path = Path(tempfile.mkdtemp()) / "llm.yaml"
+    path.write_text(yaml.safe_dump(cfg))
+    return LLMClient(path)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--llm-concurrency", type=int, default=4)
+    parser.add_argument("--stub-delay", type=float, default=None, help="serve the LLM from simulations.stub_llm")
+    args = parser.parse_args()
+
+    server, endpoint = start_stub_server(delay=args.stub_delay) if args.stub_delay is not None else (None, None)
+    try:
+        llm = fleet_llm(args.llm_concurrency, endpoint)
+        print(f"\n=== FLEET SETUP: {args.models} models ===")
+        models = [
+            FleetModel.create(
+                FLEET_DIR / f"model_{i:03d}",
+                llm,
+                seed_train_path=str(DATA_DIR / "train_original.csv"),
+                baseline_test_path=str(DATA_DIR / "test_round0.csv"),
+                # The worker pool is the fleet's parallelism; keep each portfolio fit single-process
+                config_overrides={"model": {"n_jobs": 1}},
+            )
+            for i in range(args.models)
+        ]
+        print(f"\n=== FLEET ROUNDS: {len(ROUNDS)} per model ===")
+        run_fleet(models, ROUNDS, max_workers=args.workers)
+    finally:
+        if server:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,33 @@
 from pathlib import Path
 from model.train_model import train
 from model.predict import predict
-from monitoring.compute_metrics import compute_metrics
-from agents.orchestrator import Orchestrator
-from agents.memory_store import MEMORY_PATH
-import shutil
+from monitoring.compute_metrics import compute_metrics, load_config
+from monitoring.baseline_profile import PROFILE_PATH, write_baseline_profile
+from agents.memory_store import open_memory_store
 from agents.workflow import build_workflow
-from agents.memory_store import MemoryStore
+from storage.training_store import TRAIN_STORE_PATH, TrainingStore
 
 DATA_DIR = Path("data")
 MON_DIR = Path("monitoring")
 
-# Clean memory before each simulation run: this ensures no prior state affects the demo
-open(MEMORY_PATH, "w").close()
-shutil.copy("data/train_original.csv", "data/train.csv")
-
-from pathlib import Path
-from model.train_model import train
-from model.predict import predict
-from monitoring.compute_metrics import compute_metrics
-from agents.workflow import build_workflow
-from agents.memory_store import MemoryStore
+def reset_demo_state():
+    """Clean memory (with its summary and incident vectors) and training store, so no prior state affects the demo."""
+    open_memory_store(load_config().get("memory", {}).get("backend", "jsonl")).clear()
+    TrainingStore().reset(seed_path="data/train_original.csv")
 
 def run_demo():
+    reset_demo_state()
+
     # === Round 0: Baseline training ===
     print("\n=== ROUND 0: BASELINE ===")
-    baseline_acc = train(str(DATA_DIR / "train.csv"))
+    baseline_acc = train(str(TRAIN_STORE_PATH))
     predict(str(DATA_DIR / "test_round0.csv"), str(DATA_DIR / "test_round0_pred.csv"))
 
+    # Freeze baseline bin edges/counts once; later rounds only scan current data
+    write_baseline_profile(
+        str(DATA_DIR / "test_round0_pred.csv"), load_config()["features"]["numeric"], path=PROFILE_PATH
+    )
+
     # === Round 1: Drift ===
     print("\n=== ROUND 1: DRIFT ===")
     predict(str(DATA_DIR / "test_round1_drift.csv"), str(DATA_DIR / "test_round1_pred.csv"))
@@ -37,6 +37,7 @@ def run_demo():
         str(DATA_DIR / "test_round1_pred.csv"),
         str(MON_DIR / "drift_report_round1.json"),
         baseline_acc=baseline_acc,
+        profile_path=PROFILE_PATH,
     )
 
     # Build LangGraph workflow
@@ -62,6 +63,7 @@ def run_demo():
         str(DATA_DIR / "test_round2_pred.csv"),
         str(MON_DIR / "drift_report_round2.json"),
         baseline_acc=baseline_acc,
+        profile_path=PROFILE_PATH,
     )
 
     # Prepare state for Round 2
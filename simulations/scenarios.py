@@ -0,0 +1,173 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from model.train_model import CONFIG_PATH
+from storage.dataset_io import DatasetWriter
+
+'''
+    Drift scenarios at any scale: N rows x M standard-normal features, a clean training set,
+    a clean baseline test set (round 0) and any number of drifted rounds.
+    Labels are Bernoulli(sigmoid(X @ w)) on the clean features; drift is applied to what the
+    model observes afterwards, so every drift type degrades the fitted model. Round r applies
+    each selected drift with strength `magnitude * r` to the first `drift_fraction` of the features:
+
+        mean_shift       x += s                        (in units of the feature's std)
+        variance_change  x *= 1 + s
+        rotation         consecutive feature pairs rotated by s radians (needs >= 2 drifted features)
+        label_flip       labels flipped with probability min(s / 4, 0.5)
+        missingness      values set to NaN with probability min(s / 4, 0.9)
+
+    uv run python -m simulations.scenarios scenario/ --rows 1000000 --features 50 --rounds 5 --drift mean_shift missingness
+'''
+
+DRIFT_TYPES = ("mean_shift", "variance_change", "rotation", "label_flip", "missingness")
+CHUNK_ROWS = 500_000
+# Norm of the label weight vector: sets how separable (and how accurate) the clean data is
+SIGNAL = 3.0
+
+def feature_names(n_features: int) -> list:
+    return [f"x{j}" for j in range(n_features)]
+
+def label_weights(n_features: int, seed: int = 0) -> np.ndarray:
+    w = np.random.default_rng([seed, 0]).standard_normal(n_features)
+    return w * SIGNAL / np.linalg.norm(w)
+
+def scenario_config(n_features: int, seed: int = 0, base_config_path: Path = CONFIG_PATH) -> dict:
+    """The base config with the scenario's features, and a generator that draws labels the same way."""
+    cfg = yaml.safe_load(open(base_config_path))
+    features = feature_names(n_features)
+    cfg["features"]["numeric"] = features
+    cfg.setdefault("generator", {}).update({
+        "target_weights": dict(zip(features, label_weights(n_features, seed).tolist())),
+        "target_intercept": 0.0,
+    })
+    return cfg
+
+def n_drifted_features(n_features: int, drift_fraction: float) -> int:
+    return max(1, int(round(n_features * drift_fraction)))
+
+def apply_drift(X: np.ndarray, y: np.ndarray, drift: str, strength: float, n_drifted: int, rng):
+    """Apply one drift type in place to the first `n_drifted` columns of X (or to y)."""
+    cols = slice(0, n_drifted)
+    if drift == "mean_shift":
+        X[:, cols] += strength
+    elif drift == "variance_change":
+        X[:, cols] *= 1 + strength
+    elif drift == "rotation":
+        if n_drifted < 2:
+            raise ValueError(f"rotation drift needs at least 2 drifted features, got {n_drifted}")
+        c, s = np.cos(strength), np.sin(strength)
+        for j in range(0, n_drifted - 1, 2):
+            a, b = X[:, j].copy(), X[:, j + 1]
+            X[:, j] = c * a - s * b
+            X[:, j + 1] = s * a + c * b
+    elif drift == "label_flip":
+        flip = rng.random(len(y)) < min(strength / 4, 0.5)
+        y[flip] = 1 - y[flip]
+    elif drift == "missingness":
+        X[:, cols][rng.random((len(X), n_drifted)) < min(strength / 4, 0.9)] = np.nan
+    else:
+        raise ValueError(f"Unknown drift type: {drift} (expected one of {DRIFT_TYPES})")
+
+def iter_scenario_chunks(
+    n_rows: int,
+    n_features: int,
+    target: str,
+    drifts: tuple = (),
+    strength: float = 0.0,
+    drift_fraction: float = 0.5,
+    seed: int = 0,
+    stream: int = 0,
+    chunk_rows: int = CHUNK_ROWS,
+):
+    """Yield one dataset of the scenario chunk by chunk; `stream` separates the datasets' random draws."""
+    rng = np.random.default_rng([seed, stream + 1])
+    w = label_weights(n_features, seed)
+    n_drifted = n_drifted_features(n_features, drift_fraction)
+    for start in range(0, n_rows, chunk_rows):
+        n = min(chunk_rows, n_rows - start)
+        X = rng.standard_normal((n, n_features))
+        y = (rng.random(n) * (1 + np.exp(-np.clip(X @ w, -50, 50))) < 1).astype(np.int64)
+        for drift in drifts:
+            apply_drift(X, y, drift, strength, n_drifted, rng)
+        chunk = pd.DataFrame(X, columns=feature_names(n_features), copy=False)
+        chunk[target] = y
+        yield chunk
+
+def write_scenario(
+    root: Path,
+    n_rows: int,
+    n_features: int,
+    n_rounds: int,
+    drifts: tuple = ("mean_shift",),
+    magnitude: float = 0.25,
+    drift_fraction: float = 0.5,
+    seed: int = 0,
+    fmt: str = "csv",
+    chunk_rows: int = CHUNK_ROWS,
+) -> dict:
+    """
+    Write config.yaml, train.<fmt>, round0.<fmt> (clean baseline) and round1..round<n_rounds>.<fmt>
+    under `root`. Returns their paths; `rounds` is the [(round_id, path)] list run_fleet takes.
+    """
+    unknown = [d for d in drifts if d not in DRIFT_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown drift type(s): {unknown} (expected one of {DRIFT_TYPES})")
+    n_drifted = n_drifted_features(n_features, drift_fraction)
+    if "rotation" in drifts and n_drifted < 2:
+        # Fail before writing anything rather than label a clean scenario as rotated
+        raise ValueError(
+            f"rotation drift needs at least 2 drifted features, but {n_features} features x "
+            f"drift_fraction {drift_fraction} drifts {n_drifted}; use more features or a larger fraction"
+        )
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    cfg = scenario_config(n_features, seed)
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.safe_dump(cfg))
+
+    def write(name: str, stream: int, active: tuple, strength: float) -> str:
+        path = root / f"{name}.{fmt}"
+        chunks = iter_scenario_chunks(
+            n_rows, n_features, cfg["target"], active, strength, drift_fraction, seed, stream, chunk_rows
+        )
+        with DatasetWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        return str(path)
+
+    paths = {
+        "config_path": str(config_path),
+        "train_path": write("train", 0, (), 0.0),
+        "baseline_path": write("round0", 1, (), 0.0),
+        "rounds": [
+            (str(r), write(f"round{r}", r + 1, tuple(drifts), magnitude * r))
+            for r in range(1, n_rounds + 1)
+        ],
+    }
+    print(
+        f"[SCENARIO] {n_rows} rows x {n_features} features, {n_rounds} rounds of {'+'.join(drifts) or 'no drift'} "
+        f"-> {root}"
+    )
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--drift", nargs="+", default=["mean_shift"], choices=DRIFT_TYPES)
+    parser.add_argument("--magnitude", type=float, default=0.25)
+    parser.add_argument("--format", default="csv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_scenario(
+        args.root, args.rows, args.features, args.rounds, tuple(args.drift), args.magnitude,
+        seed=args.seed, fmt=args.format,
+    )
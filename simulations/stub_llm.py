@@ -0,0 +1,126 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+'''
+    Local stand-in for the Ollama /api/chat endpoint with a fixed response delay.
+    Every answer is a JSON object that satisfies all agent parsers, so the full
+    workflow can run (and be benchmarked) without a model. Streaming requests get
+    NDJSON chunks of `chunk_chars` characters every `token_delay` seconds, followed
+    by `trailer` text (the tokens a JSON-only caller doesn't need). `prompt_token_delay`
+    adds prefill time per prompt token (~4 characters), so latency grows with prompt size.
+
+    uv run python -m simulations.stub_llm [delay_seconds] [port]
+    # then point llm.endpoint in model/config.yaml at http://127.0.0.1:<port>
+'''
+
+STUB_CONTENT = {
+    "issue_type": "data_drift",
+    "suspect_features": [],
+    "severity": "low",
+    "reasoning": "Stub LLM response.",
+    "changes": {},
+    "rationale": "Stub LLM response.",
+    "should_retrain": False,
+}
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self, address, delay: float, content: dict, token_delay: float, trailer: str, prompt_token_delay: float = 0.0
+    ):
+        super().__init__(address, _StubHandler)
+        self.delay = delay
+        self.prompt_token_delay = prompt_token_delay
+        self.content = json.dumps(content) + trailer
+        self.token_delay = token_delay
+        self.chunk_chars = 8
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early (stop_at_json) drop the connection; that's expected
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Ollama
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with self.server._count_lock:
+            self.server.requests_served += 1
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        time.sleep(self.server.delay + self.server.prompt_token_delay * (prompt_chars // 4))
+        if payload.get("stream"):
+            self._stream(payload)
+            return
+
+        # a non-streamed answer arrives only once every token has been generated
+        time.sleep(self.server.token_delay * max(len(self.server.content) // self.server.chunk_chars - 1, 0))
+        body = json.dumps({
+            "model": payload.get("model"),
+            "message": {"role": "assistant", "content": self.server.content},
+            "done": True,
+            "prompt_eval_count": prompt_chars // 4,
+            "eval_count": len(self.server.content) // 4,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, payload: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        content, step = self.server.content, self.server.chunk_chars
+        pieces = [content[i:i + step] for i in range(0, len(content), step)]
+        try:
+            for i, piece in enumerate(pieces):
+                if i:
+                    time.sleep(self.server.token_delay)
+                self._write_chunk({"model": payload.get("model"), "message": {"role": "assistant", "content": piece}, "done": False})
+            self._write_chunk({"model": payload.get("model"), "message": {"role": "assistant", "content": ""}, "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # client stopped reading (early JSON termination)
+            self.close_connection = True
+
+    def _write_chunk(self, obj: dict):
+        data = (json.dumps(obj) + "\n").encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(
+    delay: float = 0.5,
+    port: int = 0,
+    content: dict | None = None,
+    token_delay: float = 0.0,
+    trailer: str = "",
+    prompt_token_delay: float = 0.0,
+):
+    """Serve in a background thread; returns (server, endpoint_url). Call server.shutdown() to stop."""
+    server = _StubServer(("127.0.0.1", port), delay, content or STUB_CONTENT, token_delay, trailer, prompt_token_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 11434
+    server, url = start_stub_server(delay, port)
+    print(f"[STUB_LLM] Serving {url}/api/chat with {delay}s delay (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:  # pandas is imported on first use, so importing this module stays cheap
+    import pandas as pd
+
+'''
+    Shared dataset I/O for train/test/prediction files.
+    The format is picked from the path:
+    - *.csv       : text, kept for backward compatibility
+    - *.parquet   : columnar, compressed (needs pyarrow)
+    - *.feather   : Arrow IPC, memory-mappable (needs pyarrow)
+    - *.npcols    : a directory with one memory-mapped .npy per column (numeric columns only)
+    Every reader supports column projection, so callers only pay for the columns they use.
+'''
+
+FORMATS = ("csv", "parquet", "feather", "npcols")
+NPCOLS_SCHEMA = "_schema.json"
+
+def dataset_format(path) -> str:
+    fmt = Path(path).suffix.lower().lstrip(".")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported dataset format '{fmt}' for {path} (expected one of {FORMATS})")
+    return fmt
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet/Feather datasets need pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+def npy_header(dtype: np.dtype, n_rows: int, size: int = 128) -> bytes:
+    """A version 1.0 .npy header padded to exactly `size` bytes, so it can be rewritten in place."""
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (n_rows,)})
+    header = header.ljust(size - 10 - 1) + "\n"
+    return np.lib.format.MAGIC_PREFIX + b"\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+# -----------------------------
+# READING
+# -----------------------------
+def _npcols_schema(path: Path) -> dict:
+    return json.loads((path / NPCOLS_SCHEMA).read_text())
+
+def _npcols_arrays(path: Path, columns: list | None) -> dict:
+    columns = columns or _npcols_schema(path)["columns"]
+    return {col: np.load(path / f"{col}.npy", mmap_mode="r") for col in columns}
+
+def read_dataset(path, columns: list | None = None) -> pd.DataFrame:
+    """Load the whole dataset at `path`, restricted to `columns` when given."""
+    import pandas as pd
+
+    path = Path(path)
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns)
+    elif fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    elif fmt == "feather":
+        _pyarrow()
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = pd.DataFrame({col: np.asarray(arr) for col, arr in _npcols_arrays(path, columns).items()})
+    return df[columns] if columns else df
+
+def iter_dataset(path, columns: list | None = None, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield the dataset at `path` in chunks of at most `chunksize` rows."""
+    import pandas as pd
+
+    path = Path(path)
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            yield chunk[columns] if columns else chunk
+    elif fmt == "parquet":
+        _, pq = _pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif fmt == "feather":
+        pa, _ = _pyarrow()
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+    else:
+        arrays = _npcols_arrays(path, columns)
+        n_rows = _npcols_schema(path)["n_rows"]
+        for start in range(0, n_rows, chunksize):
+            yield pd.DataFrame({col: np.array(arr[start:start + chunksize]) for col, arr in arrays.items()})
+
+# -----------------------------
+# WRITING
+# -----------------------------
+class DatasetWriter:
+    """Streams DataFrame chunks (same columns each time) into a dataset file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.fmt = dataset_format(self.path)
+        self.n_rows = 0
+        self._columns = None
+        self._schema = None
+        self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self, df: pd.DataFrame):
+        self._columns = list(df.columns)
+        if self.fmt == "csv":
+            self._sink = True
+            df.head(0).to_csv(self.path, index=False)
+        elif self.fmt in ("parquet", "feather"):
+            pa, pq = _pyarrow()
+            self._schema = pa.Table.from_pandas(df, preserve_index=False).schema
+            if self.fmt == "parquet":
+                self._sink = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._sink = pa.ipc.new_file(str(self.path), self._schema)
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._sink = {}
+            for col in self._columns:
+                dtype = df[col].to_numpy().dtype
+                if dtype.hasobject:
+                    raise ValueError(f"npcols datasets only hold numeric columns, '{col}' is {dtype}")
+                f = (self.path / f"{col}.npy").open("wb")
+                f.write(npy_header(dtype, 0))
+                self._sink[col] = (f, dtype)
+
+    def write(self, df: pd.DataFrame):
+        if self._sink is None:
+            self._open(df)
+        df = df[self._columns]
+        if self.fmt == "csv":
+            df.to_csv(self.path, mode="a", header=False, index=False)
+        elif self.fmt in ("parquet", "feather"):
+            pa, _ = _pyarrow()
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._sink.write_table(table)
+        else:
+            for col, (f, dtype) in self._sink.items():
+                f.write(np.ascontiguousarray(df[col].to_numpy(), dtype=dtype).tobytes())
+        self.n_rows += len(df)
+
+    def close(self):
+        if self._sink is None or self.fmt == "csv":
+            return
+        if self.fmt in ("parquet", "feather"):
+            self._sink.close()
+        else:
+            for f, dtype in self._sink.values():
+                f.seek(0)
+                f.write(npy_header(dtype, self.n_rows))
+                f.close()
+            (self.path / NPCOLS_SCHEMA).write_text(
+                json.dumps({"columns": self._columns, "n_rows": self.n_rows})
+            )
+        self._sink = None
+
+def write_dataset(df: pd.DataFrame, path):
+    with DatasetWriter(path) as writer:
+        writer.write(df)
+
+def convert_dataset(src, dst, columns: list | None = None, chunksize: int = 100_000) -> int:
+    """Re-encode `src` into the format of `dst` chunk by chunk; returns the row count."""
+    with DatasetWriter(dst) as writer:
+        for chunk in iter_dataset(src, columns=columns, chunksize=chunksize):
+            writer.write(chunk)
+    return writer.n_rows
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .dataset_io import DatasetWriter, iter_dataset, read_dataset
+
+if TYPE_CHECKING:  # pandas is imported on first use, so importing this module stays cheap
+    import pandas as pd
+
+TRAIN_STORE_PATH = Path(__file__).parents[1] / "data" / "train_store"
+
+'''
+    Append-only training data store.
+    Each batch of training data (the seed set, a round's synthetic or real rows)
+    lands as a new immutable segment file, described by one line in manifest.jsonl
+    (segment id, round id, source, row count). Adding data costs O(new rows);
+    training picks the segments it wants (all, some rounds, the last N rounds)
+    and reads them lazily.
+'''
+
+class TrainingStore:
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, root: Path = TRAIN_STORE_PATH, segment_format: str = "npcols"):
+        self.root = Path(root)
+        self.segment_format = segment_format
+        self._init_layout()
+
+    def _init_layout(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / self.MANIFEST).touch(exist_ok=True)
+
+    @classmethod
+    def is_store(cls, path) -> bool:
+        return (Path(path) / cls.MANIFEST).is_file()
+
+    # -----------------------------
+    # MANIFEST
+    # -----------------------------
+    def segments(
+        self,
+        rounds: Iterable[str] | None = None,
+        last_n_rounds: int | None = None,
+        after_segment: int | None = None,
+    ) -> list:
+        """Manifest entries in append order, optionally restricted by round or by segment id."""
+        with (self.root / self.MANIFEST).open("r") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+        if rounds is not None:
+            wanted = {str(r) for r in rounds}
+            entries = [e for e in entries if e["round_id"] in wanted]
+        if last_n_rounds is not None:
+            # rounds in the order they first appeared
+            order = list(dict.fromkeys(e["round_id"] for e in entries))
+            keep = set(order[-last_n_rounds:]) if last_n_rounds > 0 else set()
+            entries = [e for e in entries if e["round_id"] in keep]
+        if after_segment is not None:
+            entries = [e for e in entries if e["segment_id"] > after_segment]
+        return entries
+
+    def last_segment_id(self) -> int:
+        entries = self.segments()
+        return entries[-1]["segment_id"] if entries else 0
+
+    # -----------------------------
+    # WRITES
+    # -----------------------------
+    def append_chunks(self, chunks: Iterable[pd.DataFrame], round_id, source: str = "synthetic") -> dict:
+        """
+        Write `chunks` as one new immutable segment and register it in the manifest.
+        If they hold no rows, nothing is written and the returned entry (n_rows 0,
+        segment_id and path None) is not registered.
+        """
+        segment_id = self.last_segment_id() + 1
+        name = f"segment-{segment_id:06d}.{self.segment_format}"
+        tmp_path = self.root / f".{name}.tmp.{self.segment_format}"
+
+        with DatasetWriter(tmp_path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        if writer.n_rows == 0:
+            # Nothing to store; the writer may not even have created the file
+            if tmp_path.is_dir():
+                shutil.rmtree(tmp_path)
+            else:
+                tmp_path.unlink(missing_ok=True)
+            print(f"[STORE] No rows for round {round_id} ({source}), no segment appended")
+            return {"segment_id": None, "round_id": str(round_id), "source": source, "n_rows": 0, "path": None}
+        os.replace(tmp_path, self.root / name)
+
+        entry = {
+            "segment_id": segment_id,
+            "round_id": str(round_id),
+            "source": source,
+            "n_rows": writer.n_rows,
+            "path": name,
+            "created_at": time.time(),
+        }
+        with (self.root / self.MANIFEST).open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"[STORE] Appended segment {segment_id} ({writer.n_rows} rows, round {round_id}, {source})")
+        return entry
+
+    def append(self, df: pd.DataFrame, round_id, source: str = "synthetic") -> dict:
+        return self.append_chunks([df], round_id, source)
+
+    def reset(self, seed_path=None, seed_round="0"):
+        """Drop every segment; optionally start over from the dataset at `seed_path`."""
+        shutil.rmtree(self.root)
+        self._init_layout()
+        if seed_path is not None:
+            self.append_chunks(iter_dataset(seed_path), round_id=seed_round, source="seed")
+
+    # -----------------------------
+    # READS
+    # -----------------------------
+    def iter_frames(
+        self,
+        columns: list | None = None,
+        chunksize: int = 100_000,
+        **selection,
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily yield the selected segments chunk by chunk (see `segments` for the selection)."""
+        for entry in self.segments(**selection):
+            yield from iter_dataset(self.root / entry["path"], columns=columns, chunksize=chunksize)
+
+    def read(self, columns: list | None = None, **selection) -> pd.DataFrame:
+        import pandas as pd
+
+        frames = [
+            read_dataset(self.root / entry["path"], columns=columns)
+            for entry in self.segments(**selection)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def n_rows(self, **selection) -> int:
+        return sum(entry["n_rows"] for entry in self.segments(**selection))
@@ -0,0 +1,31 @@
+from agents.incident_index import IncidentIndex
+from agents.memory_store import MemoryStore
+from agents.sqlite_memory_store import SQLiteMemoryStore
+
+def _incident(round_id, feature):
+    return {"round_id": round_id, "timestamp": float(round_id), "diagnosis": {"suspect_features": [feature]}}
+
+def test_index_is_rebuilt_for_refilled_or_other_memory(tmp_path):
+    memory = MemoryStore(tmp_path / "memory.jsonl")
+    for i, feature in enumerate(["age", "income"]):
+        memory.append_incident(_incident(str(i), feature))
+    index = IncidentIndex(tmp_path / "memory.vec")
+    index.sync(memory)
+
+    # Cleared and refilled to the same count with different incidents
+    memory.clear()
+    for i, feature in enumerate(["balance", "balance"]):
+        memory.append_incident(_incident(str(i), feature))
+    index.sync(memory)
+    assert (index._buf[:2] == index._buf[0]).all()
+    assert not (tmp_path / "memory_summary.json").exists()
+
+    # Same sidecar, other backend with other incidents
+    reopened = IncidentIndex(tmp_path / "memory.vec")
+    assert reopened._n == 2
+    sqlite = SQLiteMemoryStore(tmp_path / "memory.sqlite")
+    for i, feature in enumerate(["age", "age", "income"]):
+        sqlite.append_incident(_incident(str(i), feature))
+    reopened.sync(sqlite)
+    assert reopened._n == 3
+    assert [inc["round_id"] for inc in reopened.similar(sqlite, reopened._buf[2], k=1)] == ["2"]
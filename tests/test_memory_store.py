@@ -0,0 +1,32 @@
+import numpy as np
+
+from agents.memory_store import INDEX_DTYPE, MemoryStore
+
+def test_two_writers_share_one_index(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    a, b = MemoryStore(path), MemoryStore(path)
+    a.append_incident({"round_id": "1", "timestamp": 1.0})
+    b.append_incident({"round_id": "2", "timestamp": 2.0})
+    a.append_incident({"round_id": "3", "timestamp": 3.0})
+
+    index = np.fromfile(path.with_name(path.name + ".idx"), dtype=INDEX_DTYPE)
+    assert len(index) == 3
+    assert list(index["timestamp"]) == [1.0, 2.0, 3.0]
+
+    fresh = MemoryStore(path)
+    assert len(fresh) == len(a) == len(b) == 3
+    assert [i["round_id"] for i in fresh.load_by_round("2")] == ["2"]
+    assert [i["round_id"] for i in fresh.load_time_range(0)] == ["1", "2", "3"]
+
+def test_duplicate_index_records_are_dropped(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    store = MemoryStore(path)
+    store.append_incident({"round_id": "1", "timestamp": 1.0})
+    store.append_incident({"round_id": "2", "timestamp": 2.0})
+    index_path = path.with_name(path.name + ".idx")
+    index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+    np.concatenate([index[:1], index[:1], index[1:]]).tofile(index_path)
+
+    fresh = MemoryStore(path)
+    assert [i["round_id"] for i in fresh.load_all()] == ["1", "2"]
+    assert len(np.fromfile(index_path, dtype=INDEX_DTYPE)) == 2
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from agents.data_generator import SyntheticDataGenerator
+from storage.training_store import TrainingStore
+
+def test_empty_append_registers_no_segment(tmp_path):
+    store = TrainingStore(tmp_path / "store")
+    entry = SyntheticDataGenerator().write_to_store(store, 0, round_id="1")
+    assert entry["n_rows"] == 0
+    assert store.segments() == []
+    assert not [p for p in store.root.iterdir() if p.name.startswith(".segment-")]
+
+    store.append(pd.DataFrame({"x": [1.0, 2.0]}), round_id="2")
+    assert [e["segment_id"] for e in store.segments()] == [1]
+    assert len(store.read()) == 2